@@ -0,0 +1,34 @@
+"""Track access tokens on refresh_tokens; keep revocations of deleted users
+
+Revision ID: 3f9a6c2e8b14
+Revises: e81a3c5d7f29
+Create Date: 2026-10-17 16:20:53.804117
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+import sqlmodel
+
+
+# revision identifiers, used by Alembic.
+revision: str = '3f9a6c2e8b14'
+down_revision: Union[str, Sequence[str], None] = 'e81a3c5d7f29'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    op.add_column('refresh_tokens', sa.Column('access_token_jti', sqlmodel.sql.sqltypes.AutoString(length=64), nullable=True))
+    op.add_column('refresh_tokens', sa.Column('access_token_expires_at', sa.DateTime(timezone=True), nullable=True))
+    op.drop_constraint('revoked_tokens_user_id_fkey', 'revoked_tokens', type_='foreignkey')
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.execute('DELETE FROM revoked_tokens WHERE user_id NOT IN (SELECT id FROM "user")')
+    op.create_foreign_key('revoked_tokens_user_id_fkey', 'revoked_tokens', 'user', ['user_id'], ['id'], ondelete='CASCADE')
+    op.drop_column('refresh_tokens', 'access_token_expires_at')
+    op.drop_column('refresh_tokens', 'access_token_jti')
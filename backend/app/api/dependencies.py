@@ -1,12 +1,16 @@
 from fastapi.security import OAuth2PasswordBearer
-from fastapi import Depends, HTTPException, status
+from fastapi import Depends, HTTPException, Request, status
 from app.core.config import settings
 from collections.abc import AsyncGenerator
 from sqlmodel.ext.asyncio.session import AsyncSession
-from app.core.database import async_session, get_db_session
-from typing import Annotated
-from app.models import User, TokenPayload
-import jwt
+from app.core.database import async_session, get_db_session, get_primary_read_db_session, get_read_db_session
+from app.core.deadlines import set_request_deadline
+from typing import Annotated, Awaitable, Callable, Union
+from app.models import User, TokenPayload, Principal
+from app.services import principalservice, tokenservice
+from app.services.revocationservice import revocation_list
+import ipaddress
+import uuid
 from jwt.exceptions import InvalidTokenError
 from pydantic import ValidationError
 
@@ -18,42 +22,101 @@ async def get_async_db() -> AsyncGenerator[AsyncSession, None, None]:
     async with async_session() as session:
         yield session
 
+def request_deadline(seconds: Union[float, None]) -> Callable[[], Awaitable[None]]:
+    """
+    Route dependency giving the request `seconds` from arrival to finish, None for no limit:
+    dependencies=[Depends(request_deadline(2.0))]
+    """
+    async def apply_request_deadline() -> None:
+        set_request_deadline(seconds)
+    return apply_request_deadline
+
+def _is_trusted_proxy(address: str) -> bool:
+    try:
+        ip = ipaddress.ip_address(address)
+    except ValueError:
+        return False
+    return any(ip in network for network in settings.TRUSTED_PROXIES)
+
+def get_client_ip(request: Request) -> str:
+    """
+    The client's address: the connecting peer, or when that peer is a trusted proxy, the
+    nearest X-Forwarded-For hop that is not one. Hops left of an untrusted one could be
+    made up by the client, so they are never used.
+    """
+    peer = request.client.host if request.client else "unknown"
+    if not _is_trusted_proxy(peer):
+        return peer
+    hops = [hop.strip() for hop in ",".join(request.headers.getlist("x-forwarded-for")).split(",") if hop.strip()]
+    for hop in reversed(hops):
+        if not _is_trusted_proxy(hop):
+            return hop
+    # Every hop is a proxy we trust: the leftmost is as close to the client as we can tell
+    return hops[0] if hops else peer
+
 SessionDependency = Annotated[AsyncSession, Depends(get_db_session)]
+ReadSessionDependency = Annotated[AsyncSession, Depends(get_read_db_session)]
+PrimaryReadSessionDependency = Annotated[AsyncSession, Depends(get_primary_read_db_session)]
 TokenDependency = Annotated[str, Depends(reusable_oauth2_scheme)]
 
-async def get_current_user(session: SessionDependency, token: TokenDependency) -> User:
+async def get_token_payload(token: TokenDependency) -> TokenPayload:
     try:
-        payload = jwt.decode(
-            token, settings.SECRET_KEY, algorithms=[settings.ALGORITHM]
-        )
-        token_data = TokenPayload(**payload)
-    except (InvalidTokenError, ValidationError):
+        token_data = tokenservice.decode_access_token(token)
+    except (InvalidTokenError, ValidationError, TypeError, ValueError):
         raise HTTPException(
             status_code=status.HTTP_403_FORBIDDEN,
             detail="Could not validate credentials",
         )
-    user = await session.get(User, token_data.sub)
-    print('--USER--')
-    print(user)
-    if not user:
+    # In-memory set lookup, no query per request
+    if token_data.jti and revocation_list.is_revoked(token_data.jti):
+        raise HTTPException(
+            status_code=status.HTTP_403_FORBIDDEN,
+            detail="Token has been revoked",
+        )
+    return token_data
+
+TokenPayloadDependency = Annotated[TokenPayload, Depends(get_token_payload)]
+
+async def get_current_principal(session: PrimaryReadSessionDependency, token_data: TokenPayloadDependency) -> Principal:
+    # Short-lived tokens carry the account claims, so no lookup is needed
+    principal = principalservice.principal_from_claims(token_data)
+    if principal is None:
+        # Looked up on the primary: the principal cache keeps what this reads, and its version
+        # guard only catches writes racing the read, not a replica that has yet to see them
+        principal = await principalservice.get_principal(session=session, user_id=uuid.UUID(token_data.sub))
+    if not principal:
         raise HTTPException(
             status_code=status.HTTP_404_NOT_FOUND,
             detail="User not found",
         )
-    if not user.is_active:
+    if not principal.is_active:
         raise HTTPException(
             status_code=status.HTTP_400_BAD_REQUEST,
             detail="Inactive user",
         )
+    return principal
+
+CurrentPrincipal = Annotated[Principal, Depends(get_current_principal)]
+
+async def get_current_user(session: SessionDependency, principal: CurrentPrincipal) -> User:
+    """
+    Full User row, loaded only for handlers that declare CurrentUser, typically to modify it.
+    Read-only routes and permission checks should use CurrentPrincipal.
+    """
+    user = await session.get(User, principal.id)
+    if not user:
+        raise HTTPException(
+            status_code=status.HTTP_404_NOT_FOUND,
+            detail="User not found",
+        )
     return user
 
 CurrentUser = Annotated[User, Depends(get_current_user)]
 
-async def get_current_active_superuser(current_user: CurrentUser) -> User:
-    if not current_user.is_superuser:
+async def get_current_active_superuser(principal: CurrentPrincipal) -> Principal:
+    if not principal.is_superuser:
         raise HTTPException(
             status_code=status.HTTP_403_FORBIDDEN,
             detail="The user doesn't have enough privileges",
         )
-    return current_user
-
+    return principal
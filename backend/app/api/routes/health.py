@@ -1,25 +1,105 @@
-from fastapi import APIRouter
-from app.core.database import (
-    check_database_health, 
-)
+from fastapi import APIRouter, Depends, status
+from fastapi.responses import JSONResponse
+from app.core.database import database_breakers, get_pool_status
+from app.core.health import database_health_monitor
 from app.core.config import settings
+from app.core.security import hashing_executor
+from app.core.slowqueries import slow_query_log
+from app.api.dependencies import get_current_active_superuser, request_deadline
+from app.services.principalservice import principal_cache
+from app.services.revocationservice import revocation_list
+from app.services.tokenservice import token_payload_cache
 
 router = APIRouter(prefix="/health", tags=["Health"])
 
-@router.get("/")
+# Only for routes that can reach the database; the rest read in-process state, and
+# liveness must stay free of dependencies
+health_deadline = Depends(request_deadline(settings.REQUEST_DEADLINE_HEALTH_SECONDS))
+
+@router.get("/", dependencies=[health_deadline])
 async def health_check():
-    """Comprehensive health check endpoint"""
-    db_health = await check_database_health()
+    """Comprehensive health check endpoint, served from the last background probe"""
+    db_health = await database_health_monitor.snapshot()
     
     return {
         "api_status": "healthy",
         "app_name": settings.APP_NAME,
         "database": db_health,
+        "database_breakers": {name: breaker.state for name, breaker in database_breakers.items()},
         "environment": getattr(settings, 'ENVIRONMENT', 'unknown')
     }
 
 
-@router.get("/database")
+@router.get("/database", dependencies=[health_deadline])
 async def database_health():
     """Detailed database health endpoint for monitoring"""
-    return await check_database_health()
+    return await database_health_monitor.snapshot()
+
+
+@router.get("/live")
+async def liveness():
+    """Liveness probe: the process is up and serving, no dependencies checked"""
+    return {"status": "alive"}
+
+
+@router.get("/ready", dependencies=[health_deadline])
+async def readiness():
+    """Readiness probe: the last database probe is healthy and recent enough"""
+    db_health = await database_health_monitor.snapshot()
+    ready = database_health_monitor.is_ready()
+    return JSONResponse(
+        status_code=status.HTTP_200_OK if ready else status.HTTP_503_SERVICE_UNAVAILABLE,
+        content={
+            "status": "ready" if ready else "not_ready",
+            "database": db_health["status"],
+            "age_seconds": db_health["age_seconds"],
+        }
+    )
+
+
+@router.get("/pool")
+async def pool_health():
+    """Connection pool usage and checkout wait time for this worker"""
+    return get_pool_status()
+
+
+@router.get("/breaker")
+async def breaker_health():
+    """
+    Each database engine's circuit breaker (primary, and replica when configured): state and
+    the failure rate in its current window, for this worker
+    """
+    return {
+        "enabled": settings.DATABASE_BREAKER_ENABLED,
+        "breakers": {name: breaker.stats() for name, breaker in database_breakers.items()},
+    }
+
+
+@router.get("/hashing")
+async def hashing_health():
+    """Password hashing pool queue depth and latency"""
+    return hashing_executor.stats()
+
+
+@router.get("/auth-cache")
+async def auth_cache_health():
+    """Principal cache hit/miss counters for this worker"""
+    return principal_cache.stats()
+
+
+@router.get("/token-cache")
+async def token_cache_health():
+    """Decoded access token cache hit/miss counters for this worker"""
+    return token_payload_cache.stats()
+
+
+@router.get("/revocations")
+async def revocations_health():
+    """Size and freshness of this worker's revoked-token list"""
+    return revocation_list.stats()
+
+
+@router.get("/slow-queries", dependencies=[health_deadline, Depends(get_current_active_superuser)])
+async def slow_queries(limit: int = 20):
+    """Statement fingerprints with the most total time on this worker, with p50/p95/max and captured plans"""
+    return slow_query_log.top(limit)
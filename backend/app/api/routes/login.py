@@ -1,19 +1,24 @@
-from fastapi import APIRouter, HTTPException, status, Depends
-from app.api.dependencies import SessionDependency
+from fastapi import APIRouter, HTTPException, Request, status, Depends
+from app.api.dependencies import SessionDependency, CurrentPrincipal, TokenPayloadDependency, get_client_ip
 from fastapi.security import OAuth2PasswordRequestForm
-from typing import Annotated
-from app.models import User, Token
-from app.services import authservice
-from datetime import timedelta
-from app.core import config, security
+from typing import Annotated, Union
+from app.models import User, Token, RefreshTokenRequest
+from app.services import authservice, revocationservice, tokenservice
+from datetime import datetime, timezone
+from app.core.config import settings
+from app.core.ratelimit import login_rate_limiter
 
 router = APIRouter(tags=["Authentication"], prefix="/auth")
 
 @router.post("/login/access-token")
-async def login_access_token(session: SessionDependency, form_data: Annotated[OAuth2PasswordRequestForm, Depends()]) -> Token:
+async def login_access_token(
+    request: Request, session: SessionDependency, form_data: Annotated[OAuth2PasswordRequestForm, Depends()]
+) -> Token:
     """
     OAuth2 compatible token login, get an access token for future requests
     """
+    if settings.LOGIN_RATE_LIMIT_ENABLED:
+        await login_rate_limiter.check(email=form_data.username, ip=get_client_ip(request))
     user = await authservice.authenticate(session=session, email=form_data.username, password=form_data.password)
     if not user:
         raise HTTPException(
@@ -25,9 +30,55 @@ async def login_access_token(session: SessionDependency, form_data: Annotated[OA
             status_code=status.HTTP_400_BAD_REQUEST,
             detail="Inactive user"
         )
-    access_token_expires = timedelta(config.settings.ACCESS_TOKEN_EXPIRE_MINUTES)
-    return Token(
-        access_token=security.create_access_token(
-            user.id, expires_delta=access_token_expires
+    return tokenservice.issue_tokens(session=session, user=user)
+
+@router.post("/refresh")
+async def refresh_access_token(session: SessionDependency, body: RefreshTokenRequest) -> Token:
+    """
+    Trade a refresh token for a new access token and refresh token; each refresh token works once
+    """
+    stored = await tokenservice.use_refresh_token(session=session, refresh_token=body.refresh_token)
+    if not stored:
+        raise HTTPException(
+            status_code=status.HTTP_403_FORBIDDEN,
+            detail="Invalid refresh token"
+        )
+    user = await session.get(User, stored.user_id)
+    if not user:
+        raise HTTPException(
+            status_code=status.HTTP_404_NOT_FOUND,
+            detail="User not found"
+        )
+    elif not user.is_active:
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail="Inactive user"
+        )
+    return tokenservice.issue_tokens(session=session, user=user, family_id=stored.family_id)
+
+@router.post("/logout", status_code=status.HTTP_204_NO_CONTENT)
+async def logout(
+    session: SessionDependency,
+    principal: CurrentPrincipal,
+    token_data: TokenPayloadDependency,
+    body: Union[RefreshTokenRequest, None] = None,
+) -> None:
+    """
+    Revoke the access token used for this request, and the refresh token if one is sent
+    """
+    # Checked first: raising after revoking the refresh token would roll that back
+    if not token_data.jti or token_data.exp is None:
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail="This token cannot be revoked, it expires on its own"
+        )
+    if body is not None:
+        await tokenservice.revoke_refresh_token(
+            session=session, refresh_token=body.refresh_token, user_id=principal.id
         )
-    )
\ No newline at end of file
+    await revocationservice.revoke_token(
+        session=session,
+        jti=token_data.jti,
+        user_id=principal.id,
+        expires_at=datetime.fromtimestamp(token_data.exp, timezone.utc),
+    )
@@ -1,9 +1,12 @@
-from typing import Any
-from fastapi import APIRouter, HTTPException, status
+from typing import Any, Union
+from fastapi import APIRouter, Depends, HTTPException, UploadFile, status
 from pydantic import BaseModel
+from app.core.config import settings
 from app.core.security import get_password_hash
-from app.models import User, UserPublic
-from app.api.dependencies import SessionDependency
+from app.exceptions import PayloadTooLargeError, ValidationError
+from app.models import User, UserPublic, UserImportReport
+from app.api.dependencies import SessionDependency, get_current_active_superuser, request_deadline
+from app.services import importservice
 from app.services.userservice import get_user_by_email
 
 router = APIRouter(tags=["Private"], prefix="/private")
@@ -30,7 +33,7 @@ async def create_user(user_in: PrivateUserCreate, session: SessionDependency) ->
 
     user = User(
         email=user_in.email,
-        hashed_password=get_password_hash(user_in.password),
+        hashed_password=await get_password_hash(user_in.password),
         full_name=user_in.full_name,
         is_verified=user_in.is_verified
     )
@@ -38,4 +41,37 @@ async def create_user(user_in: PrivateUserCreate, session: SessionDependency) ->
     session.add(user)
     await session.commit()
     await session.refresh(user)
-    return user
\ No newline at end of file
+    return user
+
+# Hashing a large upload can outlast any default budget
+@router.post(
+    "/users/import",
+    dependencies=[Depends(get_current_active_superuser), Depends(request_deadline(None))],
+    response_model=UserImportReport,
+)
+async def import_users(
+    file: UploadFile,
+    session: SessionDependency,
+    format: Union[importservice.ImportFormat, None] = None,
+) -> Any:
+    """
+    Bulk-create users from a CSV or NDJSON upload.
+
+    Superusers only. Columns/keys: email, password, full_name, is_active; rows setting
+    is_superuser are rejected. The format is taken from the file extension unless given.
+    Existing emails are reported, not updated. Uploads over USER_IMPORT_MAX_BYTES get a 413.
+    """
+    max_bytes = settings.USER_IMPORT_MAX_BYTES
+    # Read one byte past the cap so an oversized upload is caught without loading all of it
+    data = await file.read(max_bytes + 1)
+    if len(data) > max_bytes:
+        raise PayloadTooLargeError(f"Upload is larger than {max_bytes} bytes", max_bytes=max_bytes)
+    try:
+        content = data.decode("utf-8-sig")
+    except UnicodeDecodeError:
+        raise ValidationError("Upload must be UTF-8 encoded")
+
+    import_format = format or importservice.detect_format(file.filename)
+    rows = importservice.parse_rows(content, import_format)
+    return await importservice.import_users(session=session, rows=rows)
+
@@ -1,33 +1,78 @@
-from fastapi import APIRouter, Depends
-from app.api.dependencies import SessionDependency, get_current_active_superuser, CurrentUser
-from app.models import User, UserPublic, UsersPublic
-from typing import Any
-from sqlmodel import select, func
+from fastapi import APIRouter, Depends, Query, Request
+from fastapi.responses import StreamingResponse
+from app.api.dependencies import ReadSessionDependency, get_current_active_superuser, CurrentPrincipal, request_deadline
+from app.models import UserPublic, UsersPublic
+from app.services import userservice
+from app.core.responses import ModelResponse
+from app.core.config import settings
+from app.core.database import get_read_session_factory
+from app.exceptions import ValidationError
+from typing import Any, Union
 
 router = APIRouter(prefix="/users", tags=["Users"])
 
 @router.get(
     "/",
-    dependencies=[Depends(get_current_active_superuser)],
+    dependencies=[Depends(request_deadline(settings.REQUEST_DEADLINE_READ_SECONDS)), Depends(get_current_active_superuser)],
     response_model=UsersPublic,
 )
-async def read_users(session: SessionDependency, skip: int = 0, limit: int = 100) -> Any:
+async def read_users(
+    session: ReadSessionDependency,
+    skip: int = Query(0, ge=0),
+    limit: int = Query(100, ge=1, le=settings.USER_LIST_MAX_LIMIT),
+    after: Union[str, None] = None,
+    count: userservice.CountMode = "exact",
+) -> Any:
     """
     Retrieve users.
+
+    Pass the returned `next_cursor` as `after` to fetch the next page. `count` may be
+    `exact`, `estimated` (from planner statistics) or `none` to skip counting.
+    `after` and a non-zero `skip` cannot be combined.
     """
+    if after is not None and skip:
+        raise ValidationError("Use either after or skip, not both", details={"after": after, "skip": skip})
 
-    count_statement = select(func.count()).select_from(User)
-    count =  await session.scalar(count_statement)
+    total = await userservice.count_users(session=session, mode=count)
+    users, next_cursor = await userservice.list_users(
+        session=session, limit=limit, skip=skip, after=after
+    )
 
-    statement = select(User).offset(skip).limit(limit)
-    result_users = await session.scalars(statement)
-    users = result_users.all()
+    # Rows go straight to JSON: no per-row re-validation and no response_model pass
+    return ModelResponse(UsersPublic.model_construct(
+        data=[UserPublic.from_row(user) for user in users],
+        count=total,
+        next_cursor=next_cursor,
+    ))
 
-    return UsersPublic(data=users, count=count)
+@router.get(
+    "/export",
+    # The stream runs as long as the table is big
+    dependencies=[Depends(request_deadline(None)), Depends(get_current_active_superuser)],
+    response_class=StreamingResponse,
+)
+async def export_users(request: Request, format: userservice.ExportFormat = "ndjson") -> StreamingResponse:
+    """
+    Stream all users as NDJSON or CSV.
+    """
+    media_type = "text/csv" if format == "csv" else "application/x-ndjson"
+    return StreamingResponse(
+        userservice.stream_users_export(
+            session_factory=get_read_session_factory(request),
+            export_format=format,
+            batch_size=settings.USER_EXPORT_BATCH_SIZE,
+        ),
+        media_type=media_type,
+        headers={"Content-Disposition": f'attachment; filename="users.{format}"'},
+    )
 
-@router.get("/me", response_model=UserPublic)
-async def read_user_me(current_user: CurrentUser) -> UserPublic:
+@router.get(
+    "/me",
+    dependencies=[Depends(request_deadline(settings.REQUEST_DEADLINE_READ_SECONDS))],
+    response_model=UserPublic,
+)
+async def read_user_me(current_principal: CurrentPrincipal) -> UserPublic:
     """
     Get current user.
     """
-    return current_user
\ No newline at end of file
+    return current_principal
@@ -0,0 +1,158 @@
+"""
+Circuit breaker for the database.
+
+Closed: every call goes through and its outcome is counted in one-second buckets over a
+sliding window. A call fails when it errors or takes longer than `slow_call_seconds`.
+Once the window holds at least `min_calls` outcomes and the failed share reaches
+`failure_rate`, the breaker opens.
+
+Open: calls are refused at once for `open_seconds`, so requests get a 503 instead of
+queueing on a pool or socket timeout.
+
+Half-open: up to `half_open_calls` trial calls go through. A trial is one admitted call
+(for the database, one pool checkout, however many statements it runs) and succeeds when
+the caller reports it with record_trial_success. That many successes close the breaker;
+any failure opens it again.
+"""
+import logging
+import time
+from collections import deque
+from typing import Any, Callable, Dict, Union
+
+logger = logging.getLogger(__name__)
+
+CLOSED = "closed"
+OPEN = "open"
+HALF_OPEN = "half_open"
+
+
+class CircuitBreaker:
+    def __init__(
+        self,
+        name: str,
+        window_seconds: float = 10.0,
+        min_calls: int = 20,
+        failure_rate: float = 0.5,
+        slow_call_seconds: float = 5.0,
+        open_seconds: float = 5.0,
+        half_open_calls: int = 3,
+    ):
+        self.name = name
+        self.window_seconds = window_seconds
+        self.min_calls = min_calls
+        self.failure_rate = failure_rate
+        self.slow_call_seconds = slow_call_seconds
+        self.open_seconds = open_seconds
+        self.half_open_calls = half_open_calls
+        self.state = CLOSED
+        self.opened_count = 0
+        self.rejected_count = 0
+        # [second, calls, failures], oldest first
+        self._buckets: deque = deque()
+        self._changed_monotonic = time.monotonic()
+        self._trials_admitted = 0
+        self._trials_succeeded = 0
+        # Bumped on every transition, so a trial admitted in an earlier round cannot report into this one
+        self.generation = 0
+        self._observers: list[Callable[[str], None]] = []
+
+    def add_observer(self, observer: Callable[[str], None]) -> None:
+        """Call `observer(state)` after every state change"""
+        self._observers.append(observer)
+
+    def allow(self) -> bool:
+        """Whether a call may go ahead now; refused calls are counted, not recorded"""
+        now = time.monotonic()
+        if self.state == OPEN and now - self._changed_monotonic >= self.open_seconds:
+            self._transition(HALF_OPEN, now)
+        if self.state == HALF_OPEN:
+            # Trials that never report back (a checkout that ran nothing) must not wedge
+            # the breaker, so a stalled round of trials is replaced after open_seconds
+            if self._trials_admitted >= self.half_open_calls and now - self._changed_monotonic >= self.open_seconds:
+                self._transition(HALF_OPEN, now)
+            if self._trials_admitted < self.half_open_calls:
+                self._trials_admitted += 1
+                return True
+        if self.state == CLOSED:
+            return True
+        self.rejected_count += 1
+        return False
+
+    def retry_after(self) -> float:
+        """Seconds until an open breaker lets trial calls through"""
+        if self.state == CLOSED:
+            return 0.0
+        return max(self.open_seconds - (time.monotonic() - self._changed_monotonic), 0.0)
+
+    def record_success(self, seconds: float = 0.0) -> None:
+        """Count one successful call; while half-open only a slow one matters, as a failure"""
+        if seconds >= self.slow_call_seconds:
+            self.record_failure()
+            return
+        if self.state == CLOSED:
+            self._count(failed=False)
+
+    def record_trial_success(self, generation: int) -> None:
+        """Count one half-open trial, admitted while `generation` was current, as succeeded"""
+        if self.state != HALF_OPEN or generation != self.generation:
+            return
+        self._trials_succeeded += 1
+        if self._trials_succeeded >= self.half_open_calls:
+            self._transition(CLOSED, time.monotonic())
+
+    def record_failure(self) -> None:
+        now = time.monotonic()
+        if self.state == HALF_OPEN:
+            self._transition(OPEN, now)
+        elif self.state == CLOSED:
+            calls, failures = self._count(failed=True)
+            if calls >= self.min_calls and failures / calls >= self.failure_rate:
+                self._transition(OPEN, now)
+
+    def _count(self, failed: bool) -> tuple[int, int]:
+        """Add one outcome to the window and return the window's (calls, failures)"""
+        second = int(time.monotonic())
+        while self._buckets and self._buckets[0][0] <= second - self.window_seconds:
+            self._buckets.popleft()
+        if not self._buckets or self._buckets[-1][0] != second:
+            self._buckets.append([second, 0, 0])
+        bucket = self._buckets[-1]
+        bucket[1] += 1
+        bucket[2] += int(failed)
+        return sum(b[1] for b in self._buckets), sum(b[2] for b in self._buckets)
+
+    def _transition(self, state: str, now: float) -> None:
+        previous = self.state
+        self.state = state
+        self._changed_monotonic = now
+        self.generation += 1
+        self._trials_admitted = 0
+        self._trials_succeeded = 0
+        if state == OPEN:
+            self.opened_count += 1
+        if state == CLOSED:
+            self._buckets.clear()
+        if state != previous:
+            logger.warning(f"Circuit breaker '{self.name}': {previous} -> {state}")
+            for observer in self._observers:
+                observer(state)
+
+    def stats(self) -> Dict[str, Any]:
+        calls = sum(b[1] for b in self._buckets)
+        failures = sum(b[2] for b in self._buckets)
+        retry_after: Union[float, None] = round(self.retry_after(), 3) if self.state != CLOSED else None
+        return {
+            "state": self.state,
+            "seconds_in_state": round(time.monotonic() - self._changed_monotonic, 3),
+            "retry_after_seconds": retry_after,
+            "window_calls": calls,
+            "window_failures": failures,
+            "window_failure_rate": round(failures / calls, 3) if calls else None,
+            "opened": self.opened_count,
+            "rejected": self.rejected_count,
+            "window_seconds": self.window_seconds,
+            "min_calls": self.min_calls,
+            "failure_rate": self.failure_rate,
+            "slow_call_seconds": self.slow_call_seconds,
+            "open_seconds": self.open_seconds,
+        }
@@ -2,17 +2,26 @@ from pydantic import (
     PostgresDsn,
     computed_field,
     BeforeValidator,
-    AnyUrl
+    Field,
+    AnyUrl,
+    IPvAnyNetwork,
+    field_validator
 )
 from pydantic_core import MultiHostUrl
 from pydantic_settings import BaseSettings, SettingsConfigDict
 from pathlib import Path
 from functools import lru_cache
+import logging
 import secrets
 from typing import Annotated, Any, Literal, Union
 
 BASE_DIR = Path(__file__).resolve().parent.parent
 
+logger = logging.getLogger(__name__)
+
+# Longest access token lifetime honoured, see ACCESS_TOKEN_EXPIRE_MINUTES
+MAX_ACCESS_TOKEN_EXPIRE_MINUTES = 60
+
 def parse_cors(v: Any) -> list[str] | str:
     if isinstance(v, str) and not v.startswith("["):
         return [i.strip() for i in v.split(",")]
@@ -29,9 +38,41 @@ class Settings(BaseSettings):
     DB_NAME: str
     DB_USERNAME: str
     DB_PASSWORD: str
+    # Optional read replica for read-only sessions; same name and credentials as the primary
+    DB_REPLICA_HOST: Union[str, None] = None
+    DB_REPLICA_PORT: Union[int, None] = None
     API_PATH: str = "/api"
     SECRET_KEY: str = secrets.token_urlsafe(32)
-    ACCESS_TOKEN_EXPIRE_MINUTES: int = 60 * 24 * 8 # 60 minutes * 24 hours * 8 days = 8 days
+    # Access tokens carry the user's claims and are trusted until they expire, so keep them short;
+    # clients renew them with the long-lived refresh token. Larger values are clamped to
+    # MAX_ACCESS_TOKEN_EXPIRE_MINUTES with a warning (old .env files used 11520, i.e. 8 days).
+    # Changing is_active or is_superuser, or deleting the user, through the ORM revokes their
+    # outstanding access tokens (see revocationservice); other instances follow within
+    # TOKEN_REVOCATION_REFRESH_SECONDS. Changes made in raw SQL are not seen, and the old
+    # claims stay valid for up to this many minutes.
+    ACCESS_TOKEN_EXPIRE_MINUTES: Annotated[int, Field(ge=1)] = 15
+    REFRESH_TOKEN_EXPIRE_DAYS: int = 30
+    # Login attempts allowed per sliding window, checked before any database or bcrypt work.
+    # "sqlite" shares counters between the workers on one host through LOGIN_RATE_LIMIT_SQLITE_PATH
+    LOGIN_RATE_LIMIT_ENABLED: bool = True
+    LOGIN_RATE_LIMIT_PER_EMAIL: Annotated[int, Field(ge=1)] = 10
+    LOGIN_RATE_LIMIT_PER_IP: Annotated[int, Field(ge=1)] = 50
+    LOGIN_RATE_LIMIT_WINDOW_SECONDS: Annotated[float, Field(gt=0)] = 60.0
+    LOGIN_RATE_LIMIT_BACKEND: Literal["memory", "sqlite"] = "memory"
+    LOGIN_RATE_LIMIT_SQLITE_PATH: str = "/tmp/login-rate-limits.sqlite3"
+    LOGIN_RATE_LIMIT_MAX_KEYS: Annotated[int, Field(ge=1)] = 100_000
+    # Reverse proxies (addresses or networks, e.g. "10.0.0.0/8,127.0.0.1") whose X-Forwarded-For
+    # is believed when working out a client's address; empty uses the connecting peer as is
+    TRUSTED_PROXIES: Annotated[
+        Union[list[IPvAnyNetwork], str], BeforeValidator(parse_cors)
+    ] = []
+    # Emails that matched no user, remembered per worker so repeated login probes skip the lookup
+    UNKNOWN_EMAIL_CACHE_SIZE: int = 10_000
+    UNKNOWN_EMAIL_CACHE_TTL_SECONDS: float = 30.0
+    # Decoded access tokens cached per worker until they expire; 0 verifies every request
+    TOKEN_CACHE_SIZE: int = 10_000
+    # How often each instance pulls new token revocations from the database
+    TOKEN_REVOCATION_REFRESH_SECONDS: float = 5.0
     ALGORITHM: str = "HS256"
     FRONTEND_HOST: str = "http://localhost:5173"
     BACKEND_CORS_ORIGINS: Annotated[
@@ -39,8 +80,98 @@ class Settings(BaseSettings):
     ] = []
     # Database health and error handling
     DATABASE_HEALTH_CHECK_ON_STARTUP: bool = True
+    # Background probe interval, and how stale a result may get before readiness fails
+    DATABASE_HEALTH_CHECK_INTERVAL: float = 5.0
+    DATABASE_HEALTH_MAX_AGE_SECONDS: float = 30.0
+    # Requests still running this long after arrival are cancelled with a 504, and their
+    # transactions get the time left as statement_timeout; routes set their own budget with the
+    # request_deadline dependency, and None leaves routes without one unbounded
+    REQUEST_DEADLINE_ENABLED: bool = True
+    REQUEST_DEADLINE_DEFAULT_SECONDS: Union[float, None] = 30.0
+    REQUEST_DEADLINE_HEALTH_SECONDS: float = 2.0
+    REQUEST_DEADLINE_READ_SECONDS: float = 5.0
+    # Circuit breaker over pool checkouts and statements, one per engine (primary, replica): opens when at least MIN_CALLS outcomes
+    # in the window are in and the share of errors and calls slower than SLOW_CALL_SECONDS reaches
+    # FAILURE_RATE; while open, requests get a 503 at once, and after OPEN_SECONDS a few trials decide
+    DATABASE_BREAKER_ENABLED: bool = True
+    DATABASE_BREAKER_WINDOW_SECONDS: float = 10.0
+    DATABASE_BREAKER_MIN_CALLS: int = 20
+    DATABASE_BREAKER_FAILURE_RATE: float = 0.5
+    DATABASE_BREAKER_SLOW_CALL_SECONDS: float = 5.0
+    DATABASE_BREAKER_OPEN_SECONDS: float = 5.0
+    DATABASE_BREAKER_HALF_OPEN_CALLS: int = 3
+    # Prometheus metrics on /metrics (set PROMETHEUS_MULTIPROC_DIR for multiple workers)
+    METRICS_ENABLED: bool = True
+    # Per-request SQL counts in a Server-Timing header; requests over either limit are logged
+    QUERY_STATS_ENABLED: bool = True
+    QUERY_STATS_MAX_QUERIES: int = 20
+    QUERY_STATS_MAX_REPEATS: int = 5
+    # Per-fingerprint query latency; statements over the threshold are logged and EXPLAINed once
+    SLOW_QUERY_LOG_ENABLED: bool = True
+    SLOW_QUERY_THRESHOLD_MS: float = 200.0
+    SLOW_QUERY_WINDOW: int = 500
+    SLOW_QUERY_MAX_FINGERPRINTS: int = 1000
+    SLOW_QUERY_EXPLAIN: bool = True
+    # On-demand request profiling for requests sending X-Profile: <PROFILER_SECRET>; nothing is
+    # profiled without a secret, and production is skipped unless forced
+    PROFILER_ENABLED: bool = False
+    PROFILER_FORCE: bool = False
+    PROFILER_SECRET: Union[str, None] = None
+    PROFILER_INTERVAL_MS: float = 1.0
+    PROFILER_OUTPUT_DIR: str = "profiles"
+    # Profiles kept on disk, oldest deleted first, and the size each is cut to
+    PROFILER_MAX_FILES: Annotated[int, Field(ge=1)] = 100
+    PROFILER_MAX_FILE_BYTES: Annotated[int, Field(ge=1)] = 5 * 1024 * 1024
     DATABASE_CONNECTION_TIMEOUT: int = 30
     DATABASE_POOL_PRE_PING: bool = True
+    # Only ping connections that sat idle longer than this; 0 pings on every checkout
+    DATABASE_POOL_PRE_PING_IDLE_SECONDS: float = 0
+    DATABASE_POOL_SIZE: int = 10
+    DATABASE_MAX_OVERFLOW: int = 10
+    DATABASE_POOL_TIMEOUT: float = 30
+    DATABASE_POOL_RECYCLE: int = 300
+    # Optional connection budget for the whole service, split evenly across uvicorn workers
+    DATABASE_MAX_CONNECTIONS: Union[int, None] = None
+    WEB_CONCURRENCY: int = 1
+    # Prepared statement caching (asyncpg per connection, SQLAlchemy per connection)
+    DATABASE_STATEMENT_CACHE_SIZE: int = 100
+    DATABASE_STATEMENT_CACHE_MAX_LIFETIME: int = 300
+    DATABASE_PREPARED_STATEMENT_CACHE_SIZE: int = 100
+    # Behind PgBouncer in transaction/statement mode: no statement caches, uniquely named statements
+    DATABASE_PGBOUNCER_MODE: bool = False
+    # New password hashes use this scheme and cost (see scripts/calibrate_password_hash.py);
+    # older hashes are upgraded on the next successful login
+    PASSWORD_HASH_SCHEME: Literal["bcrypt", "argon2"] = "bcrypt"
+    PASSWORD_BCRYPT_ROUNDS: int = 12
+    PASSWORD_ARGON2_TIME_COST: int = 3
+    PASSWORD_ARGON2_MEMORY_COST: int = 65536  # KiB
+    PASSWORD_ARGON2_PARALLELISM: int = 4
+    # Password hashing runs on a bounded worker pool, off the event loop
+    PASSWORD_HASH_EXECUTOR: Literal["thread", "process"] = "thread"
+    PASSWORD_HASH_WORKERS: int = 4
+    PASSWORD_HASH_QUEUE_LIMIT: int = 64
+    # In-process cache of authenticated principals, per worker
+    PRINCIPAL_CACHE_SIZE: int = 10_000
+    PRINCIPAL_CACHE_TTL_SECONDS: float = 60.0
+    # Largest page GET /users returns
+    USER_LIST_MAX_LIMIT: int = 1000
+    # Rows fetched per server-side cursor round trip when streaming exports
+    USER_EXPORT_BATCH_SIZE: int = 1000
+    # Bulk imports hash on a dedicated, long-lived process pool of this many workers
+    USER_IMPORT_HASH_WORKERS: Annotated[int, Field(ge=1)] = 2
+    # Largest user import upload accepted, in bytes
+    USER_IMPORT_MAX_BYTES: Annotated[int, Field(ge=1)] = 10 * 1024 * 1024
+
+    @field_validator("ACCESS_TOKEN_EXPIRE_MINUTES")
+    @classmethod
+    def _clamp_access_token_lifetime(cls, minutes: int) -> int:
+        if minutes > MAX_ACCESS_TOKEN_EXPIRE_MINUTES:
+            logger.warning(
+                f"ACCESS_TOKEN_EXPIRE_MINUTES={minutes} is above the {MAX_ACCESS_TOKEN_EXPIRE_MINUTES} minute "
+                f"maximum and has been clamped; clients renew access tokens with their refresh token"
+            )
+            return MAX_ACCESS_TOKEN_EXPIRE_MINUTES
+        return minutes
 
     @computed_field  # type: ignore[prop-decorator]
     @property
@@ -61,6 +192,20 @@ class Settings(BaseSettings):
             path=self.DB_NAME,
         )
 
+    @computed_field
+    @property
+    def SQLALCHEMY_REPLICA_DATABASE_URI(self) -> Union[PostgresDsn, None]:
+        if not self.DB_REPLICA_HOST:
+            return None
+        return MultiHostUrl.build(
+            scheme="postgresql+asyncpg",
+            username=self.DB_USERNAME,
+            password=self.DB_PASSWORD,
+            host=self.DB_REPLICA_HOST,
+            port=self.DB_REPLICA_PORT or self.DB_PORT,
+            path=self.DB_NAME,
+        )
+
 @lru_cache
 def get_settings():
     return Settings()
@@ -1,29 +1,431 @@
 import logging
-from typing import Dict, Any, AsyncGenerator
-from sqlalchemy.ext.asyncio import create_async_engine, async_sessionmaker, AsyncSession
-from sqlalchemy.exc import OperationalError
-from asyncpg.exceptions import InvalidCatalogNameError, ConnectionDoesNotExistError
+import time
+from contextlib import asynccontextmanager
+from uuid import uuid4
+from typing import Dict, Any, AsyncGenerator, AsyncIterator, Callable
+from sqlalchemy.ext.asyncio import create_async_engine, async_sessionmaker, AsyncSession, AsyncConnection, AsyncEngine
+from sqlalchemy.exc import OperationalError, ProgrammingError, DisconnectionError, TimeoutError as PoolTimeoutError
+from sqlalchemy.pool import AsyncAdaptedQueuePool
+from sqlalchemy.orm import Session
+from sqlalchemy import event
+from asyncpg.exceptions import (
+    InvalidCatalogNameError,
+    ConnectionDoesNotExistError,
+    UndefinedTableError,
+    InsufficientResourcesError,
+    InterfaceError,
+    OperatorInterventionError,
+    PostgresConnectionError,
+    QueryCanceledError,
+)
 from sqlmodel import SQLModel
 from sqlalchemy import text
+from fastapi import Request
 
+from app.core.circuitbreaker import HALF_OPEN, CircuitBreaker
 from app.core.config import settings
+from app.core.deadlines import remaining_seconds
 from app.exceptions import DatabaseConnectionError
 
 logger = logging.getLogger(__name__)
 
-# Create async engine with error handling configuration
-engine = create_async_engine(
-    str(settings.SQLALCHEMY_DATABASE_URI),
-    echo=settings.DB_DEBUG,
-    pool_size=10,
-    pool_pre_ping=True,  # Validate connections before use
-    pool_recycle=300,    # Recycle connections every 5 minutes
-    connect_args={
+
+def _unique_statement_name() -> str:
+    return f"__asyncpg_{uuid4()}__"
+
+
+def build_connect_args(pgbouncer_mode: bool | None = None) -> Dict[str, Any]:
+    """
+    asyncpg connect arguments, including how prepared statements are cached
+    """
+    if pgbouncer_mode is None:
+        pgbouncer_mode = settings.DATABASE_PGBOUNCER_MODE
+
+    connect_args: Dict[str, Any] = {
         "command_timeout": 30,  # 30 seconds timeout for commands
-        "statement_cache_size": 0,  # Disable statement caching to avoid memory issues
+        "timeout": settings.DATABASE_CONNECTION_TIMEOUT,  # Timeout for opening a connection
     }
+    if pgbouncer_mode:
+        # A pooler may hand each transaction a different server connection, so a statement
+        # prepared earlier may not exist there. Cache nothing and never reuse a name.
+        connect_args["statement_cache_size"] = 0
+        connect_args["prepared_statement_cache_size"] = 0
+        connect_args["prepared_statement_name_func"] = _unique_statement_name
+    else:
+        connect_args["statement_cache_size"] = settings.DATABASE_STATEMENT_CACHE_SIZE
+        connect_args["max_cached_statement_lifetime"] = settings.DATABASE_STATEMENT_CACHE_MAX_LIFETIME
+        connect_args["prepared_statement_cache_size"] = settings.DATABASE_PREPARED_STATEMENT_CACHE_SIZE
+    return connect_args
+
+
+def pool_limits() -> tuple[int, int]:
+    """
+    Per-worker (pool_size, max_overflow), shrunk to fit DATABASE_MAX_CONNECTIONS when set
+    """
+    pool_size = settings.DATABASE_POOL_SIZE
+    max_overflow = settings.DATABASE_MAX_OVERFLOW
+    if settings.DATABASE_MAX_CONNECTIONS:
+        per_worker = max(settings.DATABASE_MAX_CONNECTIONS // max(settings.WEB_CONCURRENCY, 1), 1)
+        pool_size = min(pool_size, per_worker)
+        max_overflow = min(max_overflow, per_worker - pool_size)
+    return pool_size, max_overflow
+
+
+class PoolCheckoutStats:
+    """Time spent waiting for a pooled connection, kept across pool re-creation"""
+
+    def __init__(self):
+        self.checkouts = 0
+        self.timeouts = 0
+        self.wait_seconds_total = 0.0
+        self.wait_seconds_max = 0.0
+        self._observers: list[Callable[[float, bool], None]] = []
+
+    def add_observer(self, observer: Callable[[float, bool], None]) -> None:
+        """Call `observer(wait_seconds, timed_out)` after every checkout"""
+        self._observers.append(observer)
+
+    def record(self, wait_seconds: float, timed_out: bool = False) -> None:
+        self.checkouts += 1
+        self.timeouts += int(timed_out)
+        self.wait_seconds_total += wait_seconds
+        self.wait_seconds_max = max(self.wait_seconds_max, wait_seconds)
+        for observer in self._observers:
+            observer(wait_seconds, timed_out)
+
+
+pool_checkout_stats = PoolCheckoutStats()
+
+
+def _build_breaker(name: str) -> CircuitBreaker:
+    return CircuitBreaker(
+        name,
+        window_seconds=settings.DATABASE_BREAKER_WINDOW_SECONDS,
+        min_calls=settings.DATABASE_BREAKER_MIN_CALLS,
+        failure_rate=settings.DATABASE_BREAKER_FAILURE_RATE,
+        slow_call_seconds=settings.DATABASE_BREAKER_SLOW_CALL_SECONDS,
+        open_seconds=settings.DATABASE_BREAKER_OPEN_SECONDS,
+        half_open_calls=settings.DATABASE_BREAKER_HALF_OPEN_CALLS,
+    )
+
+
+# One breaker per engine, so a replica outage never fails writes on a healthy primary
+primary_breaker = _build_breaker("primary")
+replica_breaker = _build_breaker("replica") if settings.SQLALCHEMY_REPLICA_DATABASE_URI else None
+database_breakers: Dict[str, CircuitBreaker] = {
+    breaker.name: breaker for breaker in (primary_breaker, replica_breaker) if breaker is not None
+}
+
+# Errors that say the database is unreachable, overloaded or too slow, as opposed to a
+# problem with the statement itself (constraint violations, syntax errors)
+_UNAVAILABLE_ERRORS = (
+    OSError,
+    TimeoutError,
+    PoolTimeoutError,
+    InterfaceError,
+    PostgresConnectionError,
+    OperatorInterventionError,  # includes statement_timeout cancellations; see _cancelled_by_deadline
+    InsufficientResourcesError,
 )
 
+
+def is_database_unavailable_error(error: BaseException) -> bool:
+    """Whether `error`, or the driver error it wraps, means the database is not answering"""
+    return isinstance(error, _UNAVAILABLE_ERRORS) or isinstance(error.__cause__, _UNAVAILABLE_ERRORS)
+
+
+def _cancelled_by_deadline(connection_info: Dict[str, Any], error: BaseException) -> bool:
+    """
+    Whether `error` is a statement_timeout set from a request deadline: that says one
+    route ran out of budget, not that the database is failing every route
+    """
+    session_info = connection_info.get("session_info") or {}
+    if not session_info.get("deadline_statement_timeout"):
+        return False
+    return isinstance(error, QueryCanceledError) or isinstance(error.__cause__, QueryCanceledError)
+
+
+class InstrumentedQueuePool(AsyncAdaptedQueuePool):
+    """
+    Queue pool that records how long each checkout waited for a connection, and refuses
+    checkouts while its engine's circuit breaker is open
+    """
+
+    # A class attribute, so the pool SQLAlchemy recreates after dispose() keeps it
+    breaker: CircuitBreaker = primary_breaker
+
+    def _do_get(self):
+        breaker = self.breaker
+        trial_generation = None
+        if settings.DATABASE_BREAKER_ENABLED:
+            if not breaker.allow():
+                retry_after = breaker.retry_after()
+                raise DatabaseConnectionError(
+                    "Database is unavailable, failing fast while the circuit breaker is open",
+                    details={
+                        "database": breaker.name,
+                        "circuit_breaker": breaker.state,
+                        "retry_after": round(retry_after, 3),
+                    },
+                )
+            if breaker.state == HALF_OPEN:
+                trial_generation = breaker.generation
+        started = time.perf_counter()
+        timed_out = False
+        try:
+            connection_record = super()._do_get()
+            if trial_generation is not None:
+                # The trial's outcome is reported once, on checkin, however many statements it runs
+                connection_record.info["breaker_trial"] = trial_generation
+            return connection_record
+        except PoolTimeoutError:
+            timed_out = True
+            breaker.record_failure()
+            raise
+        except Exception as e:
+            # New connections are opened inside the checkout, so refused connects land here
+            if is_database_unavailable_error(e):
+                breaker.record_failure()
+            raise
+        finally:
+            pool_checkout_stats.record(time.perf_counter() - started, timed_out)
+
+
+class ReplicaQueuePool(InstrumentedQueuePool):
+    breaker = replica_breaker
+
+
+_pool_size, _max_overflow = pool_limits()
+# With an idle threshold the checkout hook below pings instead of SQLAlchemy's pre-ping
+_ping_idle_only = settings.DATABASE_POOL_PRE_PING and settings.DATABASE_POOL_PRE_PING_IDLE_SECONDS > 0
+
+_engine_options: Dict[str, Any] = dict(
+    echo=settings.DB_DEBUG,
+    poolclass=InstrumentedQueuePool,
+    pool_size=_pool_size,
+    max_overflow=_max_overflow,
+    pool_timeout=settings.DATABASE_POOL_TIMEOUT,
+    pool_recycle=settings.DATABASE_POOL_RECYCLE,
+    pool_pre_ping=settings.DATABASE_POOL_PRE_PING and not _ping_idle_only,
+    connect_args=build_connect_args(),
+)
+
+# Create async engine with error handling configuration
+engine = create_async_engine(str(settings.SQLALCHEMY_DATABASE_URI), **_engine_options)
+
+# Read replica, when configured; otherwise reads go to the primary
+replica_engine = (
+    create_async_engine(
+        str(settings.SQLALCHEMY_REPLICA_DATABASE_URI), **{**_engine_options, "poolclass": ReplicaQueuePool}
+    )
+    if settings.SQLALCHEMY_REPLICA_DATABASE_URI
+    else None
+)
+
+
+# Called as observer(statement, parameters, seconds) after every statement; used by
+# metrics and diagnostics that need per-query timings without echo=True
+QueryObserver = Callable[[str, Any, float], None]
+_query_observers: list[QueryObserver] = []
+
+
+def add_query_observer(observer: QueryObserver) -> None:
+    _query_observers.append(observer)
+
+
+# Execution options for statements the app sends for its own bookkeeping rather than on
+# behalf of a handler; query observers (metrics, per-request query stats and N+1 detection,
+# slow-query log) and the circuit breaker leave them out
+INTERNAL_STATEMENT: Dict[str, Any] = {"internal_statement": True}
+
+
+def _is_internal_statement(context) -> bool:
+    return context.execution_options.get("internal_statement", False)
+
+
+def _install_query_timing(target_engine: AsyncEngine) -> None:
+
+    # The start time rides on the per-statement execution context, so a statement that
+    # fails (and never reaches after_cursor_execute) leaves nothing behind
+    @event.listens_for(target_engine.sync_engine, "before_cursor_execute")
+    def _start_query_timer(conn, cursor, statement, parameters, context, executemany):
+        context._query_started_at = time.perf_counter()
+
+    @event.listens_for(target_engine.sync_engine, "after_cursor_execute")
+    def _stop_query_timer(conn, cursor, statement, parameters, context, executemany):
+        if _is_internal_statement(context):
+            return
+        elapsed = time.perf_counter() - context._query_started_at
+        for observer in _query_observers:
+            observer(statement, parameters, elapsed)
+
+
+for _target_engine in filter(None, (engine, replica_engine)):
+    _install_query_timing(_target_engine)
+
+
+def _install_breaker_outcomes(target_engine: AsyncEngine, breaker: CircuitBreaker) -> None:
+
+    @event.listens_for(target_engine.sync_engine, "after_cursor_execute")
+    def _record_statement_success(conn, cursor, statement, parameters, context, executemany):
+        if _is_internal_statement(context):
+            return
+        # Started by the query timing hook, installed first
+        breaker.record_success(time.perf_counter() - context._query_started_at)
+
+    @event.listens_for(target_engine.sync_engine, "handle_error")
+    def _record_statement_failure(context):
+        # Connect failures have no connection here and were already counted at checkout
+        if context.connection is None:
+            return
+        if _cancelled_by_deadline(context.connection.info, context.original_exception):
+            return
+        if context.is_disconnect or is_database_unavailable_error(context.original_exception):
+            breaker.record_failure()
+
+    @event.listens_for(target_engine.sync_engine, "checkin")
+    def _record_trial_success(dbapi_connection, connection_record):
+        # A trial that failed has already reopened the breaker, so this is ignored for it
+        trial_generation = connection_record.info.pop("breaker_trial", None)
+        if trial_generation is not None:
+            breaker.record_trial_success(trial_generation)
+
+
+if settings.DATABASE_BREAKER_ENABLED:
+    _install_breaker_outcomes(engine, primary_breaker)
+    if replica_engine is not None:
+        _install_breaker_outcomes(replica_engine, replica_breaker)
+
+
+def _install_idle_ping(target_engine: AsyncEngine) -> None:
+    """Ping on checkout only when the connection has been idle past the threshold"""
+
+    @event.listens_for(target_engine.sync_engine, "checkin")
+    def _mark_checked_in(dbapi_connection, connection_record):
+        connection_record.info["checked_in_at"] = time.monotonic()
+
+    @event.listens_for(target_engine.sync_engine, "checkout")
+    def _ping_idle_connection(dbapi_connection, connection_record, connection_proxy):
+        checked_in_at = connection_record.info.get("checked_in_at")
+        if checked_in_at is None:
+            return
+        if time.monotonic() - checked_in_at < settings.DATABASE_POOL_PRE_PING_IDLE_SECONDS:
+            return
+        try:
+            target_engine.dialect.do_ping(dbapi_connection)
+        except Exception as e:
+            # The pool discards this connection and retries the checkout with a fresh one
+            raise DisconnectionError(f"Idle connection failed ping: {e}") from e
+
+
+if _ping_idle_only:
+    for _target_engine in filter(None, (engine, replica_engine)):
+        _install_idle_ping(_target_engine)
+
+
+# Request sessions check out a connection only when their first statement runs, and
+# commit only when the transaction wrote something. A connection begun by a session
+# points back at that session's info for as long as it is checked out, so every
+# statement that is not a plain SELECT (ORM flushes, Core DML, driver SQL) marks the
+# session as having written.
+
+@event.listens_for(Session, "after_begin")
+def _track_session_connection(session: Session, transaction, connection) -> None:
+    session.info["used"] = True
+    connection.info["session_info"] = session.info
+
+
+@event.listens_for(Session, "after_begin")
+def _apply_request_deadline(session: Session, transaction, connection) -> None:
+    """Cap the transaction's statements at what is left of the request's deadline"""
+    remaining = remaining_seconds()
+    session.info["deadline_statement_timeout"] = remaining is not None and connection.dialect.name == "postgresql"
+    if not session.info["deadline_statement_timeout"]:
+        return
+    # set_config(..., true) is SET LOCAL spelled as a SELECT, so it does not count as a write;
+    # tagged internal so query counts and N+1 checks only see the handler's own statements
+    timeout_ms = max(int(remaining * 1000), 1)
+    connection.exec_driver_sql(
+        f"SELECT set_config('statement_timeout', '{timeout_ms}', true)", execution_options=INTERNAL_STATEMENT
+    )
+
+
+def _install_write_tracking(target_engine: AsyncEngine) -> None:
+
+    @event.listens_for(target_engine.sync_engine, "before_cursor_execute")
+    def _mark_session_write(conn, cursor, statement, parameters, context, executemany):
+        session_info = conn.info.get("session_info")
+        if session_info is not None and statement.lstrip()[:6].upper() != "SELECT":
+            session_info["wrote"] = True
+
+    @event.listens_for(target_engine.sync_engine, "checkin")
+    def _forget_session(dbapi_connection, connection_record):
+        connection_record.info.pop("session_info", None)
+
+
+for _target_engine in filter(None, (engine, replica_engine)):
+    _install_write_tracking(_target_engine)
+
+
+def session_has_writes(session: AsyncSession) -> bool:
+    """Whether committing `session` would change anything"""
+    return bool(session.info.get("wrote") or session.new or session.dirty or session.deleted)
+
+
+class SessionUsageStats:
+    """How request sessions ended, to show how many requests never needed a connection"""
+
+    # unused: never checked out a connection; read: only ran SELECTs, so the transaction
+    # ends with the rollback the pool issues on checkin; commit; rollback: failed
+    OUTCOMES = ("unused", "read", "commit", "rollback")
+
+    def __init__(self):
+        self.counts = dict.fromkeys(self.OUTCOMES, 0)
+        self._observers: list[Callable[[str], None]] = []
+
+    def add_observer(self, observer: Callable[[str], None]) -> None:
+        """Call `observer(outcome)` after every request session closes"""
+        self._observers.append(observer)
+
+    def record(self, outcome: str) -> None:
+        self.counts[outcome] += 1
+        for observer in self._observers:
+            observer(outcome)
+
+
+session_usage_stats = SessionUsageStats()
+
+
+def _finish_session_usage(request: Request, session: AsyncSession, outcome: str) -> None:
+    if session.info.get("used"):
+        request.state.database_used = True
+    else:
+        outcome = "unused"
+    session_usage_stats.record(outcome)
+
+
+def get_pool_status() -> Dict[str, Any]:
+    """
+    Live connection pool statistics for this worker
+    """
+    pool = engine.pool
+    checkouts = pool_checkout_stats.checkouts or 1
+    return {
+        "pool_size": pool.size(),
+        "max_overflow": _max_overflow,
+        "checked_out": pool.checkedout(),
+        "idle": pool.checkedin(),
+        "overflow": max(pool.overflow(), 0),
+        "pool_timeout_seconds": settings.DATABASE_POOL_TIMEOUT,
+        "pre_ping": "idle_only" if _ping_idle_only else settings.DATABASE_POOL_PRE_PING,
+        "checkouts": pool_checkout_stats.checkouts,
+        "checkout_timeouts": pool_checkout_stats.timeouts,
+        "checkout_wait_ms_avg": round(pool_checkout_stats.wait_seconds_total / checkouts * 1000, 3),
+        "checkout_wait_ms_max": round(pool_checkout_stats.wait_seconds_max * 1000, 3),
+        "request_sessions": dict(session_usage_stats.counts),
+    }
+
+
 async_session = async_sessionmaker(
     engine, 
     class_=AsyncSession, 
@@ -32,16 +434,42 @@ async_session = async_sessionmaker(
     autocommit=False
 )
 
+# Read-only sessions open their transaction with BEGIN READ ONLY (no extra round trip).
+# The primary variant serves requests that opted into read-your-writes.
+read_async_session = async_sessionmaker(
+    (replica_engine or engine).execution_options(postgresql_readonly=True),
+    class_=AsyncSession,
+    expire_on_commit=False,
+    autoflush=False,
+    autocommit=False
+)
+primary_read_async_session = async_sessionmaker(
+    engine.execution_options(postgresql_readonly=True),
+    class_=AsyncSession,
+    expire_on_commit=False,
+    autoflush=False,
+    autocommit=False
+)
+
 
-async def get_db_session() -> AsyncGenerator[AsyncSession, None]:
+async def get_db_session(request: Request) -> AsyncGenerator[AsyncSession, None]:
     """
-    Dependency to get database session with comprehensive error handling
+    Dependency to get database session with comprehensive error handling.
+
+    The session checks out a connection on its first statement, so a handler that never
+    uses it costs no pool checkout, and it commits only when something was written.
+    request.state.database_used is set when the session touched the database.
     """
     session = None
+    outcome = "rollback"
     try:
         session = async_session()
         yield session
-        await session.commit()
+        if session_has_writes(session):
+            await session.commit()
+            outcome = "commit"
+        else:
+            outcome = "read"
     except (OperationalError, InvalidCatalogNameError) as e:
         logger.error(f"Database connection error: {e}")
         if session:
@@ -55,20 +483,74 @@ async def get_db_session() -> AsyncGenerator[AsyncSession, None]:
     finally:
         if session:
             await session.close()
+            _finish_session_usage(request, session, outcome)
+
+
+READ_YOUR_WRITES_HEADER = "X-Read-Your-Writes"
+
+
+def wants_read_your_writes(request: Request) -> bool:
+    """
+    Reads stay on the primary when the client sends X-Read-Your-Writes: true, or when an
+    earlier dependency set request.state.read_your_writes
+    """
+    if getattr(request.state, "read_your_writes", False):
+        return True
+    return request.headers.get(READ_YOUR_WRITES_HEADER, "").lower() in ("1", "true", "yes")
+
+
+def get_read_session_factory(request: Request) -> async_sessionmaker[AsyncSession]:
+    """Read-only session factory for this request, honouring read-your-writes"""
+    return primary_read_async_session if wants_read_your_writes(request) else read_async_session
+
+
+@asynccontextmanager
+async def _read_only_session(
+    request: Request, factory: async_sessionmaker[AsyncSession]
+) -> AsyncIterator[AsyncSession]:
+    session = None
+    outcome = "rollback"
+    try:
+        session = factory()
+        yield session
+        outcome = "read"
+    except (OperationalError, InvalidCatalogNameError) as e:
+        logger.error(f"Database connection error: {e}")
+        raise DatabaseConnectionError(f"Unable to connect to database: {str(e)}")
+    finally:
+        if session:
+            # Closing rolls back the read-only transaction and returns the connection
+            await session.close()
+            _finish_session_usage(request, session, outcome)
+
+
+async def get_read_db_session(request: Request) -> AsyncGenerator[AsyncSession, None]:
+    """
+    Dependency for read-only handlers: a READ ONLY transaction, on the replica when one is
+    configured, that is never committed
+    """
+    async with _read_only_session(request, get_read_session_factory(request)) as session:
+        yield session
+
+
+async def get_primary_read_db_session(request: Request) -> AsyncGenerator[AsyncSession, None]:
+    """
+    Like get_read_db_session, but always on the primary: for reads whose result outlives
+    the request, where a row from a lagging replica would be cached as current
+    """
+    async with _read_only_session(request, primary_read_async_session) as session:
+        yield session
 
 
 async def check_database_health() -> Dict[str, Any]:
     """
-    Check database connection and return detailed health status
+    Check database connection and return detailed health status.
+
+    Connectivity and migration state are checked with a single query on one connection.
     """
     try:
-        # Test basic connection
-        async with engine.begin() as conn:
-            result = await conn.execute(text("SELECT 1 as health_check"))
-            result.fetchone()
-        
-        # Test if migrations are up to date
-        migration_status = await check_migration_status()
+        async with engine.connect() as conn:
+            migration_status = await _read_migration_status(conn)
         
         return {
             "status": "healthy",
@@ -118,40 +600,45 @@ async def check_database_health() -> Dict[str, Any]:
         }
 
 
-async def check_migration_status() -> Dict[str, Any]:
+def _is_undefined_table(error: ProgrammingError) -> bool:
+    cause = getattr(error.orig, "__cause__", None)
+    return isinstance(cause, UndefinedTableError) or getattr(error.orig, "sqlstate", None) == "42P01"
+
+
+async def _read_migration_status(conn: AsyncConnection) -> Dict[str, Any]:
     """
-    Check if Alembic migrations are up to date
+    Read the Alembic version; a missing alembic_version table means no migrations ran yet.
+    Connection failures propagate so the caller can report them.
     """
     try:
-        async with engine.begin() as conn:
-            # Check if alembic_version table exists
-            result = await conn.execute(text("""
-                SELECT EXISTS (
-                    SELECT FROM information_schema.tables 
-                    WHERE table_name = 'alembic_version'
-                );
-            """))
-            table_exists = (result.fetchone())[0]
-            
-            if not table_exists:
-                return {
-                    "status": "not_initialized",
-                    "message": "No migrations have been run yet",
-                    "suggestion": "Run: alembic upgrade head"
-                }
-            
-            # Get current migration version
-            result = await conn.execute(text(
-                "SELECT version_num FROM alembic_version;"
-            ))
-            current_version = (result.fetchone())[0] if result.rowcount > 0 else None
-            
+        result = await conn.execute(text("SELECT version_num FROM alembic_version"))
+        row = result.first()
+    except ProgrammingError as e:
+        if _is_undefined_table(e):
             return {
-                "status": "ok",
-                "current_version": current_version,
-                "message": "Migrations are initialized"
+                "status": "not_initialized",
+                "message": "No migrations have been run yet",
+                "suggestion": "Run: alembic upgrade head"
             }
-            
+        return {
+            "status": "error",
+            "message": f"Could not check migration status: {str(e)}"
+        }
+    
+    return {
+        "status": "ok",
+        "current_version": row[0] if row else None,
+        "message": "Migrations are initialized"
+    }
+
+
+async def check_migration_status() -> Dict[str, Any]:
+    """
+    Check if Alembic migrations are up to date
+    """
+    try:
+        async with engine.connect() as conn:
+            return await _read_migration_status(conn)
     except Exception as e:
         return {
             "status": "error",
@@ -212,6 +699,8 @@ async def close_db_connections():
     """Close all database connections gracefully"""
     try:
         await engine.dispose()
+        if replica_engine is not None:
+            await replica_engine.dispose()
         logger.info("Database connections closed successfully")
     except Exception as e:
         logger.error(f"Error closing database connections: {e}")
\ No newline at end of file
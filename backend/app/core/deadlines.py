@@ -0,0 +1,61 @@
+"""
+Per-request deadlines.
+
+DeadlineMiddleware gives every request a RequestDeadline in a context variable, counted
+from arrival. Routes set their own budget with the request_deadline dependency. When the
+deadline passes, the middleware cancels the handler and answers 504. Each database
+transaction begun during the request gets what is left as its statement_timeout, so
+Postgres also abandons the statement and the connection goes back to the pool.
+"""
+import asyncio
+from contextvars import ContextVar
+from dataclasses import dataclass
+from typing import Union
+
+
+@dataclass(slots=True)
+class RequestDeadline:
+    # Event loop clock (monotonic) when the request arrived
+    started: float
+    seconds: Union[float, None] = None
+    _timeout: Union[asyncio.Timeout, None] = None
+
+    @property
+    def expires_at(self) -> Union[float, None]:
+        return None if self.seconds is None else self.started + self.seconds
+
+    def bind(self, timeout: asyncio.Timeout) -> None:
+        """Let later changes to the budget move the timeout that enforces it"""
+        self._timeout = timeout
+
+    def set(self, seconds: Union[float, None]) -> None:
+        self.seconds = seconds
+        if self._timeout is not None:
+            self._timeout.reschedule(self.expires_at)
+
+    def remaining(self) -> Union[float, None]:
+        if self.seconds is None:
+            return None
+        return self.expires_at - asyncio.get_running_loop().time()
+
+
+current_deadline: ContextVar[Union[RequestDeadline, None]] = ContextVar("current_deadline", default=None)
+
+
+def set_request_deadline(seconds: Union[float, None]) -> None:
+    """
+    Give the current request `seconds` from arrival to finish, or no limit for None.
+
+    Without DeadlineMiddleware nothing cancels the request, but statement_timeout still applies.
+    """
+    deadline = current_deadline.get()
+    if deadline is None:
+        deadline = RequestDeadline(started=asyncio.get_running_loop().time())
+        current_deadline.set(deadline)
+    deadline.set(seconds)
+
+
+def remaining_seconds() -> Union[float, None]:
+    """Time left before the current request's deadline; None outside a request or without one"""
+    deadline = current_deadline.get()
+    return None if deadline is None else deadline.remaining()
@@ -0,0 +1,88 @@
+import asyncio
+import logging
+import time
+from datetime import datetime, timezone
+from typing import Any, Dict, Union
+
+from app.core.config import settings
+from app.core.database import check_database_health
+
+logger = logging.getLogger(__name__)
+
+
+class DatabaseHealthMonitor:
+    """
+    Probes the database on a fixed interval in the background and keeps the last result,
+    so health endpoints can answer without touching the connection pool.
+    """
+
+    def __init__(self, interval: float, max_age: float):
+        self.interval = interval
+        self.max_age = max_age
+        self._result: Union[Dict[str, Any], None] = None
+        self._checked_at: Union[datetime, None] = None
+        self._checked_monotonic: Union[float, None] = None
+        self._task: Union[asyncio.Task, None] = None
+
+    async def refresh(self) -> Dict[str, Any]:
+        """Run one probe now and remember its result"""
+        result = await check_database_health()
+        self._result = result
+        self._checked_at = datetime.now(timezone.utc)
+        self._checked_monotonic = time.monotonic()
+        return result
+
+    async def _run(self) -> None:
+        while True:
+            await asyncio.sleep(self.interval)
+            try:
+                previous = self._result.get("status") if self._result else None
+                result = await self.refresh()
+                if result["status"] != previous:
+                    logger.warning(f"Database health changed: {previous} -> {result['status']}")
+            except Exception as e:
+                logger.error(f"Database health probe failed: {e}")
+
+    def start(self) -> None:
+        if self._task is None or self._task.done():
+            self._task = asyncio.create_task(self._run(), name="database-health-monitor")
+
+    async def stop(self) -> None:
+        if self._task is not None:
+            self._task.cancel()
+            try:
+                await self._task
+            except asyncio.CancelledError:
+                pass
+            self._task = None
+
+    @property
+    def age_seconds(self) -> Union[float, None]:
+        if self._checked_monotonic is None:
+            return None
+        return time.monotonic() - self._checked_monotonic
+
+    async def snapshot(self) -> Dict[str, Any]:
+        """Last probe result with its age; probes once if nothing has run yet"""
+        if self._result is None:
+            await self.refresh()
+        return {
+            **self._result,
+            "checked_at": self._checked_at.isoformat(),
+            "age_seconds": round(self.age_seconds, 3),
+        }
+
+    def is_ready(self) -> bool:
+        age = self.age_seconds
+        return (
+            self._result is not None
+            and self._result["status"] == "healthy"
+            and age is not None
+            and age <= self.max_age
+        )
+
+
+database_health_monitor = DatabaseHealthMonitor(
+    interval=settings.DATABASE_HEALTH_CHECK_INTERVAL,
+    max_age=settings.DATABASE_HEALTH_MAX_AGE_SECONDS,
+)
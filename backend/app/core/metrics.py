@@ -0,0 +1,138 @@
+"""
+Prometheus metrics for HTTP requests, SQL queries, pool checkouts, request sessions, the
+database circuit breaker and password hashing.
+
+With several uvicorn workers, point PROMETHEUS_MULTIPROC_DIR at an empty directory shared
+by all of them (and wiped on deploy) before the app starts; each worker writes its samples
+there and /metrics aggregates the whole directory.
+"""
+import os
+from typing import Any, Callable
+
+from prometheus_client import (
+    CONTENT_TYPE_LATEST,
+    REGISTRY,
+    CollectorRegistry,
+    Counter,
+    Gauge,
+    Histogram,
+    generate_latest,
+    multiprocess,
+)
+from starlette.requests import Request
+from starlette.responses import Response
+
+from app.core.circuitbreaker import CLOSED, HALF_OPEN, OPEN
+from app.core.database import add_query_observer, database_breakers, pool_checkout_stats, session_usage_stats
+from app.core.security import hashing_executor
+
+MULTIPROCESS_DIR = os.environ.get("PROMETHEUS_MULTIPROC_DIR")
+
+LATENCY_BUCKETS = (0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0)
+DB_BUCKETS = (0.0005, 0.001, 0.0025, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 5.0)
+
+HTTP_REQUESTS = Counter(
+    "http_requests_total", "HTTP requests handled", ["method", "route", "status"]
+)
+HTTP_IN_FLIGHT = Gauge(
+    "http_requests_in_flight", "HTTP requests currently being handled", ["method"],
+    multiprocess_mode="livesum",
+)
+HTTP_LATENCY = Histogram(
+    "http_request_duration_seconds", "HTTP request latency", ["method", "route"],
+    buckets=LATENCY_BUCKETS,
+)
+DB_QUERIES = Counter(
+    "db_queries_total", "SQL statements executed", ["operation"]
+)
+DB_QUERY_LATENCY = Histogram(
+    "db_query_duration_seconds", "SQL statement execution time", ["operation"],
+    buckets=DB_BUCKETS,
+)
+DB_POOL_CHECKOUT_WAIT = Histogram(
+    "db_pool_checkout_wait_seconds", "Time spent waiting for a pooled connection",
+    buckets=DB_BUCKETS,
+)
+DB_POOL_CHECKOUT_TIMEOUTS = Counter(
+    "db_pool_checkout_timeouts_total", "Pool checkouts that gave up waiting"
+)
+DB_REQUEST_SESSIONS = Counter(
+    "db_request_sessions_total", "Request database sessions by how they ended", ["outcome"]
+)
+DB_BREAKER_STATE = Gauge(
+    "db_circuit_breaker_state", "Database circuit breaker state: 0 closed, 1 half-open, 2 open",
+    ["database"],
+    multiprocess_mode="livemax",
+)
+PASSWORD_HASH_DURATION = Histogram(
+    "password_hash_duration_seconds", "CPU time of one password hash or verify",
+    buckets=LATENCY_BUCKETS,
+)
+PASSWORD_HASH_QUEUE_WAIT = Histogram(
+    "password_hash_queue_wait_seconds", "Time a password job waited for a hashing worker",
+    buckets=LATENCY_BUCKETS,
+)
+
+_KNOWN_OPERATIONS = {"SELECT", "INSERT", "UPDATE", "DELETE", "BEGIN", "COMMIT", "ROLLBACK", "WITH", "COPY"}
+
+
+def _statement_operation(statement: str) -> str:
+    # Keep the label set small: the leading keyword, or "OTHER"
+    keyword = statement.lstrip().split(None, 1)[0].upper() if statement.strip() else ""
+    return keyword if keyword in _KNOWN_OPERATIONS else "OTHER"
+
+
+def _observe_query(statement: str, parameters: Any, seconds: float) -> None:
+    operation = _statement_operation(statement)
+    DB_QUERIES.labels(operation).inc()
+    DB_QUERY_LATENCY.labels(operation).observe(seconds)
+
+
+def _observe_checkout(wait_seconds: float, timed_out: bool) -> None:
+    DB_POOL_CHECKOUT_WAIT.observe(wait_seconds)
+    if timed_out:
+        DB_POOL_CHECKOUT_TIMEOUTS.inc()
+
+
+def _observe_session(outcome: str) -> None:
+    DB_REQUEST_SESSIONS.labels(outcome).inc()
+
+
+_BREAKER_STATE_VALUES = {CLOSED: 0, HALF_OPEN: 1, OPEN: 2}
+
+
+def _breaker_observer(name: str) -> Callable[[str], None]:
+    def observe(state: str) -> None:
+        DB_BREAKER_STATE.labels(name).set(_BREAKER_STATE_VALUES[state])
+    return observe
+
+
+def _observe_hash(hash_seconds: float, wait_seconds: float) -> None:
+    PASSWORD_HASH_DURATION.observe(hash_seconds)
+    PASSWORD_HASH_QUEUE_WAIT.observe(wait_seconds)
+
+
+def install_metrics_observers() -> None:
+    add_query_observer(_observe_query)
+    pool_checkout_stats.add_observer(_observe_checkout)
+    session_usage_stats.add_observer(_observe_session)
+    for name, breaker in database_breakers.items():
+        DB_BREAKER_STATE.labels(name).set(_BREAKER_STATE_VALUES[breaker.state])
+        breaker.add_observer(_breaker_observer(name))
+    hashing_executor.add_observer(_observe_hash)
+
+
+def mark_worker_dead() -> None:
+    """Drop this worker's live gauges from the shared directory on shutdown"""
+    if MULTIPROCESS_DIR:
+        multiprocess.mark_process_dead(os.getpid())
+
+
+async def metrics_endpoint(request: Request) -> Response:
+    """Text exposition of every metric, aggregated across workers when multiprocess"""
+    if MULTIPROCESS_DIR:
+        registry = CollectorRegistry()
+        multiprocess.MultiProcessCollector(registry)
+    else:
+        registry = REGISTRY
+    return Response(generate_latest(registry), media_type=CONTENT_TYPE_LATEST)
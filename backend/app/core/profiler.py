@@ -0,0 +1,78 @@
+"""
+A small wall-clock sampling profiler for one thread.
+
+A daemon thread reads the target thread's current frame every `interval` seconds and
+counts whole stacks. The result is in collapsed-stack format ("a;b;c 12" per line),
+which speedscope, flamegraph.pl and inferno load directly.
+
+The event loop thread runs every request, so a sampler given an `anchor` frame keeps
+full stacks only for samples taken while that frame is on the stack, i.e. while the
+profiled request's own code runs. Every other sample still counts, as one of two
+frames: OTHER_TASKS when some other task was running, LOOP_IDLE when the loop was
+waiting in the selector, which is where a request spends time awaiting I/O.
+"""
+import os
+import sys
+import threading
+from collections import Counter
+from types import FrameType
+from typing import Union
+
+OTHER_TASKS = "[other tasks]"
+LOOP_IDLE = "[event loop idle]"
+
+
+def _frame_label(frame: FrameType) -> str:
+    code = frame.f_code
+    # ";" separates frames in collapsed stacks; the count follows the last space
+    name = code.co_qualname.replace(";", ":")
+    return f"{name} ({os.path.basename(code.co_filename)}:{code.co_firstlineno})"
+
+
+class StackSampler:
+    def __init__(self, thread_id: int, interval: float = 0.001, anchor: Union[FrameType, None] = None):
+        self.thread_id = thread_id
+        self.interval = interval
+        self.anchor = anchor
+        self.samples: Counter[str] = Counter()
+        self._stop = threading.Event()
+        self._thread: threading.Thread | None = None
+
+    def start(self) -> None:
+        self._thread = threading.Thread(target=self._run, name="request-profiler", daemon=True)
+        self._thread.start()
+
+    def stop(self) -> None:
+        self._stop.set()
+        if self._thread is not None:
+            self._thread.join()
+
+    def _run(self) -> None:
+        while not self._stop.wait(self.interval):
+            frame = sys._current_frames().get(self.thread_id)
+            stack = []
+            anchored = self.anchor is None
+            idle = False
+            while frame is not None:
+                stack.append(_frame_label(frame))
+                anchored = anchored or frame is self.anchor
+                idle = idle or frame.f_code.co_filename.endswith("selectors.py")
+                frame = frame.f_back
+            if not stack:
+                continue
+            if anchored:
+                self.samples[";".join(reversed(stack))] += 1
+            else:
+                self.samples[LOOP_IDLE if idle else OTHER_TASKS] += 1
+
+    def collapsed(self, max_bytes: Union[int, None] = None) -> str:
+        """Stacks, most sampled first; with `max_bytes`, the rarest are left out to fit"""
+        lines = []
+        size = 0
+        for stack, count in self.samples.most_common():
+            line = f"{stack} {count}\n"
+            size += len(line.encode())
+            if max_bytes is not None and size > max_bytes:
+                break
+            lines.append(line)
+        return "".join(lines)
@@ -0,0 +1,49 @@
+"""
+Per-request SQL accounting.
+
+The query observer attributes every statement to the request that issued it through a
+context variable, so a handler's own statements and those of its dependencies add up in
+one place. Statements run outside a request (health monitor, startup) are ignored.
+"""
+from collections import Counter
+from contextvars import ContextVar
+from dataclasses import dataclass, field
+from typing import Any, Union
+
+from app.core.database import add_query_observer
+
+
+@dataclass(slots=True)
+class RequestQueryStats:
+    count: int = 0
+    seconds: float = 0.0
+    # Keyed by the statement as sent; SQLAlchemy already binds values as parameters,
+    # so the text is the template and an N+1 loop shows up as one key with a high count
+    templates: Counter = field(default_factory=Counter)
+
+    @property
+    def milliseconds(self) -> float:
+        return self.seconds * 1000
+
+    def most_repeated(self) -> tuple[Union[str, None], int]:
+        if not self.templates:
+            return None, 0
+        return self.templates.most_common(1)[0]
+
+
+current_query_stats: ContextVar[Union[RequestQueryStats, None]] = ContextVar(
+    "current_query_stats", default=None
+)
+
+
+def _record_query(statement: str, parameters: Any, seconds: float) -> None:
+    stats = current_query_stats.get()
+    if stats is None:
+        return
+    stats.count += 1
+    stats.seconds += seconds
+    stats.templates[statement] += 1
+
+
+def install_query_stats_observer() -> None:
+    add_query_observer(_record_query)
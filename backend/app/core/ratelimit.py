@@ -0,0 +1,205 @@
+"""
+Sliding-window rate limiting for login attempts.
+
+Each key keeps two fixed buckets, the current window and the one before it; the count
+used for a decision is the previous bucket weighted by how much of it still overlaps the
+sliding window, plus the current bucket. That is three numbers per key instead of a
+timestamp per attempt.
+
+Counters live behind RateLimitBackend. The in-memory backend is per worker; the SQLite
+backend lets every worker on one host share counters through a local file and stands in
+for a networked store such as Redis, which would implement the same `hit` method.
+"""
+import asyncio
+import itertools
+import math
+import sqlite3
+import threading
+import time
+from abc import ABC, abstractmethod
+from collections import OrderedDict
+
+from app.core.config import settings
+from app.exceptions import RateLimitedError, ServiceOverloadedError
+
+
+def _slide(bucket: float, previous: int, current: int, now: float, window: float) -> tuple[float, int, int]:
+    """Move a key's buckets forward to the window containing `now`"""
+    now_bucket = math.floor(now / window) * window
+    if now_bucket == bucket:
+        return bucket, previous, current
+    if now_bucket - bucket == window:
+        return now_bucket, current, 0
+    return now_bucket, 0, 0
+
+
+def _retry_after(bucket: float, previous: int, current: int, now: float, window: float, limit: int) -> float:
+    """Seconds until one more attempt fits under `limit`"""
+    # Solve previous * (1 - elapsed / window) + current + 1 <= limit for elapsed
+    if current + 1 <= limit:
+        return max(bucket + window * (1 - (limit - 1 - current) / previous) - now, 0.0)
+    # The current bucket alone is full, so wait for it to become the previous one
+    next_bucket = bucket + window
+    return max(next_bucket + window * (1 - (limit - 1) / current) - now, 0.0)
+
+
+def _decide(
+    bucket: float, previous: int, current: int, now: float, window: float, limit: int
+) -> tuple[int, float]:
+    """Return (new current count, retry_after); retry_after is 0 when the attempt is allowed"""
+    estimate = previous * (1 - (now - bucket) / window) + current
+    if estimate + 1 > limit:
+        return current, _retry_after(bucket, previous, current, now, window, limit) or window / 1000
+    return current + 1, 0.0
+
+
+class RateLimitBackend(ABC):
+    @abstractmethod
+    async def hit(self, key: str, limit: int, window: float) -> float:
+        """
+        Count one attempt for `key` if it fits in `limit` per sliding `window` seconds.
+
+        Returns 0 when the attempt was allowed, otherwise the seconds to wait; rejected
+        attempts are not counted.
+        """
+
+
+class MemoryRateLimitBackend(RateLimitBackend):
+    """Per-process counters, least recently used first, bounded at `max_keys`"""
+
+    def __init__(self, max_keys: int = 100_000):
+        self.max_keys = max_keys
+        # key -> (bucket start, previous count, current count, expires at)
+        self._keys: "OrderedDict[str, tuple[float, int, int, float]]" = OrderedDict()
+
+    async def hit(self, key: str, limit: int, window: float) -> float:
+        now = time.time()
+        self._evict_expired(now)
+        bucket, previous, current, _ = self._keys.get(key, (0.0, 0, 0, 0.0))
+        bucket, previous, current = _slide(bucket, previous, current, now, window)
+        current, retry_after = _decide(bucket, previous, current, now, window, limit)
+        # Nothing about a key matters once both of its buckets have slid out of the window
+        self._keys[key] = (bucket, previous, current, bucket + 2 * window)
+        self._keys.move_to_end(key)
+        while len(self._keys) > self.max_keys:
+            self._keys.popitem(last=False)
+        return retry_after
+
+    def _evict_expired(self, now: float) -> None:
+        while self._keys:
+            key, (_, _, _, expires_at) = next(iter(self._keys.items()))
+            if expires_at > now:
+                return
+            del self._keys[key]
+
+    def __len__(self) -> int:
+        return len(self._keys)
+
+
+class SQLiteRateLimitBackend(RateLimitBackend):
+    """
+    Counters in a SQLite file shared by every worker on the host.
+
+    Expired rows are purged every `purge_every` hits per process, in a transaction of
+    their own, so a hit only holds the write lock for its own row. A hit that cannot get
+    the lock within `timeout` seconds raises ServiceOverloadedError (503).
+    """
+
+    def __init__(self, path: str, timeout: float = 5.0, purge_every: int = 1000):
+        self.path = path
+        self.timeout = timeout
+        self.purge_every = purge_every
+        self._local = threading.local()
+        self._hits = itertools.count(1)
+
+    def _connection(self) -> sqlite3.Connection:
+        connection = getattr(self._local, "connection", None)
+        if connection is None:
+            connection = sqlite3.connect(self.path, timeout=self.timeout, isolation_level=None)
+            connection.execute("PRAGMA journal_mode=WAL")
+            connection.execute(
+                "CREATE TABLE IF NOT EXISTS rate_limits ("
+                " key TEXT PRIMARY KEY, bucket REAL NOT NULL, previous INTEGER NOT NULL,"
+                " current INTEGER NOT NULL, expires_at REAL NOT NULL)"
+            )
+            connection.execute("CREATE INDEX IF NOT EXISTS rate_limits_expires_at ON rate_limits (expires_at)")
+            self._local.connection = connection
+        return connection
+
+    def _hit_sync(self, key: str, limit: int, window: float) -> float:
+        try:
+            retry_after = self._count(key, limit, window)
+            if next(self._hits) % self.purge_every == 0:
+                self.purge_expired()
+        except sqlite3.OperationalError:
+            # Raised once the busy timeout has run out waiting for another worker's lock
+            raise ServiceOverloadedError("Rate limit store is busy, please retry later")
+        return retry_after
+
+    def _count(self, key: str, limit: int, window: float) -> float:
+        connection = self._connection()
+        # IMMEDIATE takes the write lock up front so concurrent workers serialize per hit
+        connection.execute("BEGIN IMMEDIATE")
+        try:
+            now = time.time()
+            row = connection.execute(
+                "SELECT bucket, previous, current FROM rate_limits WHERE key = ?", (key,)
+            ).fetchone()
+            bucket, previous, current = _slide(*(row or (0.0, 0, 0)), now, window)
+            current, retry_after = _decide(bucket, previous, current, now, window, limit)
+            connection.execute(
+                "INSERT OR REPLACE INTO rate_limits (key, bucket, previous, current, expires_at)"
+                " VALUES (?, ?, ?, ?, ?)",
+                (key, bucket, previous, current, bucket + 2 * window),
+            )
+            connection.execute("COMMIT")
+        except BaseException:
+            connection.execute("ROLLBACK")
+            raise
+        return retry_after
+
+    def purge_expired(self) -> int:
+        """Delete rows whose buckets have slid out of their window; returns how many"""
+        # Autocommit: a single indexed DELETE is its own short transaction
+        return self._connection().execute("DELETE FROM rate_limits WHERE expires_at <= ?", (time.time(),)).rowcount
+
+    async def hit(self, key: str, limit: int, window: float) -> float:
+        return await asyncio.to_thread(self._hit_sync, key, limit, window)
+
+
+class LoginRateLimiter:
+    """
+    Limits login attempts per client IP and per email before any database or bcrypt work.
+
+    Every attempt counts, successful or not, since the outcome is unknown until the
+    expensive part has run.
+    """
+
+    def __init__(self, backend: RateLimitBackend, per_email: int, per_ip: int, window: float):
+        self.backend = backend
+        self.per_email = per_email
+        self.per_ip = per_ip
+        self.window = window
+
+    async def check(self, *, email: str, ip: str) -> None:
+        """Raise RateLimitedError (429) when either key is over its limit"""
+        retry_after = await self.backend.hit(f"login:ip:{ip}", self.per_ip, self.window)
+        if retry_after:
+            raise RateLimitedError("Too many login attempts from this address", retry_after=retry_after)
+        retry_after = await self.backend.hit(f"login:email:{email.strip().lower()}", self.per_email, self.window)
+        if retry_after:
+            raise RateLimitedError("Too many login attempts for this account", retry_after=retry_after)
+
+
+def _build_backend() -> RateLimitBackend:
+    if settings.LOGIN_RATE_LIMIT_BACKEND == "sqlite":
+        return SQLiteRateLimitBackend(settings.LOGIN_RATE_LIMIT_SQLITE_PATH)
+    return MemoryRateLimitBackend(max_keys=settings.LOGIN_RATE_LIMIT_MAX_KEYS)
+
+
+login_rate_limiter = LoginRateLimiter(
+    backend=_build_backend(),
+    per_email=settings.LOGIN_RATE_LIMIT_PER_EMAIL,
+    per_ip=settings.LOGIN_RATE_LIMIT_PER_IP,
+    window=settings.LOGIN_RATE_LIMIT_WINDOW_SECONDS,
+)
@@ -0,0 +1,28 @@
+from typing import Any
+import orjson
+from fastapi.responses import JSONResponse, Response
+from pydantic import BaseModel
+
+
+class FastJSONResponse(JSONResponse):
+    """
+    Default response class: renders with orjson instead of the stdlib json encoder.
+    orjson handles datetime, UUID and dataclasses natively.
+    """
+
+    def render(self, content: Any) -> bytes:
+        return orjson.dumps(content, option=orjson.OPT_NON_STR_KEYS)
+
+
+class ModelResponse(Response):
+    """
+    Serializes an already validated Pydantic model straight to JSON bytes.
+
+    Returning a Response skips FastAPI's response_model pass, so the model is not
+    validated a second time nor routed through jsonable_encoder.
+    """
+
+    media_type = "application/json"
+
+    def render(self, content: BaseModel) -> bytes:
+        return content.__pydantic_serializer__.to_json(content)
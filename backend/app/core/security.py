@@ -1,19 +1,277 @@
+import asyncio
+import secrets
+import time
+import uuid
+from collections import Counter
+from concurrent.futures import Executor, ProcessPoolExecutor, ThreadPoolExecutor
+from concurrent.futures.process import BrokenProcessPool
 from datetime import datetime, timedelta, timezone
-from typing import Any
+from typing import Any, Callable, Dict, Literal, Union
 import jwt
 from passlib.context import CryptContext
+from passlib.registry import get_crypt_handler
 from app.core.config import settings
+from app.exceptions import ServiceOverloadedError
 
-pwd_context = CryptContext(schemes=["bcrypt"], deprecated="auto")
+def build_password_context(
+    scheme: Literal["bcrypt", "argon2"] = settings.PASSWORD_HASH_SCHEME,
+    bcrypt_rounds: int = settings.PASSWORD_BCRYPT_ROUNDS,
+    argon2_time_cost: int = settings.PASSWORD_ARGON2_TIME_COST,
+    argon2_memory_cost: int = settings.PASSWORD_ARGON2_MEMORY_COST,
+    argon2_parallelism: int = settings.PASSWORD_ARGON2_PARALLELISM,
+) -> CryptContext:
+    """
+    New hashes use `scheme` at the configured cost; both schemes always verify.
 
-def create_access_token(subject: str | Any, expires_delta: timedelta) -> str:
+    Any hash in the other scheme, or with other cost parameters, reports needs_update,
+    which is what lets a login upgrade it after changing these settings.
+    """
+    return CryptContext(
+        schemes=["argon2", "bcrypt"] if scheme == "argon2" else ["bcrypt", "argon2"],
+        default=scheme,
+        deprecated="auto",
+        bcrypt__rounds=bcrypt_rounds,
+        bcrypt__min_rounds=bcrypt_rounds,
+        argon2__type="ID",
+        argon2__time_cost=argon2_time_cost,
+        argon2__memory_cost=argon2_memory_cost,
+        argon2__parallelism=argon2_parallelism,
+    )
+
+pwd_context = build_password_context()
+
+def create_access_token(
+    subject: str | Any,
+    expires_delta: timedelta,
+    claims: Union[Dict[str, Any], None] = None,
+    jti: Union[str, None] = None,
+) -> str:
     expire = datetime.now(timezone.utc) + expires_delta
-    to_encode = {"exp": expire, "sub": str(subject)}
+    to_encode = {**(claims or {}), "exp": expire, "sub": str(subject), "jti": jti or uuid.uuid4().hex}
     encoded_jwt = jwt.encode(to_encode, settings.SECRET_KEY, algorithm=settings.ALGORITHM)
     return encoded_jwt
 
-def verify_password(plain_password: str, hashed_password: str) -> bool:
+
+# Worker-side functions. They live at module level so a process pool can pickle them,
+# and they time themselves so the hash cost can be told apart from time spent queued.
+
+def _timed(fn: Callable[..., Any], *args: Any) -> tuple[Any, float]:
+    started = time.perf_counter()
+    result = fn(*args)
+    return result, time.perf_counter() - started
+
+def _verify_password_sync(plain_password: str, hashed_password: str) -> bool:
     return pwd_context.verify(plain_password, hashed_password)
 
-def get_password_hash(password: str) -> str:
+def _verify_password_needs_update_sync(plain_password: str, hashed_password: str) -> tuple[bool, bool]:
+    verified = pwd_context.verify(plain_password, hashed_password)
+    return verified, verified and pwd_context.needs_update(hashed_password)
+
+def _get_password_hash_sync(password: str) -> str:
     return pwd_context.hash(password)
+
+def _hash_many_sync(passwords: list[str]) -> list[str]:
+    return [pwd_context.hash(password) for password in passwords]
+
+
+class PasswordHashingExecutor:
+    """
+    Runs CPU-bound password hashing on a bounded worker pool so bcrypt never blocks the event loop.
+
+    At most `max_workers` hashes run at once and at most `queue_limit` more may wait for a worker.
+    Anything beyond that is rejected with a 503 instead of piling up behind the pool.
+    """
+
+    def __init__(
+        self,
+        kind: Literal["thread", "process"] = "thread",
+        max_workers: int = 4,
+        queue_limit: int = 64,
+        executor: Union[Executor, None] = None,
+    ):
+        self.kind = kind if executor is None else type(executor).__name__
+        self.max_workers = max_workers
+        self.queue_limit = queue_limit
+        self._executor = executor
+        self._pending = 0
+        self._completed = 0
+        self._rejected = 0
+        self._hash_seconds_total = 0.0
+        self._hash_seconds_max = 0.0
+        self._wait_seconds_total = 0.0
+        self._wait_seconds_max = 0.0
+        self._observers: list[Callable[[float, float], None]] = []
+
+    def add_observer(self, observer: Callable[[float, float], None]) -> None:
+        """Call `observer(hash_seconds, wait_seconds)` after every completed job"""
+        self._observers.append(observer)
+
+    def _get_executor(self) -> Executor:
+        # Created lazily so importing this module never forks worker processes
+        if self._executor is None:
+            if self.kind == "process":
+                self._executor = ProcessPoolExecutor(max_workers=self.max_workers)
+            else:
+                self._executor = ThreadPoolExecutor(
+                    max_workers=self.max_workers, thread_name_prefix="password-hash"
+                )
+        return self._executor
+
+    async def run(self, fn: Callable[..., Any], *args: Any) -> Any:
+        """Run `fn(*args)` on the pool, shedding load when the queue is full"""
+        if self._pending >= self.max_workers + self.queue_limit:
+            self._rejected += 1
+            raise ServiceOverloadedError(
+                "Too many concurrent password operations, please retry later",
+                details={"queue_limit": self.queue_limit},
+            )
+
+        self._pending += 1
+        submitted = time.perf_counter()
+        try:
+            loop = asyncio.get_running_loop()
+            result, hash_seconds = await loop.run_in_executor(self._get_executor(), _timed, fn, *args)
+        finally:
+            self._pending -= 1
+
+        wait_seconds = max(time.perf_counter() - submitted - hash_seconds, 0.0)
+        self._completed += 1
+        self._hash_seconds_total += hash_seconds
+        self._hash_seconds_max = max(self._hash_seconds_max, hash_seconds)
+        self._wait_seconds_total += wait_seconds
+        self._wait_seconds_max = max(self._wait_seconds_max, wait_seconds)
+        for observer in self._observers:
+            observer(hash_seconds, wait_seconds)
+        return result
+
+    def stats(self) -> Dict[str, Any]:
+        completed = self._completed or 1
+        return {
+            "executor": self.kind,
+            "max_workers": self.max_workers,
+            "queue_limit": self.queue_limit,
+            "in_flight": min(self._pending, self.max_workers),
+            "queue_depth": max(self._pending - self.max_workers, 0),
+            "completed": self._completed,
+            "rejected": self._rejected,
+            "hash_ms_avg": round(self._hash_seconds_total / completed * 1000, 2),
+            "hash_ms_max": round(self._hash_seconds_max * 1000, 2),
+            "queue_wait_ms_avg": round(self._wait_seconds_total / completed * 1000, 2),
+            "queue_wait_ms_max": round(self._wait_seconds_max * 1000, 2),
+        }
+
+    def shutdown(self) -> None:
+        if self._executor is not None:
+            self._executor.shutdown(wait=False, cancel_futures=True)
+            self._executor = None
+
+
+hashing_executor = PasswordHashingExecutor(
+    kind=settings.PASSWORD_HASH_EXECUTOR,
+    max_workers=settings.PASSWORD_HASH_WORKERS,
+    queue_limit=settings.PASSWORD_HASH_QUEUE_LIMIT,
+)
+
+async def verify_password(plain_password: str, hashed_password: str) -> bool:
+    _note_hash_settings(hashed_password)
+    return await hashing_executor.run(_verify_password_sync, plain_password, hashed_password)
+
+async def verify_password_needs_update(plain_password: str, hashed_password: str) -> tuple[bool, bool]:
+    """
+    Verify, and report whether a verified hash is due for the current scheme or cost.
+
+    The same check passlib's verify_and_update makes, without computing the new hash
+    on the caller's critical path; the caller rehashes later if it wants to.
+    """
+    _note_hash_settings(hashed_password)
+    return await hashing_executor.run(_verify_password_needs_update_sync, plain_password, hashed_password)
+
+async def get_password_hash(password: str) -> str:
+    return await hashing_executor.run(_get_password_hash_sync, password)
+
+# (scheme, cost parameters) of the stored hashes real verifies have checked, with counts
+HashSettings = tuple[str, tuple[tuple[str, Any], ...]]
+_verified_hash_settings: Counter[HashSettings] = Counter()
+# Hashes of random passwords nobody knows, one per HashSettings; None is the current scheme and cost
+_dummy_hashes: Dict[Union[HashSettings, None], str] = {}
+
+def _hash_settings(hashed_password: str) -> Union[HashSettings, None]:
+    """The scheme and cost a stored hash verifies with, as arguments for its handler's using()"""
+    scheme = pwd_context.identify(hashed_password, required=False)
+    if scheme not in ("bcrypt", "argon2"):
+        return None
+    try:
+        parsed = get_crypt_handler(scheme).from_string(hashed_password)
+    except ValueError:
+        return None
+    if scheme == "bcrypt":
+        return scheme, (("ident", parsed.ident), ("rounds", parsed.rounds))
+    return scheme, (
+        ("type", parsed.type),
+        ("rounds", parsed.rounds),
+        ("memory_cost", parsed.memory_cost),
+        ("parallelism", parsed.parallelism),
+    )
+
+def _note_hash_settings(hashed_password: str) -> None:
+    hash_settings = _hash_settings(hashed_password)
+    if hash_settings is not None:
+        _verified_hash_settings[hash_settings] += 1
+
+def _dummy_hash_sync(hash_settings: HashSettings) -> str:
+    scheme, params = hash_settings
+    return get_crypt_handler(scheme).using(**dict(params)).hash(secrets.token_urlsafe(16))
+
+async def verify_dummy_password(password: str) -> None:
+    """
+    Spend the same time as verifying a real password, for logins that have no user to check.
+
+    The dummy hash uses the scheme and cost that real verifies have met most often, not
+    the configured one: until stored hashes are upgraded they keep their old scheme, and
+    a dummy in the new scheme would make unknown emails stand out by latency. Runs on the
+    same executor as real verifies, so it also counts against the hashing queue.
+    """
+    most_common = _verified_hash_settings.most_common(1)
+    hash_settings = most_common[0][0] if most_common else None
+    dummy_hash = _dummy_hashes.get(hash_settings)
+    if dummy_hash is None:
+        if hash_settings is None:
+            dummy_hash = await get_password_hash(secrets.token_urlsafe(16))
+        else:
+            dummy_hash = await hashing_executor.run(_dummy_hash_sync, hash_settings)
+        _dummy_hashes[hash_settings] = dummy_hash
+    # Straight to the executor, so the dummy is not counted as a stored hash
+    await hashing_executor.run(_verify_password_sync, password, dummy_hash)
+
+bulk_hashing_executor = PasswordHashingExecutor(
+    kind="process",
+    max_workers=settings.USER_IMPORT_HASH_WORKERS,
+    queue_limit=settings.USER_IMPORT_HASH_WORKERS,
+)
+
+async def hash_passwords_bulk(passwords: list[str], chunk_size: int = 64) -> list[str]:
+    """
+    Hash many passwords in parallel for bulk imports, in input order.
+
+    Runs on bulk_hashing_executor, a long-lived process pool of its own, so an import never
+    competes with logins for the request-path executor. Each import keeps at most one chunk
+    per worker submitted; if it fails or is cancelled the rest are never sent.
+    """
+    chunks = [passwords[i:i + chunk_size] for i in range(0, len(passwords), chunk_size)]
+    slots = asyncio.Semaphore(bulk_hashing_executor.max_workers)
+
+    async def hash_chunk(chunk: list[str]) -> list[str]:
+        async with slots:
+            return await bulk_hashing_executor.run(_hash_many_sync, chunk)
+
+    tasks = [asyncio.create_task(hash_chunk(chunk)) for chunk in chunks]
+    try:
+        hashed = await asyncio.gather(*tasks)
+    except BaseException as e:
+        for task in tasks:
+            task.cancel()
+        if isinstance(e, BrokenProcessPool):
+            # A dead worker breaks the pool for good; drop it without waiting so the next import starts a fresh one
+            bulk_hashing_executor.shutdown()
+        raise
+    return [hashed_password for chunk in hashed for hashed_password in chunk]
@@ -0,0 +1,176 @@
+"""
+Slow-query log with per-fingerprint latency statistics.
+
+Every statement is reduced to a fingerprint (literals, placeholders and IN-lists
+replaced) so that the same query with different values aggregates into one entry.
+Each entry keeps a rolling window of recent durations for p50/p95 plus running
+count, total and max. A statement slower than the threshold is logged, and the first
+time a fingerprint is slow its plan is captured with EXPLAIN in a background task.
+"""
+import asyncio
+import contextvars
+import logging
+import re
+import time
+from collections import deque
+from functools import lru_cache
+from typing import Any, Dict, Union
+
+from app.core.config import settings
+from app.core.database import add_query_observer, engine
+
+logger = logging.getLogger(__name__)
+
+_STRING_LITERAL = re.compile(r"'(?:[^']|'')*'")
+_PLACEHOLDER = re.compile(r"\$\d+|%\(\w+\)s|(?<![:\w]):\w+\b|\?")
+_NUMBER = re.compile(r"(?<![\w.])-?\d+(?:\.\d+)?\b")
+_VALUE_LIST = re.compile(r"\(\s*\?(?:\s*,\s*\?)*\s*\)")
+_WHITESPACE = re.compile(r"\s+")
+
+# Plans are only worth capturing for statements the planner handles
+_EXPLAINABLE = ("SELECT", "INSERT", "UPDATE", "DELETE", "WITH")
+
+
+@lru_cache(maxsize=2048)
+def fingerprint(statement: str) -> str:
+    """Normalize a statement so that only its shape remains"""
+    normalized = _STRING_LITERAL.sub("?", statement)
+    normalized = _PLACEHOLDER.sub("?", normalized)
+    normalized = _NUMBER.sub("?", normalized)
+    normalized = _VALUE_LIST.sub("(...)", normalized)
+    return _WHITESPACE.sub(" ", normalized).strip()
+
+
+def _percentile(ordered: list[float], fraction: float) -> float:
+    return ordered[min(int(len(ordered) * fraction), len(ordered) - 1)]
+
+
+class FingerprintStats:
+    __slots__ = ("statement", "count", "slow_count", "total_seconds", "max_seconds", "recent", "plan")
+
+    def __init__(self, statement: str, window: int):
+        self.statement = statement
+        self.count = 0
+        self.slow_count = 0
+        self.total_seconds = 0.0
+        self.max_seconds = 0.0
+        self.recent: deque[float] = deque(maxlen=window)
+        self.plan: Union[list[str], None] = None
+
+    def to_dict(self) -> Dict[str, Any]:
+        ordered = sorted(self.recent)
+        return {
+            "statement": self.statement,
+            "count": self.count,
+            "slow_count": self.slow_count,
+            "total_ms": round(self.total_seconds * 1000, 2),
+            "mean_ms": round(self.total_seconds / self.count * 1000, 2),
+            "p50_ms": round(_percentile(ordered, 0.50) * 1000, 2),
+            "p95_ms": round(_percentile(ordered, 0.95) * 1000, 2),
+            "max_ms": round(self.max_seconds * 1000, 2),
+            "plan": self.plan,
+        }
+
+
+class SlowQueryLog:
+    """
+    In-memory per-fingerprint statistics for this worker.
+
+    At most `max_fingerprints` distinct shapes are tracked; statements with a new shape
+    past that are only counted as untracked, so memory stays bounded.
+    """
+
+    def __init__(
+        self,
+        threshold_seconds: float,
+        window: int = 500,
+        max_fingerprints: int = 1000,
+        explain: bool = True,
+    ):
+        self.threshold_seconds = threshold_seconds
+        self.window = window
+        self.max_fingerprints = max_fingerprints
+        self.explain = explain
+        self._stats: Dict[str, FingerprintStats] = {}
+        self._untracked = 0
+        self._explaining: set[str] = set()
+        self._tasks: set[asyncio.Task] = set()
+        self._started_at = time.time()
+
+    def record(self, statement: str, parameters: Any, seconds: float) -> None:
+        if statement.lstrip()[:7].upper() == "EXPLAIN":
+            return
+        key = fingerprint(statement)
+        stats = self._stats.get(key)
+        if stats is None:
+            if len(self._stats) >= self.max_fingerprints:
+                self._untracked += 1
+                return
+            stats = self._stats[key] = FingerprintStats(key, self.window)
+
+        stats.count += 1
+        stats.total_seconds += seconds
+        stats.max_seconds = max(stats.max_seconds, seconds)
+        stats.recent.append(seconds)
+
+        if seconds < self.threshold_seconds:
+            return
+        stats.slow_count += 1
+        logger.warning(f"Slow query ({seconds * 1000:.1f} ms): {key[:500]}")
+        if self.explain and stats.plan is None and key not in self._explaining:
+            self._schedule_explain(key, statement, parameters)
+
+    def _schedule_explain(self, key: str, statement: str, parameters: Any) -> None:
+        if statement.lstrip().split(None, 1)[0].upper() not in _EXPLAINABLE:
+            return
+        try:
+            loop = asyncio.get_running_loop()
+        except RuntimeError:
+            return
+        self._explaining.add(key)
+        # A fresh context keeps the EXPLAIN out of the triggering request's query stats
+        task = loop.create_task(self._capture_plan(key, statement, parameters), context=contextvars.Context())
+        self._tasks.add(task)
+        task.add_done_callback(self._tasks.discard)
+
+    async def _capture_plan(self, key: str, statement: str, parameters: Any) -> None:
+        try:
+            async with engine.connect() as conn:
+                result = await conn.exec_driver_sql(f"EXPLAIN (ANALYZE off) {statement}", parameters)
+                plan = [row[0] for row in result]
+            stats = self._stats.get(key)
+            if stats is not None:
+                stats.plan = plan
+        except Exception as e:
+            logger.debug(f"Could not EXPLAIN slow query: {e}")
+        finally:
+            self._explaining.discard(key)
+
+    def top(self, limit: int = 20) -> Dict[str, Any]:
+        """The `limit` fingerprints with the most total time"""
+        ranked = sorted(self._stats.values(), key=lambda stats: stats.total_seconds, reverse=True)
+        return {
+            "threshold_ms": round(self.threshold_seconds * 1000, 2),
+            "window": self.window,
+            "tracked_since": self._started_at,
+            "fingerprints": len(self._stats),
+            "untracked": self._untracked,
+            "queries": [stats.to_dict() for stats in ranked[:limit]],
+        }
+
+    def clear(self) -> None:
+        self._stats.clear()
+        self._untracked = 0
+        self._started_at = time.time()
+
+
+slow_query_log = SlowQueryLog(
+    threshold_seconds=settings.SLOW_QUERY_THRESHOLD_MS / 1000,
+    window=settings.SLOW_QUERY_WINDOW,
+    max_fingerprints=settings.SLOW_QUERY_MAX_FINGERPRINTS,
+    explain=settings.SLOW_QUERY_EXPLAIN,
+)
+
+
+def install_slow_query_log() -> None:
+    add_query_observer(slow_query_log.record)
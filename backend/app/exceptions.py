@@ -24,12 +24,14 @@ class BaseAPIException(Exception):
         message: str,
         status_code: int = status.HTTP_400_BAD_REQUEST,
         error_code: Optional[str] = None,
-        details: Optional[Dict[str, Any]] = None
+        details: Optional[Dict[str, Any]] = None,
+        headers: Optional[Dict[str, str]] = None
     ):
         self.message = message
         self.status_code = status_code
         self.error_code = error_code
         self.details = details or {}
+        self.headers = headers
         super().__init__(self.message)
 
 
@@ -51,4 +53,36 @@ class NotFoundError(BaseAPIException):
             message=message,
             status_code=status.HTTP_404_NOT_FOUND,
             error_code="RESOURCE_NOT_FOUND"
-        )
\ No newline at end of file
+        )
+
+class PayloadTooLargeError(BaseAPIException):
+    """Raised when an upload is bigger than the endpoint accepts"""
+    def __init__(self, message: str = "Upload is too large", max_bytes: Optional[int] = None):
+        super().__init__(
+            message=message,
+            status_code=status.HTTP_413_CONTENT_TOO_LARGE,
+            error_code="PAYLOAD_TOO_LARGE",
+            details={"max_bytes": max_bytes} if max_bytes is not None else None
+        )
+
+class ServiceOverloadedError(BaseAPIException):
+    """Raised when a bounded worker pool has no room left for more work"""
+    def __init__(self, message: str = "Service is overloaded, please retry later", details: Dict[str, Any] = None):
+        super().__init__(
+            message=message,
+            status_code=status.HTTP_503_SERVICE_UNAVAILABLE,
+            error_code="SERVICE_OVERLOADED",
+            details=details
+        )
+
+class RateLimitedError(BaseAPIException):
+    """Raised when a caller has used up its attempts for the current window"""
+    def __init__(self, message: str = "Too many attempts, please retry later", retry_after: float = 1.0):
+        retry_after_seconds = max(int(retry_after + 0.999), 1)
+        super().__init__(
+            message=message,
+            status_code=status.HTTP_429_TOO_MANY_REQUESTS,
+            error_code="RATE_LIMITED",
+            details={"retry_after": retry_after_seconds},
+            headers={"Retry-After": str(retry_after_seconds)}
+        )
@@ -7,13 +7,23 @@ from starlette.middleware.cors import CORSMiddleware
 
 from app.core.database import (
     create_db_and_tables, 
-    check_database_health, 
     wait_for_database,
     close_db_connections
 )
+from app.core.health import database_health_monitor
 from app.core.config import settings
+from app.core.security import bulk_hashing_executor, hashing_executor
+from app.services.revocationservice import revocation_list
+from app.core.responses import FastJSONResponse
 from app.api.main import api_router
 from app.middleware.error_handlers import setup_exception_handlers
+from app.middleware.metrics import MetricsMiddleware
+from app.middleware.querystats import QueryStatsMiddleware
+from app.middleware.profiler import ProfilerMiddleware
+from app.middleware.deadline import DeadlineMiddleware
+from app.core import metrics
+from app.core.querystats import install_query_stats_observer
+from app.core.slowqueries import install_slow_query_log
 
 # Configure logging
 logging.basicConfig(
@@ -34,7 +44,7 @@ async def lifespan(app: FastAPI):
     try:
         # Check database health first
         logger.info("🔍 Checking database health...")
-        health = await check_database_health()
+        health = await database_health_monitor.refresh()
         
         if health["status"] != "healthy":
             logger.error("❌ Database health check failed!")
@@ -68,6 +78,10 @@ async def lifespan(app: FastAPI):
             logger.info("🔨 Creating/updating database tables for development...")
             await create_db_and_tables()
         
+        database_health_monitor.start()
+        if health["status"] == "healthy":
+            await revocation_list.refresh()
+        revocation_list.start()
         logger.info("✅ Application startup completed successfully!")
         
     except Exception as e:
@@ -78,7 +92,13 @@ async def lifespan(app: FastAPI):
     
     # === SHUTDOWN ===
     logger.info("🛑 Shutting down application...")
+    await database_health_monitor.stop()
+    await revocation_list.stop()
     await close_db_connections()
+    hashing_executor.shutdown()
+    bulk_hashing_executor.shutdown()
+    if settings.METRICS_ENABLED:
+        metrics.mark_worker_dead()
     logger.info("✅ Shutdown completed")
 
 
@@ -86,12 +106,36 @@ async def lifespan(app: FastAPI):
 app = FastAPI(
     docs_url=None,
     title=settings.APP_NAME,
+    default_response_class=FastJSONResponse,
     lifespan=lifespan  # Enable the lifespan handler
 )
 
 # Setup exception handlers
 setup_exception_handlers(app)
 
+# Per-request deadlines; innermost, so the 504 is counted and timed like any response
+if settings.REQUEST_DEADLINE_ENABLED:
+    app.add_middleware(DeadlineMiddleware, default_seconds=settings.REQUEST_DEADLINE_DEFAULT_SECONDS)
+
+# Prometheus metrics
+if settings.METRICS_ENABLED:
+    metrics.install_metrics_observers()
+    app.add_middleware(MetricsMiddleware)
+    app.add_route("/metrics", metrics.metrics_endpoint, include_in_schema=False)
+
+# Per-request SQL statement counts and N+1 warnings
+if settings.QUERY_STATS_ENABLED:
+    install_query_stats_observer()
+    app.add_middleware(
+        QueryStatsMiddleware,
+        max_queries=settings.QUERY_STATS_MAX_QUERIES,
+        max_repeats=settings.QUERY_STATS_MAX_REPEATS,
+    )
+
+# Slow-query log and per-fingerprint latency
+if settings.SLOW_QUERY_LOG_ENABLED:
+    install_slow_query_log()
+
 # Set all CORS enabled origins
 if settings.all_cors_origins:
     app.add_middleware(
@@ -102,6 +146,19 @@ if settings.all_cors_origins:
         allow_headers=["*"],
     )
 
+# Outermost, so a profile covers every other middleware too
+if settings.PROFILER_ENABLED and (settings.ENVIRONMENT != "production" or settings.PROFILER_FORCE):
+    if not settings.PROFILER_SECRET:
+        logger.warning("PROFILER_ENABLED is set without PROFILER_SECRET, so no request will be profiled")
+    app.add_middleware(
+        ProfilerMiddleware,
+        secret=settings.PROFILER_SECRET,
+        output_dir=settings.PROFILER_OUTPUT_DIR,
+        interval=settings.PROFILER_INTERVAL_MS / 1000,
+        max_files=settings.PROFILER_MAX_FILES,
+        max_file_bytes=settings.PROFILER_MAX_FILE_BYTES,
+    )
+
 
 @app.get("/docs", include_in_schema=False)
 async def custom_swagger_ui_html():
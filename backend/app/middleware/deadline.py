@@ -0,0 +1,63 @@
+import asyncio
+import logging
+from typing import Union
+from fastapi import status
+from starlette.requests import Request
+from starlette.types import ASGIApp, Message, Receive, Scope, Send
+
+from app.core.deadlines import RequestDeadline, current_deadline
+from app.middleware.error_handlers import error_response
+
+logger = logging.getLogger(__name__)
+
+
+class DeadlineMiddleware:
+    """
+    Cancels a request once its deadline passes and answers 504 DEADLINE_EXCEEDED.
+
+    Requests start with `default_seconds` (None for no limit); a route's request_deadline
+    dependency replaces it. A response that has already started cannot become a 504, so
+    a stream that overruns is cut off instead.
+    """
+
+    def __init__(self, app: ASGIApp, default_seconds: Union[float, None] = None):
+        self.app = app
+        self.default_seconds = default_seconds
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send) -> None:
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+
+        deadline = RequestDeadline(started=asyncio.get_running_loop().time(), seconds=self.default_seconds)
+        token = current_deadline.set(deadline)
+        response_started = False
+
+        async def send_wrapper(message: Message) -> None:
+            nonlocal response_started
+            if message["type"] == "http.response.start":
+                response_started = True
+            await send(message)
+
+        try:
+            # expires_at is an absolute loop time, so timeout_at rather than timeout
+            async with asyncio.timeout_at(deadline.expires_at) as timeout:
+                deadline.bind(timeout)
+                await self.app(scope, receive, send_wrapper)
+        except TimeoutError:
+            if not timeout.expired():
+                raise
+            route = getattr(scope.get("route"), "path", None) or scope["path"]
+            logger.warning(f"{scope['method']} {route} cancelled after its {deadline.seconds:g} s deadline")
+            if response_started:
+                return
+            response = error_response(
+                Request(scope),
+                status.HTTP_504_GATEWAY_TIMEOUT,
+                "Request did not finish before its deadline",
+                "DEADLINE_EXCEEDED",
+                details={"deadline_seconds": deadline.seconds},
+            )
+            await response(scope, receive, send)
+        finally:
+            current_deadline.reset(token)
@@ -1,17 +1,38 @@
 import logging
-from datetime import datetime
+from datetime import datetime, timezone
+from typing import Any
 from fastapi import FastAPI, Request, status
-from fastapi.responses import JSONResponse
 from fastapi.exceptions import RequestValidationError
 from starlette.exceptions import HTTPException as StarletteHTTPException
 from sqlalchemy.exc import IntegrityError, OperationalError
 from asyncpg.exceptions import InvalidCatalogNameError
 
+from app.core.responses import FastJSONResponse
 from app.exceptions import DatabaseConnectionError, BaseAPIException
 
 logger = logging.getLogger(__name__)
 
 
+def error_response(
+    request: Request, status_code: int, message: str, error_code: str, **extra: Any
+) -> FastJSONResponse:
+    """Build the standard error envelope; `extra` carries details/errors"""
+    return FastJSONResponse(
+        status_code=status_code,
+        content={
+            "success": False,
+            "message": message,
+            "error_code": error_code,
+            "status_code": status_code,
+            **extra,
+            # ISO 8601 with a UTC offset ("...T12:00:00.123456+00:00"); before orjson this was
+            # a naive datetime.utcnow().isoformat() with no offset
+            "timestamp": datetime.now(timezone.utc),
+            "path": request.url.path
+        }
+    )
+
+
 def setup_exception_handlers(app: FastAPI):
     """Setup exception handlers for your FastAPI + SQLModel + Alembic stack"""
     
@@ -19,35 +40,28 @@ def setup_exception_handlers(app: FastAPI):
     async def database_connection_handler(request: Request, exc: DatabaseConnectionError):
         logger.error(f"Database connection error: {exc.message}")
         
-        return JSONResponse(
-            status_code=status.HTTP_503_SERVICE_UNAVAILABLE,
-            content={
-                "success": False,
-                "message": exc.message,
-                "error_code": "DATABASE_CONNECTION_ERROR",
-                "status_code": status.HTTP_503_SERVICE_UNAVAILABLE,
-                "details": exc.details,
-                "timestamp": datetime.utcnow().isoformat(),
-                "path": str(request.url.path)
-            }
+        return error_response(
+            request,
+            status.HTTP_503_SERVICE_UNAVAILABLE,
+            exc.message,
+            "DATABASE_CONNECTION_ERROR",
+            details=exc.details
         )
     
     @app.exception_handler(BaseAPIException)
     async def api_exception_handler(request: Request, exc: BaseAPIException):
         logger.warning(f"API exception: {exc.message}")
         
-        return JSONResponse(
-            status_code=exc.status_code,
-            content={
-                "success": False,
-                "message": exc.message,
-                "error_code": exc.error_code,
-                "status_code": exc.status_code,
-                "details": exc.details,
-                "timestamp": datetime.utcnow().isoformat(),
-                "path": str(request.url.path)
-            }
+        response = error_response(
+            request,
+            exc.status_code,
+            exc.message,
+            exc.error_code,
+            details=exc.details
         )
+        if exc.headers:
+            response.headers.update(exc.headers)
+        return response
     
     @app.exception_handler(RequestValidationError)
     async def validation_exception_handler(request: Request, exc: RequestValidationError):
@@ -60,17 +74,12 @@ def setup_exception_handlers(app: FastAPI):
                 "type": error["type"]
             })
         
-        return JSONResponse(
-            status_code=status.HTTP_422_UNPROCESSABLE_ENTITY,
-            content={
-                "success": False,
-                "message": "Validation failed",
-                "error_code": "VALIDATION_ERROR",
-                "status_code": status.HTTP_422_UNPROCESSABLE_ENTITY,
-                "errors": errors,
-                "timestamp": datetime.utcnow().isoformat(),
-                "path": str(request.url.path)
-            }
+        return error_response(
+            request,
+            status.HTTP_422_UNPROCESSABLE_ENTITY,
+            "Validation failed",
+            "VALIDATION_ERROR",
+            errors=errors
         )
     
     @app.exception_handler(InvalidCatalogNameError)
@@ -80,23 +89,18 @@ def setup_exception_handlers(app: FastAPI):
         
         db_name = str(request.app.extra.get('settings', {}).get('SQLALCHEMY_DATABASE_URI', '')).split('/')[-1]
         
-        return JSONResponse(
-            status_code=status.HTTP_503_SERVICE_UNAVAILABLE,
-            content={
-                "success": False,
-                "message": f"Database '{db_name}' does not exist",
-                "error_code": "DATABASE_NOT_FOUND",
-                "status_code": status.HTTP_503_SERVICE_UNAVAILABLE,
-                "details": {
-                    "database_name": db_name,
-                    "suggestions": [
-                        f"Create database: createdb -h localhost -U postgres {db_name}",
-                        "Run: python scripts/setup_dev_db.py",
-                        "Check your database configuration"
-                    ]
-                },
-                "timestamp": datetime.utcnow().isoformat(),
-                "path": str(request.url.path)
+        return error_response(
+            request,
+            status.HTTP_503_SERVICE_UNAVAILABLE,
+            f"Database '{db_name}' does not exist",
+            "DATABASE_NOT_FOUND",
+            details={
+                "database_name": db_name,
+                "suggestions": [
+                    f"Create database: createdb -h localhost -U postgres {db_name}",
+                    "Run: python scripts/setup_dev_db.py",
+                    "Check your database configuration"
+                ]
             }
         )
     
@@ -110,30 +114,15 @@ def setup_exception_handlers(app: FastAPI):
         elif "foreign key constraint" in str(exc.orig).lower():
             message = "Referenced resource not found"
         
-        return JSONResponse(
-            status_code=status.HTTP_409_CONFLICT,
-            content={
-                "success": False,
-                "message": message,
-                "error_code": "INTEGRITY_ERROR",
-                "status_code": status.HTTP_409_CONFLICT,
-                "timestamp": datetime.utcnow().isoformat(),
-                "path": str(request.url.path)
-            }
-        )
+        return error_response(request, status.HTTP_409_CONFLICT, message, "INTEGRITY_ERROR")
     
     @app.exception_handler(Exception)
     async def general_exception_handler(request: Request, exc: Exception):
         logger.error(f"Unhandled exception: {exc}", exc_info=True)
         
-        return JSONResponse(
-            status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
-            content={
-                "success": False,
-                "message": "An unexpected error occurred",
-                "error_code": "INTERNAL_ERROR",
-                "status_code": status.HTTP_500_INTERNAL_SERVER_ERROR,
-                "timestamp": datetime.utcnow().isoformat(),
-                "path": str(request.url.path)
-            }
-        )
\ No newline at end of file
+        return error_response(
+            request,
+            status.HTTP_500_INTERNAL_SERVER_ERROR,
+            "An unexpected error occurred",
+            "INTERNAL_ERROR"
+        )
@@ -0,0 +1,107 @@
+import asyncio
+import hmac
+import logging
+import re
+import sys
+import threading
+import time
+import uuid
+from pathlib import Path
+from typing import Union
+from starlette.datastructures import MutableHeaders
+from starlette.types import ASGIApp, Message, Receive, Scope, Send
+
+from app.core.profiler import StackSampler
+
+logger = logging.getLogger(__name__)
+
+
+class ProfilerMiddleware:
+    """
+    Profiles single requests on demand.
+
+    A request sending `X-Profile: <secret>` runs under a sampling profiler and its
+    collapsed stacks are written to `output_dir` as
+    `<id>_<METHOD>_<route>_<ms>ms.collapsed`; the response carries the id in
+    `X-Profile-Id`. Without a configured secret nothing is ever profiled. Every other
+    request only pays for the trigger check. One request is profiled at a time; a
+    trigger arriving meanwhile is served unprofiled.
+
+    Samples are taken on the event loop thread by wall clock. Only those taken while the
+    profiled request's own code runs keep their stacks; time spent on concurrent requests
+    and waiting for I/O is counted under two placeholder frames (see app.core.profiler).
+
+    At most `max_files` profiles are kept, oldest deleted first, and each is cut to
+    `max_file_bytes` by leaving out its rarest stacks.
+    """
+
+    def __init__(
+        self,
+        app: ASGIApp,
+        secret: Union[str, None] = None,
+        output_dir: str = "profiles",
+        interval: float = 0.001,
+        max_files: int = 100,
+        max_file_bytes: int = 5 * 1024 * 1024,
+    ):
+        self.app = app
+        self.secret = secret.encode() if secret else None
+        self.output_dir = Path(output_dir)
+        self.interval = interval
+        self.max_files = max_files
+        self.max_file_bytes = max_file_bytes
+        self._active = False
+
+    def _triggered(self, scope: Scope) -> bool:
+        if self.secret is None:
+            return False
+        for name, value in scope["headers"]:
+            if name == b"x-profile":
+                return hmac.compare_digest(value, self.secret)
+        return False
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send) -> None:
+        if scope["type"] != "http" or self._active or not self._triggered(scope):
+            await self.app(scope, receive, send)
+            return
+
+        self._active = True
+        profile_id = f"{time.strftime('%Y%m%dT%H%M%S')}-{uuid.uuid4().hex[:8]}"
+
+        async def send_wrapper(message: Message) -> None:
+            if message["type"] == "http.response.start":
+                MutableHeaders(scope=message).append("X-Profile-Id", profile_id)
+            await send(message)
+
+        # The event loop runs on this thread, so that is the one to sample; this frame is
+        # on the stack exactly while this request's code runs
+        sampler = StackSampler(threading.get_ident(), self.interval, anchor=sys._getframe())
+        started = time.perf_counter()
+        sampler.start()
+        try:
+            await self.app(scope, receive, send_wrapper)
+        finally:
+            sampler.stop()
+            self._active = False
+            seconds = time.perf_counter() - started
+            await asyncio.to_thread(self._write, scope, profile_id, seconds, sampler.collapsed(self.max_file_bytes))
+
+    def _write(self, scope: Scope, profile_id: str, seconds: float, collapsed: str) -> None:
+        """Runs on a worker thread, off the event loop"""
+        route = getattr(scope.get("route"), "path", None) or scope["path"]
+        route_slug = re.sub(r"[^A-Za-z0-9]+", "-", route).strip("-") or "root"
+        path = self.output_dir / f"{profile_id}_{scope['method']}_{route_slug}_{seconds * 1000:.0f}ms.collapsed"
+        try:
+            self.output_dir.mkdir(parents=True, exist_ok=True)
+            path.write_text(collapsed)
+            self._prune()
+        except OSError as e:
+            logger.error(f"Could not write profile {path}: {e}")
+            return
+        logger.info(f"Profiled {scope['method']} {route} in {seconds * 1000:.1f} ms -> {path}")
+
+    def _prune(self) -> None:
+        # Profile ids start with a timestamp, so name order is age order
+        profiles = sorted(self.output_dir.glob("*.collapsed"))
+        for old in profiles[:max(len(profiles) - self.max_files, 0)]:
+            old.unlink(missing_ok=True)
@@ -0,0 +1,55 @@
+import logging
+from starlette.datastructures import MutableHeaders
+from starlette.types import ASGIApp, Message, Receive, Scope, Send
+
+from app.core.querystats import RequestQueryStats, current_query_stats
+
+logger = logging.getLogger(__name__)
+
+
+class QueryStatsMiddleware:
+    """
+    Counts the SQL statements each request issues and reports them.
+
+    Every response carries a `Server-Timing: db;dur=<ms>;desc="<n> queries"` header with
+    the statements run before the response started. Once the request finishes, it is
+    logged if it ran more than `max_queries` statements or repeated one statement more
+    than `max_repeats` times, the usual sign of an N+1 loop.
+    """
+
+    def __init__(self, app: ASGIApp, max_queries: int = 20, max_repeats: int = 5):
+        self.app = app
+        self.max_queries = max_queries
+        self.max_repeats = max_repeats
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send) -> None:
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+
+        stats = RequestQueryStats()
+        token = current_query_stats.set(stats)
+
+        async def send_wrapper(message: Message) -> None:
+            if message["type"] == "http.response.start":
+                headers = MutableHeaders(scope=message)
+                headers.append(
+                    "Server-Timing", f'db;dur={stats.milliseconds:.2f};desc="{stats.count} queries"'
+                )
+            await send(message)
+
+        try:
+            await self.app(scope, receive, send_wrapper)
+        finally:
+            current_query_stats.reset(token)
+            self._report(scope, stats)
+
+    def _report(self, scope: Scope, stats: RequestQueryStats) -> None:
+        template, repeats = stats.most_repeated()
+        if stats.count <= self.max_queries and repeats <= self.max_repeats:
+            return
+        route = getattr(scope.get("route"), "path", None) or scope["path"]
+        message = f"{scope['method']} {route} ran {stats.count} queries in {stats.milliseconds:.1f} ms"
+        if repeats > self.max_repeats:
+            message += f"; repeated {repeats}x: {template[:200]}"
+        logger.warning(message)
@@ -1,6 +1,7 @@
 from sqlmodel import SQLModel
-from .user import User, UserBase, UserPublic, UsersPublic
-from .token import Token, TokenPayload
+from .user import User, UserBase, UserCreate, UserPublic, UsersPublic, UserImportRow, UserImportReport
+from .token import Token, TokenPayload, RevokedToken, RefreshToken, RefreshTokenRequest
+from .principal import Principal
 
-__all__ = ["SQLModel", "User", "UserBase", "UserPublic", "UsersPublic", "Token", "TokenPayload"]
+__all__ = ["SQLModel", "User", "UserBase", "UserCreate", "UserPublic", "UsersPublic", "UserImportRow", "UserImportReport", "Token", "TokenPayload", "RevokedToken", "RefreshToken", "RefreshTokenRequest", "Principal"]
 
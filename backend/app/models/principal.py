@@ -0,0 +1,14 @@
+import uuid
+from dataclasses import dataclass
+from typing import Union
+
+
+# Authenticated caller, detached from any database session
+@dataclass(frozen=True, slots=True)
+class Principal:
+    id: uuid.UUID
+    email: str
+    full_name: Union[str, None]
+    is_active: bool
+    is_superuser: bool
+    version: int = 0
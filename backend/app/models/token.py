@@ -1,15 +1,70 @@
+from sqlalchemy import DateTime, func
 from sqlmodel import Field, SQLModel
+import uuid
+from datetime import datetime, timezone
 from typing import Union
 
 # JSON payload containing access token
 class Token(SQLModel):
     access_token: str
     token_type: str = "bearer"
+    # Seconds until access_token expires; trade refresh_token for a new pair at /auth/refresh
+    expires_in: Union[int, None] = None
+    refresh_token: Union[str, None] = None
+
+class RefreshTokenRequest(SQLModel):
+    refresh_token: str
 
 # Contents of JWT token
 class TokenPayload(SQLModel):
     sub: Union[str, None] = None
+    # Token id for revocation; tokens issued before revocation existed have none
+    jti: Union[str, None] = None
+    exp: Union[int, None] = None
+    # Account claims, trusted for the token's short lifetime instead of reading the user row
+    email: Union[str, None] = None
+    name: Union[str, None] = None
+    active: Union[bool, None] = None
+    su: Union[bool, None] = None
 
 class NewPassword(SQLModel):
     token: str
-    new_password: str = Field(min_length=8, max_length=40)
\ No newline at end of file
+    new_password: str = Field(min_length=8, max_length=40)
+
+# Revoked access tokens, kept until the token would have expired anyway
+class RevokedToken(SQLModel, table=True):
+    __tablename__ = "revoked_tokens"
+
+    jti: str = Field(primary_key=True, max_length=64)
+    # No foreign key: revoking a deleted user's tokens must outlive the user row
+    user_id: uuid.UUID = Field(index=True)
+    expires_at: datetime = Field(sa_type=DateTime(timezone=True), index=True)
+    # Set by the database so every instance reads one clock when refreshing incrementally
+    revoked_at: Union[datetime, None] = Field(
+        default=None,
+        sa_type=DateTime(timezone=True),
+        sa_column_kwargs={"server_default": func.now(), "nullable": False},
+        index=True,
+    )
+
+
+# Opaque refresh tokens, stored as SHA-256 digests. Each rotation marks the old token used
+# and issues a new one in the same family; presenting a used token revokes the family.
+class RefreshToken(SQLModel, table=True):
+    __tablename__ = "refresh_tokens"
+
+    id: uuid.UUID = Field(default_factory=uuid.uuid4, primary_key=True)
+    user_id: uuid.UUID = Field(foreign_key="user.id", ondelete="CASCADE", index=True)
+    family_id: uuid.UUID = Field(index=True)
+    token_hash: str = Field(max_length=64, unique=True, index=True)
+    expires_at: datetime = Field(sa_type=DateTime(timezone=True))
+    created_at: datetime = Field(
+        default_factory=lambda: datetime.now(timezone.utc),
+        sa_type=DateTime(timezone=True),
+        sa_column_kwargs={"server_default": func.now()},
+    )
+    used_at: Union[datetime, None] = Field(default=None, sa_type=DateTime(timezone=True))
+    revoked_at: Union[datetime, None] = Field(default=None, sa_type=DateTime(timezone=True))
+    # The access token issued alongside, so it can be revoked when the user's claims change
+    access_token_jti: Union[str, None] = Field(default=None, max_length=64)
+    access_token_expires_at: Union[datetime, None] = Field(default=None, sa_type=DateTime(timezone=True))
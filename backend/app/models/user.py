@@ -1,7 +1,9 @@
 from pydantic import EmailStr
+from sqlalchemy import DateTime, Index, func
 from sqlmodel import Field, Relationship, SQLModel
 import uuid
-from typing import Union
+from datetime import datetime, timezone
+from typing import Literal, Union
 
 # Shared properties
 class UserBase(SQLModel):
@@ -34,15 +36,48 @@ class UpdatePassword(SQLModel):
 
 # Database model, database table inferred from class name
 class User(UserBase, table=True):
+    # Keyset pagination walks users in (created_at, id) order
+    __table_args__ = (Index("ix_user_created_at_id", "created_at", "id"),)
+
     id: uuid.UUID = Field(default_factory=uuid.uuid4, primary_key=True)
     hashed_password: str
+    created_at: datetime = Field(
+        default_factory=lambda: datetime.now(timezone.utc),
+        sa_type=DateTime(timezone=True),
+        sa_column_kwargs={"server_default": func.now()},
+    )
 
 # Properties to return via API, id is always required
 class UserPublic(UserBase):
     id: uuid.UUID
 
+    @classmethod
+    def from_row(cls, user: "User") -> "UserPublic":
+        """
+        Build from a loaded row without validation; the row was validated when written
+        and re-checking every EmailStr dominates the cost of listing users.
+        """
+        return cls.model_construct(**{name: getattr(user, name) for name in cls.model_fields})
+
 class UsersPublic(SQLModel):
     data: list[UserPublic]
-    count: int
+    # None when the caller asked to skip counting
+    count: Union[int, None] = None
+    # Opaque cursor for the next page, pass it back as `after`
+    next_cursor: Union[str, None] = None
+
+# Outcome of one rejected row in a bulk import
+class UserImportRow(SQLModel):
+    row: int
+    email: Union[str, None] = None
+    status: Literal["conflict", "duplicate", "invalid"]
+    errors: list[str] = []
 
+# Summary of a bulk import; only rows that were not created are listed
+class UserImportReport(SQLModel):
+    created: int = 0
+    conflicts: int = 0
+    duplicates: int = 0
+    invalid: int = 0
+    rows: list[UserImportRow] = []
 
@@ -1,13 +1,99 @@
+import asyncio
+import contextvars
+import logging
+import uuid
+from sqlalchemy import event, update
+from sqlalchemy.orm import Session
 from sqlmodel.ext.asyncio.session import AsyncSession
 from app.models import User
 from typing import Union
 from .userservice import get_user_by_email
-from app.core.security import verify_password
+from app.core.cache import TTLCache
+from app.core.config import settings
+from app.core.database import async_session
+from app.core.security import get_password_hash, verify_dummy_password, verify_password_needs_update
+
+logger = logging.getLogger(__name__)
+
+# Strong references so pending rehashes are not garbage collected mid-flight
+_rehash_tasks: set[asyncio.Task] = set()
+
+# Emails that recently matched no user, so repeated probes skip the lookup. Inserts through
+# the ORM clear their entry here, at flush and again after commit; other workers only see a
+# new user once the TTL runs out.
+unknown_email_cache: TTLCache[str, bool] = TTLCache(
+    maxsize=settings.UNKNOWN_EMAIL_CACHE_SIZE,
+    ttl=settings.UNKNOWN_EMAIL_CACHE_TTL_SECONDS,
+)
+
+def forget_unknown_emails(*emails: str, session: Union[Session, None] = None) -> None:
+    """
+    Drop cached misses for `emails`. With the `session` that is creating them, they are
+    dropped again once it commits, since a login between the flush and the commit cannot
+    see the new rows yet and would cache the miss again.
+    """
+    for email in emails:
+        unknown_email_cache.pop(email)
+    if session is not None:
+        session.info.setdefault("known_emails", set()).update(emails)
 
 async def authenticate(*, session: AsyncSession, email: str, password: str) -> Union[User, None]:
+    """
+    Return the user for valid credentials, else None.
+
+    Unknown emails still pay for a full verify against a dummy hash, so a miss costs about
+    as much as a wrong password and response time does not reveal which emails exist.
+    """
+    if unknown_email_cache.get(email):
+        await verify_dummy_password(password)
+        return None
     db_user = await get_user_by_email(session=session, email=email)
     if not db_user:
+        unknown_email_cache.set(email, True)
+        await verify_dummy_password(password)
         return None
-    if not verify_password(password, db_user.hashed_password):
+    verified, needs_update = await verify_password_needs_update(password, db_user.hashed_password)
+    if not verified:
         return None
-    return db_user
\ No newline at end of file
+    if needs_update:
+        schedule_rehash(user_id=db_user.id, old_hash=db_user.hashed_password, password=password)
+    return db_user
+
+def schedule_rehash(*, user_id: uuid.UUID, old_hash: str, password: str) -> None:
+    """Upgrade a stored hash to the current scheme and cost after the response has gone out"""
+    # A fresh context: the rehash outlives the request and must not inherit its deadline
+    task = asyncio.create_task(
+        _rehash(user_id=user_id, old_hash=old_hash, password=password), context=contextvars.Context()
+    )
+    _rehash_tasks.add(task)
+    task.add_done_callback(_rehash_tasks.discard)
+
+async def _rehash(*, user_id: uuid.UUID, old_hash: str, password: str) -> None:
+    try:
+        new_hash = await get_password_hash(password)
+        async with async_session() as session:
+            # Only replace the hash that was verified, never a password changed meanwhile
+            await session.execute(
+                update(User)
+                .where(User.id == user_id, User.hashed_password == old_hash)
+                .values(hashed_password=new_hash)
+            )
+            await session.commit()
+    except Exception as e:
+        logger.warning(f"Password rehash for user {user_id} failed: {e}")
+
+
+@event.listens_for(User, "after_insert")
+@event.listens_for(User, "after_update")
+def _forget_unknown_email(mapper, connection, target: User) -> None:
+    forget_unknown_emails(target.email, session=Session.object_session(target))
+
+
+@event.listens_for(Session, "after_commit")
+def _forget_unknown_emails_on_commit(session: Session) -> None:
+    forget_unknown_emails(*session.info.pop("known_emails", ()))
+
+
+@event.listens_for(Session, "after_soft_rollback")
+def _keep_unknown_emails_on_rollback(session: Session, previous_transaction) -> None:
+    session.info.pop("known_emails", None)
@@ -0,0 +1,150 @@
+import csv
+import io
+import uuid
+from collections.abc import Iterable, Iterator
+from typing import Any, Literal, Union
+import orjson
+from pydantic import ValidationError as PydanticValidationError
+from sqlmodel.ext.asyncio.session import AsyncSession
+from app.core.security import hash_passwords_bulk
+from app.models import UserCreate, UserImportRow, UserImportReport
+from app.services.authservice import forget_unknown_emails
+
+ImportFormat = Literal["csv", "ndjson"]
+
+STAGING_TABLE = "user_import_staging"
+STAGING_COLUMNS = ("row_no", "id", "email", "full_name", "hashed_password", "is_active", "is_superuser")
+
+
+def detect_format(filename: Union[str, None]) -> ImportFormat:
+    if filename and filename.lower().endswith((".ndjson", ".jsonl")):
+        return "ndjson"
+    return "csv"
+
+
+def parse_rows(text: str, import_format: ImportFormat) -> Iterator[tuple[int, Union[dict[str, Any], str]]]:
+    """
+    Yield (row number, fields) per input row; a string in place of fields is a parse error
+    """
+    if import_format == "ndjson":
+        for row_no, line in enumerate(text.splitlines(), start=1):
+            if not line.strip():
+                continue
+            try:
+                fields = orjson.loads(line)
+            except orjson.JSONDecodeError as e:
+                yield row_no, f"Invalid JSON: {e}"
+                continue
+            yield row_no, fields if isinstance(fields, dict) else "Expected a JSON object"
+        return
+
+    # Row 1 is the header, so data rows start at 2 to match what a spreadsheet shows
+    for row_no, fields in enumerate(csv.DictReader(io.StringIO(text)), start=2):
+        # Empty CSV cells mean "not given" so model defaults apply
+        yield row_no, {key: value for key, value in fields.items() if value not in ("", None)}
+
+
+def _validation_messages(error: PydanticValidationError) -> list[str]:
+    return [
+        f"{'.'.join(str(loc) for loc in item['loc']) or 'row'}: {item['msg']}"
+        for item in error.errors()
+    ]
+
+
+async def import_users(
+    *, session: AsyncSession, rows: Iterable[tuple[int, Union[dict[str, Any], str]]]
+) -> UserImportReport:
+    """
+    Validate, hash and load users in bulk.
+
+    Valid rows are hashed in parallel, copied into a temporary staging table with
+    COPY, and merged into "user" with ON CONFLICT (email) DO NOTHING. The caller
+    commits. The report lists every row that was not created and why. Rows asking for
+    is_superuser are rejected.
+    """
+    report = UserImportReport()
+    accepted: list[tuple[int, UserCreate]] = []
+    seen_emails: dict[str, int] = {}
+
+    for row_no, fields in rows:
+        if isinstance(fields, str):
+            report.rows.append(UserImportRow(row=row_no, status="invalid", errors=[fields]))
+            continue
+        try:
+            user_in = UserCreate.model_validate(fields)
+        except PydanticValidationError as e:
+            report.rows.append(UserImportRow(
+                row=row_no, email=fields.get("email"), status="invalid", errors=_validation_messages(e)
+            ))
+            continue
+        if user_in.is_superuser:
+            # Superusers are granted one at a time, never in bulk from a file
+            report.rows.append(UserImportRow(
+                row=row_no, email=user_in.email, status="invalid", errors=["is_superuser cannot be imported"]
+            ))
+            continue
+        if user_in.email in seen_emails:
+            report.rows.append(UserImportRow(
+                row=row_no,
+                email=user_in.email,
+                status="duplicate",
+                errors=[f"Same email as row {seen_emails[user_in.email]}"],
+            ))
+            continue
+        seen_emails[user_in.email] = row_no
+        accepted.append((row_no, user_in))
+
+    if accepted:
+        hashed_passwords = await hash_passwords_bulk([user_in.password for _, user_in in accepted])
+        records = [
+            (row_no, uuid.uuid4(), user_in.email, user_in.full_name, hashed_password,
+             user_in.is_active, user_in.is_superuser)
+            for (row_no, user_in), hashed_password in zip(accepted, hashed_passwords)
+        ]
+        created_emails = await _copy_and_merge(session, records)
+        # COPY bypasses ORM events, so clear the login negative cache by hand
+        forget_unknown_emails(*created_emails, session=session.sync_session)
+
+        for row_no, user_in in accepted:
+            if user_in.email not in created_emails:
+                report.rows.append(UserImportRow(
+                    row=row_no, email=user_in.email, status="conflict", errors=["Email already registered"]
+                ))
+        report.created = len(created_emails)
+
+    report.rows.sort(key=lambda result: result.row)
+    report.conflicts = sum(1 for result in report.rows if result.status == "conflict")
+    report.duplicates = sum(1 for result in report.rows if result.status == "duplicate")
+    report.invalid = sum(1 for result in report.rows if result.status == "invalid")
+    return report
+
+
+async def _copy_and_merge(session: AsyncSession, records: list[tuple]) -> set[str]:
+    conn = await session.connection()
+    # Going through SQLAlchemy first opens the transaction the temp table lives in
+    await conn.exec_driver_sql(f"""
+        CREATE TEMP TABLE {STAGING_TABLE} (
+            row_no integer NOT NULL,
+            id uuid NOT NULL,
+            email varchar(255) NOT NULL,
+            full_name varchar(255),
+            hashed_password varchar NOT NULL,
+            is_active boolean NOT NULL,
+            is_superuser boolean NOT NULL
+        ) ON COMMIT DROP
+    """)
+
+    raw_connection = await conn.get_raw_connection()
+    await raw_connection.driver_connection.copy_records_to_table(
+        STAGING_TABLE, records=records, columns=STAGING_COLUMNS
+    )
+
+    result = await conn.exec_driver_sql(f"""
+        INSERT INTO "user" (id, email, full_name, hashed_password, is_active, is_superuser)
+        SELECT id, email, full_name, hashed_password, is_active, is_superuser
+        FROM {STAGING_TABLE}
+        ORDER BY row_no
+        ON CONFLICT (email) DO NOTHING
+        RETURNING email
+    """)
+    return {row[0] for row in result}
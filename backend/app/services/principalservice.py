@@ -0,0 +1,88 @@
+import uuid
+from typing import Union
+from sqlalchemy import event
+from sqlalchemy.orm import Session
+from sqlmodel import select
+from sqlmodel.ext.asyncio.session import AsyncSession
+from app.core.cache import TTLCache
+from app.core.config import settings
+from app.models import User, Principal, TokenPayload
+
+# Principals keyed by user id. Staleness is bounded by the TTL, since an update made
+# by another worker process only reaches this cache once the entry expires.
+principal_cache: TTLCache[uuid.UUID, Principal] = TTLCache(
+    maxsize=settings.PRINCIPAL_CACHE_SIZE,
+    ttl=settings.PRINCIPAL_CACHE_TTL_SECONDS,
+)
+
+# Bumped on every invalidation so a lookup that raced with an update never caches the old row
+_versions: TTLCache[uuid.UUID, int] = TTLCache(
+    maxsize=settings.PRINCIPAL_CACHE_SIZE,
+    ttl=settings.PRINCIPAL_CACHE_TTL_SECONDS,
+)
+
+
+def _current_version(user_id: uuid.UUID) -> int:
+    return _versions.get(user_id) or 0
+
+
+def invalidate_principal(user_id: uuid.UUID) -> None:
+    _versions.set(user_id, _current_version(user_id) + 1)
+    principal_cache.pop(user_id)
+
+
+def principal_from_claims(token_data: TokenPayload) -> Union[Principal, None]:
+    """Principal carried by an access token, or None for tokens without account claims"""
+    if token_data.email is None or token_data.active is None or token_data.su is None:
+        return None
+    return Principal(
+        id=uuid.UUID(token_data.sub),
+        email=token_data.email,
+        full_name=token_data.name,
+        is_active=token_data.active,
+        is_superuser=token_data.su,
+    )
+
+
+# Only what a Principal holds: no hashed_password over the wire, no ORM instance in the
+# session's identity map
+_principal_columns = select(User.id, User.email, User.full_name, User.is_active, User.is_superuser)
+
+
+async def get_principal(*, session: AsyncSession, user_id: uuid.UUID) -> Union[Principal, None]:
+    principal = principal_cache.get(user_id)
+    if principal is not None:
+        return principal
+
+    version = _current_version(user_id)
+    row = (await session.execute(_principal_columns.where(User.id == user_id))).first()
+    if not row:
+        return None
+
+    principal = Principal(*row, version=version)
+    if _current_version(user_id) == version:
+        principal_cache.set(user_id, principal)
+    return principal
+
+
+# Invalidate on flush so concurrent lookups stop trusting the cache immediately,
+# and again after commit so nothing read in between survives.
+
+@event.listens_for(User, "after_update")
+@event.listens_for(User, "after_delete")
+def _invalidate_on_flush(mapper, connection, target: User) -> None:
+    invalidate_principal(target.id)
+    session = Session.object_session(target)
+    if session is not None:
+        session.info.setdefault("invalidated_principals", set()).add(target.id)
+
+
+@event.listens_for(Session, "after_commit")
+def _invalidate_on_commit(session: Session) -> None:
+    for user_id in session.info.pop("invalidated_principals", ()):
+        invalidate_principal(user_id)
+
+
+@event.listens_for(Session, "after_soft_rollback")
+def _forget_on_rollback(session: Session, previous_transaction) -> None:
+    session.info.pop("invalidated_principals", None)
@@ -0,0 +1,183 @@
+import asyncio
+import logging
+import time
+import uuid
+from datetime import datetime, timedelta, timezone
+from typing import Any, Callable, Dict, Union
+from sqlalchemy import delete, event, exists, func, inspect, literal
+from sqlalchemy.dialects.postgresql import insert
+from sqlalchemy.engine import Connection
+from sqlalchemy.orm import Session
+from sqlmodel import select
+from sqlmodel.ext.asyncio.session import AsyncSession
+from app.core.config import settings
+from app.core.database import async_session
+from app.models import RefreshToken, RevokedToken, User
+
+logger = logging.getLogger(__name__)
+
+# revoked_at comes from now(), the start of the revoking transaction, so a revocation can
+# commit after a refresh has already read past its timestamp. Re-reading this far behind
+# the watermark picks those up; the overlap is deduplicated by the set.
+REFRESH_OVERLAP = timedelta(seconds=30)
+
+
+class TokenRevocationList:
+    """
+    In-memory mirror of the unexpired rows in revoked_tokens, for a query-free check per request.
+
+    A background task pulls rows revoked since the last refresh every `interval` seconds,
+    so a revocation made on any instance takes effect everywhere within about one interval;
+    on the instance that revoked it, it takes effect at once. Entries drop out when the
+    token they revoke expires, which bounds the set by logouts per token lifetime.
+    """
+
+    def __init__(
+        self,
+        interval: float,
+        session_factory: Callable[[], AsyncSession] = async_session,
+        purge_interval: float = 3600.0,
+    ):
+        self.interval = interval
+        self.purge_interval = purge_interval
+        self._session_factory = session_factory
+        # jti -> expiry as a unix timestamp
+        self._revoked: Dict[str, float] = {}
+        self._watermark: Union[datetime, None] = None
+        self._refreshed_monotonic: Union[float, None] = None
+        self._purged_monotonic = time.monotonic()
+        self._task: Union[asyncio.Task, None] = None
+
+    def is_revoked(self, jti: str) -> bool:
+        return jti in self._revoked
+
+    def add(self, jti: str, expires_at: datetime) -> None:
+        self._revoked[jti] = expires_at.timestamp()
+
+    async def refresh(self) -> int:
+        """Load revocations newer than the last refresh and drop expired ones; returns rows read"""
+        statement = select(RevokedToken.jti, RevokedToken.expires_at, RevokedToken.revoked_at).where(
+            RevokedToken.expires_at > func.now()
+        )
+        if self._watermark is not None:
+            statement = statement.where(RevokedToken.revoked_at > self._watermark - REFRESH_OVERLAP)
+        async with self._session_factory() as session:
+            rows = (await session.execute(statement)).all()
+
+        for jti, expires_at, revoked_at in rows:
+            self._revoked[jti] = expires_at.timestamp()
+            if self._watermark is None or revoked_at > self._watermark:
+                self._watermark = revoked_at
+
+        now = time.time()
+        for jti in [jti for jti, expires_at in self._revoked.items() if expires_at <= now]:
+            del self._revoked[jti]
+        self._refreshed_monotonic = time.monotonic()
+        return len(rows)
+
+    async def purge_expired(self) -> int:
+        """Delete rows for tokens that have expired on their own"""
+        async with self._session_factory() as session:
+            result = await session.execute(delete(RevokedToken).where(RevokedToken.expires_at <= func.now()))
+            await session.commit()
+        self._purged_monotonic = time.monotonic()
+        return result.rowcount
+
+    async def _run(self) -> None:
+        while True:
+            await asyncio.sleep(self.interval)
+            try:
+                await self.refresh()
+                if time.monotonic() - self._purged_monotonic >= self.purge_interval:
+                    await self.purge_expired()
+            except Exception as e:
+                logger.error(f"Token revocation refresh failed: {e}")
+
+    def start(self) -> None:
+        if self._task is None or self._task.done():
+            self._task = asyncio.create_task(self._run(), name="token-revocation-refresh")
+
+    async def stop(self) -> None:
+        if self._task is not None:
+            self._task.cancel()
+            try:
+                await self._task
+            except asyncio.CancelledError:
+                pass
+            self._task = None
+
+    def stats(self) -> Dict[str, Any]:
+        age = None if self._refreshed_monotonic is None else time.monotonic() - self._refreshed_monotonic
+        return {
+            "revoked": len(self._revoked),
+            "refresh_interval_seconds": self.interval,
+            "age_seconds": None if age is None else round(age, 3),
+            "watermark": self._watermark.isoformat() if self._watermark else None,
+        }
+
+
+revocation_list = TokenRevocationList(interval=settings.TOKEN_REVOCATION_REFRESH_SECONDS)
+
+
+async def revoke_token(*, session: AsyncSession, jti: str, user_id: uuid.UUID, expires_at: datetime) -> None:
+    """
+    Record a revoked token; the caller commits. Revoking twice is a no-op.
+
+    The in-memory list only takes it once the commit succeeds, so a rolled back
+    request does not leave the token rejected on this instance alone.
+    """
+    statement = insert(RevokedToken).values(jti=jti, user_id=user_id, expires_at=expires_at)
+    await session.execute(statement.on_conflict_do_nothing(index_elements=[RevokedToken.jti]))
+    session.info.setdefault("revoked_access_tokens", {})[jti] = expires_at
+
+
+# Access tokens carry is_active and is_superuser as claims and are trusted until they expire,
+# so changing either, or deleting the user, revokes every access token still outstanding.
+# The rows are written in the same flush; the in-memory list follows on commit, as it does
+# for revoke_token.
+
+def _revoke_access_tokens(connection: Connection, user: User) -> None:
+    now = datetime.now(timezone.utc)
+    outstanding = select(
+        RefreshToken.access_token_jti, literal(user.id), RefreshToken.access_token_expires_at
+    ).where(
+        RefreshToken.user_id == user.id,
+        RefreshToken.access_token_jti.is_not(None),
+        RefreshToken.access_token_expires_at > now,
+    )
+    tokens = {jti: expires_at for jti, _, expires_at in connection.execute(outstanding)}
+    if not tokens:
+        return
+    connection.execute(
+        RevokedToken.__table__.insert().from_select(
+            ["jti", "user_id", "expires_at"],
+            outstanding.where(~exists().where(RevokedToken.jti == RefreshToken.access_token_jti)),
+        )
+    )
+    session = Session.object_session(user)
+    if session is not None:
+        session.info.setdefault("revoked_access_tokens", {}).update(tokens)
+
+
+@event.listens_for(User, "after_update")
+def _revoke_on_claims_change(mapper, connection: Connection, target: User) -> None:
+    state = inspect(target)
+    if state.attrs.is_active.history.has_changes() or state.attrs.is_superuser.history.has_changes():
+        _revoke_access_tokens(connection, target)
+
+
+# Before the delete, while the user's refresh_tokens rows still exist
+@event.listens_for(User, "before_delete")
+def _revoke_on_delete(mapper, connection: Connection, target: User) -> None:
+    _revoke_access_tokens(connection, target)
+
+
+@event.listens_for(Session, "after_commit")
+def _add_revocations_on_commit(session: Session) -> None:
+    for jti, expires_at in session.info.pop("revoked_access_tokens", {}).items():
+        revocation_list.add(jti, expires_at)
+
+
+@event.listens_for(Session, "after_soft_rollback")
+def _forget_revocations_on_rollback(session: Session, previous_transaction) -> None:
+    session.info.pop("revoked_access_tokens", None)
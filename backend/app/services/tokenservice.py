@@ -0,0 +1,137 @@
+import hashlib
+import logging
+import secrets
+import time
+import uuid
+from datetime import datetime, timedelta, timezone
+from typing import Any, Dict, Union
+import jwt
+from sqlalchemy import func, update
+from sqlmodel import select
+from sqlmodel.ext.asyncio.session import AsyncSession
+from app.core.cache import TTLCache
+from app.core.config import settings
+from app.core.security import create_access_token
+from app.models import RefreshToken, Token, TokenPayload, User
+
+logger = logging.getLogger(__name__)
+
+# Validated payloads keyed by a digest of the token, so raw tokens are never held in memory.
+# Each entry's TTL runs out at the token's own exp, which is when jwt.decode would start failing.
+token_payload_cache: TTLCache[bytes, TokenPayload] = TTLCache(
+    maxsize=settings.TOKEN_CACHE_SIZE,
+    ttl=settings.ACCESS_TOKEN_EXPIRE_MINUTES * 60,
+)
+
+def _decode_access_token(token: str) -> TokenPayload:
+    payload = jwt.decode(token, settings.SECRET_KEY, algorithms=[settings.ALGORITHM])
+    token_data = TokenPayload(**payload)
+    uuid.UUID(token_data.sub)
+    return token_data
+
+def decode_access_token(token: str) -> TokenPayload:
+    """
+    Verify an access token and return its payload, from the cache when it was seen before.
+
+    Raises the jwt, pydantic or ValueError/TypeError errors of a token that does not verify.
+    """
+    if settings.TOKEN_CACHE_SIZE <= 0:
+        return _decode_access_token(token)
+
+    key = hashlib.sha256(token.encode()).digest()
+    token_data = token_payload_cache.get(key)
+    if token_data is None:
+        token_data = _decode_access_token(token)
+        if token_data.exp is not None:
+            ttl = token_data.exp - time.time()
+            if ttl > 0:
+                token_payload_cache.set(key, token_data, ttl=ttl)
+    return token_data
+
+def hash_refresh_token(refresh_token: str) -> str:
+    # The token is 256 random bits, so a fast digest is enough; no salt or bcrypt needed
+    return hashlib.sha256(refresh_token.encode()).hexdigest()
+
+def access_token_claims(user: User) -> Dict[str, Any]:
+    return {
+        "email": user.email,
+        "name": user.full_name,
+        "active": user.is_active,
+        "su": user.is_superuser,
+    }
+
+def issue_tokens(*, session: AsyncSession, user: User, family_id: Union[uuid.UUID, None] = None) -> Token:
+    """
+    Create an access token and a refresh token for `user`; the caller commits.
+
+    Pass the family of the refresh token being rotated, or none to start a new login.
+    """
+    access_token_expires = timedelta(minutes=settings.ACCESS_TOKEN_EXPIRE_MINUTES)
+    access_token_jti = uuid.uuid4().hex
+    access_token = create_access_token(
+        user.id, expires_delta=access_token_expires, claims=access_token_claims(user), jti=access_token_jti
+    )
+    refresh_token = secrets.token_urlsafe(32)
+    now = datetime.now(timezone.utc)
+    session.add(RefreshToken(
+        user_id=user.id,
+        family_id=family_id or uuid.uuid4(),
+        token_hash=hash_refresh_token(refresh_token),
+        expires_at=now + timedelta(days=settings.REFRESH_TOKEN_EXPIRE_DAYS),
+        # Taken after signing, so never earlier than the token's own exp
+        access_token_jti=access_token_jti,
+        access_token_expires_at=now + access_token_expires,
+    ))
+    return Token(
+        access_token=access_token,
+        expires_in=int(access_token_expires.total_seconds()),
+        refresh_token=refresh_token,
+    )
+
+async def revoke_refresh_token_family(*, session: AsyncSession, family_id: uuid.UUID) -> None:
+    await session.execute(
+        update(RefreshToken)
+        .where(RefreshToken.family_id == family_id, RefreshToken.revoked_at.is_(None))
+        .values(revoked_at=datetime.now(timezone.utc))
+    )
+
+async def use_refresh_token(*, session: AsyncSession, refresh_token: str) -> Union[RefreshToken, None]:
+    """
+    Mark a refresh token used and return it, or None if it cannot be used.
+
+    A token that was already used means it leaked or a client replayed it, so its whole
+    family is revoked. That revocation is committed here, because the caller's transaction
+    is rolled back when it rejects the request.
+    """
+    # Expiry is judged by the database clock, like revoked_tokens
+    statement = (
+        select(RefreshToken, (RefreshToken.expires_at <= func.now()).label("expired"))
+        .where(RefreshToken.token_hash == hash_refresh_token(refresh_token))
+        .with_for_update()
+    )
+    row = (await session.execute(statement)).first()
+    if row is None:
+        return None
+    stored, expired = row
+    if stored.revoked_at is not None:
+        return None
+    if stored.used_at is not None:
+        logger.warning(f"Refresh token reuse detected for user {stored.user_id}, revoking family {stored.family_id}")
+        await revoke_refresh_token_family(session=session, family_id=stored.family_id)
+        await session.commit()
+        return None
+    if expired:
+        return None
+    stored.used_at = datetime.now(timezone.utc)
+    session.add(stored)
+    return stored
+
+async def revoke_refresh_token(*, session: AsyncSession, refresh_token: str, user_id: uuid.UUID) -> None:
+    """Revoke the family of a refresh token that belongs to `user_id`; unknown tokens are ignored"""
+    statement = select(RefreshToken.family_id).where(
+        RefreshToken.token_hash == hash_refresh_token(refresh_token),
+        RefreshToken.user_id == user_id,
+    )
+    family_id = (await session.scalars(statement)).first()
+    if family_id is not None:
+        await revoke_refresh_token_family(session=session, family_id=family_id)
@@ -1,9 +1,106 @@
+import base64
+import csv
+import io
+import json
+import uuid
+from collections.abc import AsyncIterator
+from datetime import datetime
+import orjson
 from sqlmodel.ext.asyncio.session import AsyncSession
-from sqlmodel import select
-from typing import Union
+from sqlmodel import select, func, tuple_
+from sqlalchemy import text
+from sqlalchemy.ext.asyncio import async_sessionmaker
+from typing import Literal, Union
 from app.models import User
+from app.exceptions import ValidationError
+
+CountMode = Literal["exact", "estimated", "none"]
+ExportFormat = Literal["ndjson", "csv"]
+
+EXPORT_COLUMNS = ("id", "email", "full_name", "is_active", "is_superuser", "created_at")
 
 async def get_user_by_email(*, session: AsyncSession, email: str) -> Union[User, None]:
     statement = select(User).where(User.email == email)
     result = await session.scalars(statement=statement)
-    return result.first()
\ No newline at end of file
+    return result.first()
+
+def encode_user_cursor(user: User) -> str:
+    raw = json.dumps([user.created_at.isoformat(), str(user.id)]).encode()
+    return base64.urlsafe_b64encode(raw).decode().rstrip("=")
+
+def decode_user_cursor(cursor: str) -> tuple[datetime, uuid.UUID]:
+    try:
+        raw = base64.urlsafe_b64decode(cursor + "=" * (-len(cursor) % 4))
+        created_at, user_id = json.loads(raw)
+        return datetime.fromisoformat(created_at), uuid.UUID(user_id)
+    except (ValueError, TypeError):
+        raise ValidationError("Invalid pagination cursor", details={"after": cursor})
+
+async def list_users(
+    *, session: AsyncSession, limit: int, skip: int = 0, after: Union[str, None] = None
+) -> tuple[list[User], Union[str, None]]:
+    """
+    Page through users in (created_at, id) order.
+
+    With `after` the page starts right past the cursor via the (created_at, id) index,
+    so every page costs the same. `skip` is kept for OFFSET-style callers and is
+    ignored when `after` is given; read_users rejects the combination.
+    """
+    statement = select(User).order_by(User.created_at, User.id).limit(limit + 1)
+    if after is not None:
+        created_at, user_id = decode_user_cursor(after)
+        statement = statement.where(tuple_(User.created_at, User.id) > tuple_(created_at, user_id))
+    elif skip:
+        statement = statement.offset(skip)
+
+    users = list((await session.scalars(statement)).all())
+    next_cursor = None
+    if len(users) > limit:
+        users = users[:limit]
+        next_cursor = encode_user_cursor(users[-1])
+    return users, next_cursor
+
+async def count_users(*, session: AsyncSession, mode: CountMode = "exact") -> Union[int, None]:
+    if mode == "none":
+        return None
+    if mode == "estimated":
+        # Planner statistics; -1 (or NULL) until the table has been vacuumed or analyzed
+        estimate = await session.scalar(
+            text("SELECT reltuples::bigint FROM pg_class WHERE oid = to_regclass('\"user\"')")
+        )
+        if estimate is not None and estimate >= 0:
+            return estimate
+    return await session.scalar(select(func.count()).select_from(User))
+
+def _encode_export_rows(rows, export_format: ExportFormat) -> bytes:
+    if export_format == "csv":
+        buffer = io.StringIO()
+        csv.writer(buffer).writerows(rows)
+        return buffer.getvalue().encode()
+    return b"".join(orjson.dumps(dict(zip(EXPORT_COLUMNS, row))) + b"\n" for row in rows)
+
+async def stream_users_export(
+    *, session_factory: async_sessionmaker[AsyncSession], export_format: ExportFormat, batch_size: int
+) -> AsyncIterator[bytes]:
+    """
+    Yield every user as NDJSON or CSV, one chunk per fetched batch.
+
+    Rows come through a server-side cursor `batch_size` at a time, so memory stays flat
+    however many users there are. The generator owns its session because it keeps
+    running after the request handler has returned. The first chunk, the CSV header or
+    an empty one for NDJSON, is yielded before any query runs, so the response starts
+    at once instead of after the first batch.
+    """
+    yield _encode_export_rows([EXPORT_COLUMNS], "csv") if export_format == "csv" else b""
+
+    columns = [getattr(User, name) for name in EXPORT_COLUMNS]
+    statement = (
+        select(*columns)
+        .order_by(User.created_at, User.id)
+        .execution_options(yield_per=batch_size)
+    )
+    async with session_factory() as session:
+        result = await session.stream(statement)
+        async for rows in result.partitions():
+            yield _encode_export_rows(rows, export_format)
+
@@ -0,0 +1,82 @@
+#!/usr/bin/env python3
+"""
+Benchmark: latency distribution of authenticate() for known and unknown emails
+
+    python benchmarks/auth_timing.py --iterations 50
+
+Seeds one user in the configured Postgres, then times authservice.authenticate for:
+  known, wrong password   real bcrypt verify
+  known, right password   real bcrypt verify
+  unknown, lookup         DB miss, then a verify against the dummy hash
+  unknown, cached         negative cache hit, dummy verify, no DB lookup
+The four distributions should overlap: an unknown email must not answer measurably
+faster than a wrong password.
+"""
+
+import argparse
+import asyncio
+import json
+import sys
+import time
+import uuid
+from pathlib import Path
+
+# Add project root to path
+project_root = Path(__file__).parent.parent
+sys.path.insert(0, str(project_root))
+
+from app.core.database import async_session, close_db_connections
+from app.core.security import hashing_executor
+from app.services import authservice
+from benchmarks.load import ADMIN_EMAIL, BENCH_DOMAIN, BENCH_PASSWORD, remove_seeded_users, seed_users
+
+
+def _percentile(ordered: list[float], fraction: float) -> float:
+    return ordered[min(int(len(ordered) * fraction), len(ordered) - 1)]
+
+
+async def time_path(iterations: int, email_for, password: str) -> dict:
+    latencies = []
+    for i in range(iterations):
+        email = email_for(i)
+        async with async_session() as session:
+            started = time.perf_counter()
+            await authservice.authenticate(session=session, email=email, password=password)
+            latencies.append(time.perf_counter() - started)
+    ordered = sorted(latencies)
+    return {
+        "p50_ms": round(_percentile(ordered, 0.50) * 1000, 2),
+        "p95_ms": round(_percentile(ordered, 0.95) * 1000, 2),
+        "p99_ms": round(_percentile(ordered, 0.99) * 1000, 2),
+        "max_ms": round(ordered[-1] * 1000, 2),
+    }
+
+
+async def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--iterations", type=int, default=50)
+    args = parser.parse_args()
+
+    await seed_users(0)
+    try:
+        # Warm up the dummy hash and the connection pool
+        await time_path(1, lambda i: f"warmup@{BENCH_DOMAIN}", "wrong-password")
+
+        unknown = [f"nobody-{uuid.uuid4().hex}@{BENCH_DOMAIN}" for _ in range(args.iterations)]
+        results = {
+            "known, wrong password": await time_path(args.iterations, lambda i: ADMIN_EMAIL, "wrong-password"),
+            "known, right password": await time_path(args.iterations, lambda i: ADMIN_EMAIL, BENCH_PASSWORD),
+            "unknown, lookup": await time_path(args.iterations, lambda i: unknown[i], "wrong-password"),
+            "unknown, cached": await time_path(args.iterations, lambda i: unknown[i], "wrong-password"),
+        }
+    finally:
+        await remove_seeded_users()
+        await close_db_connections()
+        hashing_executor.shutdown()
+
+    print(f"🎯 authenticate() latency ({args.iterations} calls per path)")
+    print(json.dumps(results, indent=2))
+
+
+if __name__ == "__main__":
+    asyncio.run(main())
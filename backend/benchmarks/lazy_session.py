@@ -0,0 +1,111 @@
+#!/usr/bin/env python3
+"""
+Benchmark: pool pressure of request sessions that check out a connection only when used
+
+    DATABASE_POOL_SIZE=5 DATABASE_MAX_OVERFLOW=0 python benchmarks/lazy_session.py --requests 2000 --concurrency 50
+
+Runs the app in-process against the configured Postgres (see benchmarks/load.py) twice:
+  eager  session dependencies overridden to check out a connection as soon as they are
+         created and to always commit, like a session opened per request
+  lazy   the real dependencies: a connection on the first statement, COMMIT only after a write
+for two routes:
+  me     GET /users/me, answered from the token's claims without a query
+  users  GET /users/?limit=100, which queries
+A small pool makes the difference visible: eager requests queue for connections even
+when the handler never uses one.
+"""
+
+import argparse
+import asyncio
+import json
+import sys
+from pathlib import Path
+
+# Add project root to path
+project_root = Path(__file__).parent.parent
+sys.path.insert(0, str(project_root))
+
+import httpx
+from fastapi import Request
+
+from app.core.config import settings
+from app.core.database import (
+    async_session,
+    get_db_session,
+    get_read_db_session,
+    get_read_session_factory,
+    pool_checkout_stats,
+    session_usage_stats,
+)
+from app.main import app
+from benchmarks.load import build_scenarios, login, remove_seeded_users, run_scenario, seed_users
+
+
+async def eager_db_session():
+    async with async_session() as session:
+        await session.connection()
+        yield session
+        await session.commit()
+
+
+async def eager_read_db_session(request: Request):
+    async with get_read_session_factory(request)() as session:
+        await session.connection()
+        yield session
+
+
+def use_eager_sessions(eager: bool) -> None:
+    if eager:
+        app.dependency_overrides[get_db_session] = eager_db_session
+        app.dependency_overrides[get_read_db_session] = eager_read_db_session
+    else:
+        app.dependency_overrides.pop(get_db_session, None)
+        app.dependency_overrides.pop(get_read_db_session, None)
+
+
+async def measure(client: httpx.AsyncClient, request, total: int, concurrency: int) -> dict:
+    checkouts = pool_checkout_stats.checkouts
+    wait_seconds = pool_checkout_stats.wait_seconds_total
+    sessions = dict(session_usage_stats.counts)
+    result = await run_scenario(client, request, total, concurrency)
+    # run_scenario sends one extra warm-up request
+    result["checkouts_per_request"] = round((pool_checkout_stats.checkouts - checkouts) / (total + 1), 2)
+    result["checkout_wait_ms_total"] = round((pool_checkout_stats.wait_seconds_total - wait_seconds) * 1000, 1)
+    result["request_sessions"] = {
+        outcome: count - sessions[outcome] for outcome, count in session_usage_stats.counts.items()
+    }
+    return result
+
+
+async def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--users", type=int, default=1000)
+    parser.add_argument("--requests", type=int, default=2000)
+    parser.add_argument("--concurrency", type=int, default=50)
+    args = parser.parse_args()
+
+    await seed_users(args.users)
+    results: dict = {}
+    try:
+        async with app.router.lifespan_context(app):
+            transport = httpx.ASGITransport(app=app)
+            async with httpx.AsyncClient(transport=transport, base_url="http://bench") as client:
+                scenarios = build_scenarios(await login(client))
+                for mode in ("eager", "lazy"):
+                    use_eager_sessions(mode == "eager")
+                    for name in ("me", "users"):
+                        print(f"▶️  {mode} {name}: {args.requests} requests", file=sys.stderr)
+                        results[f"{mode} {name}"] = await measure(
+                            client, scenarios[name], args.requests, args.concurrency
+                        )
+    finally:
+        use_eager_sessions(False)
+        await remove_seeded_users()
+
+    print(f"🎯 Request sessions (pool_size={settings.DATABASE_POOL_SIZE}, "
+          f"max_overflow={settings.DATABASE_MAX_OVERFLOW}, concurrency {args.concurrency})")
+    print(json.dumps(results, indent=2))
+
+
+if __name__ == "__main__":
+    asyncio.run(main())
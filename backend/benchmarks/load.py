@@ -0,0 +1,309 @@
+#!/usr/bin/env python3
+"""
+Load test: the real app in-process against the configured Postgres
+
+    python benchmarks/load.py --users 5000 --requests 2000 --concurrency 20 --output baseline.json
+    python benchmarks/load.py --compare baseline.json --tolerance 10
+
+Boots app.main:app with its lifespan, seeds --users users (all @bench.example.com,
+replaced on every run) and drives each scenario at fixed concurrency through an
+in-process ASGI transport, so the numbers cover the app and the database but no
+network or server. Use a throwaway database: DB_* settings come from .env as usual.
+
+    python benchmarks/load.py --sqlite /tmp/bench.sqlite3 --scenarios login,me,users
+
+--sqlite runs without Postgres instead, the way the test suite does: a fresh SQLite
+file through aiosqlite, with no lifespan (its startup checks and background refreshes
+talk to Postgres) and so no health scenario. It is for comparing the app's own cost
+between two commits on a machine without a database server; its figures are not
+comparable with Postgres runs, and --compare refuses a baseline from the other kind.
+
+Scenarios:
+  login   POST /auth/login/access-token (bcrypt bound, uses --login-requests)
+  me      GET /users/me
+  users   GET /users/?limit=100, following next_cursor and starting over at the end
+  health  GET /health/
+
+Each scenario reports RPS, p50/p95/p99 latency and DB queries and DB time per request
+(read from the Server-Timing header, so QUERY_STATS_ENABLED must be on). --compare
+reruns and flags any scenario whose RPS dropped, p95 grew or query count rose past the
+tolerance; the exit status is 1 when something regressed.
+"""
+
+import argparse
+import asyncio
+import contextlib
+import json
+import platform
+import re
+import statistics
+import sys
+import time
+import uuid
+from collections.abc import Awaitable, Callable
+from pathlib import Path
+from typing import Any, Union
+
+# Add project root to path
+project_root = Path(__file__).parent.parent
+sys.path.insert(0, str(project_root))
+
+import httpx
+from fastapi import FastAPI
+from sqlalchemy import delete, insert
+from sqlalchemy.ext.asyncio import AsyncEngine, AsyncSession, async_sessionmaker, create_async_engine
+from sqlmodel import SQLModel
+
+from app.core import database
+from app.core.config import settings
+from app.core.security import pwd_context
+from app.models import User
+
+BENCH_DOMAIN = "bench.example.com"
+BENCH_PASSWORD = "bench-password-123"
+ADMIN_EMAIL = f"admin@{BENCH_DOMAIN}"
+SCENARIOS = ("login", "me", "users", "health")
+
+_SERVER_TIMING_DB = re.compile(r'db;dur=([\d.]+);desc="(\d+) queries"')
+
+RequestFn = Callable[[httpx.AsyncClient], Awaitable[httpx.Response]]
+
+
+async def use_sqlite(path: Path) -> AsyncEngine:
+    """Point every app session at a fresh SQLite file, as tests/conftest.py does"""
+    path.unlink(missing_ok=True)
+    engine = create_async_engine(f"sqlite+aiosqlite:///{path}")
+    async with engine.begin() as conn:
+        await conn.run_sync(SQLModel.metadata.create_all)
+    # The app's statement timing (for the Server-Timing figures) and write tracking
+    database._install_query_timing(engine)
+    database._install_write_tracking(engine)
+    factory = async_sessionmaker(engine, class_=AsyncSession, expire_on_commit=False, autoflush=False)
+    database.async_session = database.read_async_session = database.primary_read_async_session = factory
+    return engine
+
+
+async def seed_users(count: int) -> None:
+    """Replace the benchmark users with `count` fresh ones plus one superuser"""
+    # One hash for everyone: seeding should not take longer than the benchmark
+    hashed_password = pwd_context.hash(BENCH_PASSWORD)
+    rows = [
+        {
+            "id": uuid.uuid4(),
+            "email": f"user{i}@{BENCH_DOMAIN}" if i else ADMIN_EMAIL,
+            "full_name": f"Bench User {i}",
+            "hashed_password": hashed_password,
+            "is_active": True,
+            "is_superuser": i == 0,
+        }
+        for i in range(count + 1)
+    ]
+    async with database.async_session() as session:
+        await session.execute(delete(User).where(User.email.like(f"%@{BENCH_DOMAIN}")))
+        for start in range(0, len(rows), 1000):
+            await session.execute(insert(User), rows[start:start + 1000])
+        await session.commit()
+
+
+async def remove_seeded_users() -> None:
+    async with database.async_session() as session:
+        await session.execute(delete(User).where(User.email.like(f"%@{BENCH_DOMAIN}")))
+        await session.commit()
+
+
+async def login(client: httpx.AsyncClient, email: str = ADMIN_EMAIL) -> str:
+    response = await client.post(
+        f"{settings.API_PATH}/auth/login/access-token",
+        data={"username": email, "password": BENCH_PASSWORD},
+    )
+    response.raise_for_status()
+    return response.json()["access_token"]
+
+
+def _percentile(ordered: list[float], fraction: float) -> float:
+    return ordered[min(int(len(ordered) * fraction), len(ordered) - 1)]
+
+
+async def run_scenario(
+    client: httpx.AsyncClient, request: RequestFn, total: int, concurrency: int
+) -> dict[str, Any]:
+    """Send `total` requests from `concurrency` workers and summarize them"""
+    latencies: list[float] = []
+    queries: list[int] = []
+    db_ms: list[float] = []
+    errors = 0
+    remaining = iter(range(total))
+
+    async def worker():
+        nonlocal errors
+        for _ in remaining:
+            sent = time.perf_counter()
+            response = await request(client)
+            latencies.append(time.perf_counter() - sent)
+            if response.status_code >= 400:
+                errors += 1
+            match = _SERVER_TIMING_DB.search(response.headers.get("server-timing", ""))
+            if match:
+                db_ms.append(float(match.group(1)))
+                queries.append(int(match.group(2)))
+
+    # One unmeasured request warms routing, statement and serializer caches
+    await request(client)
+    started = time.perf_counter()
+    await asyncio.gather(*(worker() for _ in range(concurrency)))
+    elapsed = time.perf_counter() - started
+
+    ordered = sorted(latencies)
+    return {
+        "requests": total,
+        "concurrency": concurrency,
+        "errors": errors,
+        "rps": round(total / elapsed, 1),
+        "p50_ms": round(_percentile(ordered, 0.50) * 1000, 2),
+        "p95_ms": round(_percentile(ordered, 0.95) * 1000, 2),
+        "p99_ms": round(_percentile(ordered, 0.99) * 1000, 2),
+        "db_queries_per_request": round(statistics.fmean(queries), 2) if queries else None,
+        "db_ms_per_request": round(statistics.fmean(db_ms), 2) if db_ms else None,
+    }
+
+
+def build_scenarios(token: str) -> dict[str, RequestFn]:
+    api = settings.API_PATH
+    auth = {"Authorization": f"Bearer {token}"}
+    cursor: dict[str, Union[str, None]] = {"after": None}
+
+    async def login_request(client):
+        return await client.post(
+            f"{api}/auth/login/access-token",
+            data={"username": ADMIN_EMAIL, "password": BENCH_PASSWORD},
+        )
+
+    async def me_request(client):
+        return await client.get(f"{api}/users/me", headers=auth)
+
+    async def users_request(client):
+        params = {"limit": 100}
+        if cursor["after"]:
+            params["after"] = cursor["after"]
+        response = await client.get(f"{api}/users/", params=params, headers=auth)
+        if response.status_code == 200:
+            cursor["after"] = response.json().get("next_cursor")
+        return response
+
+    async def health_request(client):
+        return await client.get(f"{api}/health/")
+
+    return {"login": login_request, "me": me_request, "users": users_request, "health": health_request}
+
+
+async def run_benchmarks(
+    app: FastAPI,
+    scenarios: list[str],
+    users: int,
+    requests: int,
+    login_requests: int,
+    concurrency: int,
+    backend: str = "postgres",
+) -> dict[str, Any]:
+    await seed_users(users)
+    results: dict[str, Any] = {}
+    lifespan = app.router.lifespan_context(app) if backend == "postgres" else contextlib.nullcontext()
+    async with lifespan:
+        transport = httpx.ASGITransport(app=app)
+        async with httpx.AsyncClient(transport=transport, base_url="http://bench") as client:
+            requests_for = build_scenarios(await login(client))
+            for name in scenarios:
+                total = login_requests if name == "login" else requests
+                print(f"▶️  {name}: {total} requests, concurrency {concurrency}", file=sys.stderr)
+                results[name] = await run_scenario(client, requests_for[name], total, concurrency)
+    return {
+        "meta": {
+            "created_at": time.strftime("%Y-%m-%dT%H:%M:%S%z"),
+            "python": platform.python_version(),
+            "users": users,
+            "concurrency": concurrency,
+            "database": backend,
+        },
+        "scenarios": results,
+    }
+
+
+def compare(baseline: dict[str, Any], current: dict[str, Any], tolerance: float) -> list[str]:
+    """Describe every scenario that regressed by more than `tolerance` percent"""
+    regressions = []
+    limit = tolerance / 100
+    for name, now in current["scenarios"].items():
+        before = baseline.get("scenarios", {}).get(name)
+        if before is None:
+            continue
+        if now["rps"] < before["rps"] * (1 - limit):
+            regressions.append(f"{name}: rps {before['rps']} -> {now['rps']}")
+        if now["p95_ms"] > before["p95_ms"] * (1 + limit):
+            regressions.append(f"{name}: p95 {before['p95_ms']} ms -> {now['p95_ms']} ms")
+        if (before["db_queries_per_request"] is not None and now["db_queries_per_request"] is not None
+                and now["db_queries_per_request"] > before["db_queries_per_request"]):
+            regressions.append(
+                f"{name}: queries/request {before['db_queries_per_request']} -> {now['db_queries_per_request']}"
+            )
+    return regressions
+
+
+async def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--users", type=int, default=1000)
+    parser.add_argument("--requests", type=int, default=2000)
+    parser.add_argument("--login-requests", type=int, default=200)
+    parser.add_argument("--concurrency", type=int, default=10)
+    parser.add_argument("--scenarios", default=",".join(SCENARIOS), help="comma-separated subset")
+    parser.add_argument("--output", type=Path, help="write results JSON here (e.g. a new baseline)")
+    parser.add_argument("--compare", type=Path, help="baseline JSON to check these results against")
+    parser.add_argument("--tolerance", type=float, default=10.0, help="allowed regression, percent")
+    parser.add_argument("--keep", action="store_true", help="leave the seeded users in place")
+    parser.add_argument("--sqlite", type=Path, help="run against a fresh SQLite file here instead of Postgres")
+    args = parser.parse_args()
+
+    scenarios = [name.strip() for name in args.scenarios.split(",") if name.strip()]
+    unknown = set(scenarios) - set(SCENARIOS)
+    if unknown:
+        parser.error(f"unknown scenarios: {', '.join(sorted(unknown))}")
+    backend = "sqlite" if args.sqlite else "postgres"
+    if args.sqlite and "health" in scenarios:
+        parser.error("the health scenario checks Postgres and cannot run with --sqlite")
+    baseline = json.loads(args.compare.read_text()) if args.compare else None
+    if baseline is not None and baseline.get("meta", {}).get("database", "postgres") != backend:
+        parser.error(f"{args.compare} was not recorded against {backend}")
+
+    from app.main import app
+
+    # Every login comes from one client and one account; don't let the limiter throttle it
+    settings.LOGIN_RATE_LIMIT_ENABLED = False
+
+    engine = await use_sqlite(args.sqlite) if args.sqlite else None
+    try:
+        results = await run_benchmarks(
+            app, scenarios, args.users, args.requests, args.login_requests, args.concurrency, backend
+        )
+    finally:
+        if not args.keep:
+            await remove_seeded_users()
+        if engine is not None:
+            await engine.dispose()
+
+    output = json.dumps(results, indent=2)
+    print(output)
+    if args.output:
+        args.output.write_text(output + "\n")
+        print(f"💾 Results written to {args.output}", file=sys.stderr)
+
+    if baseline is not None:
+        regressions = compare(baseline, results, args.tolerance)
+        if regressions:
+            print(f"❌ Regressions against {args.compare} (tolerance {args.tolerance}%):", file=sys.stderr)
+            for regression in regressions:
+                print(f"   - {regression}", file=sys.stderr)
+            sys.exit(1)
+        print(f"✅ No regressions against {args.compare}", file=sys.stderr)
+
+
+if __name__ == "__main__":
+    asyncio.run(main())
@@ -0,0 +1,102 @@
+#!/usr/bin/env python3
+"""
+Micro-benchmark: per-query latency of the hot auth queries under each prepared-statement mode
+
+    python benchmarks/statement_cache.py --iterations 2000
+
+Modes:
+  cached     statement caches sized from Settings (the default)
+  uncached   statement_cache_size=0, the previous hard-coded behaviour
+  pgbouncer  DATABASE_PGBOUNCER_MODE, uniquely named statements and no caches
+"""
+
+import argparse
+import asyncio
+import statistics
+import sys
+import time
+from pathlib import Path
+
+# Add project root to path
+project_root = Path(__file__).parent.parent
+sys.path.insert(0, str(project_root))
+
+from sqlalchemy.ext.asyncio import create_async_engine, async_sessionmaker
+from sqlalchemy.pool import NullPool
+from sqlmodel import select
+from sqlmodel.ext.asyncio.session import AsyncSession
+
+from app.core.config import settings
+from app.core.database import build_connect_args
+from app.models import User
+
+
+def connect_args_for(mode: str) -> dict:
+    if mode == "pgbouncer":
+        return build_connect_args(pgbouncer_mode=True)
+    connect_args = build_connect_args(pgbouncer_mode=False)
+    if mode == "uncached":
+        connect_args["statement_cache_size"] = 0
+        connect_args["prepared_statement_cache_size"] = 0
+    return connect_args
+
+
+def summarize(samples: list[float]) -> dict:
+    samples = sorted(samples)
+    return {
+        "mean_us": round(statistics.fmean(samples) * 1e6, 1),
+        "p50_us": round(samples[len(samples) // 2] * 1e6, 1),
+        "p95_us": round(samples[int(len(samples) * 0.95)] * 1e6, 1),
+    }
+
+
+async def run_mode(mode: str, iterations: int) -> dict:
+    engine = create_async_engine(
+        str(settings.SQLALCHEMY_DATABASE_URI),
+        poolclass=NullPool,
+        connect_args=connect_args_for(mode),
+    )
+    session_factory = async_sessionmaker(engine, class_=AsyncSession, expire_on_commit=False)
+    by_email, by_id = [], []
+
+    try:
+        async with session_factory() as session:
+            user = (await session.scalars(select(User).limit(1))).first()
+            if user is None:
+                raise SystemExit("❌ Seed at least one user before running this benchmark")
+            email, user_id = user.email, user.id
+
+            for _ in range(iterations):
+                started = time.perf_counter()
+                (await session.scalars(select(User).where(User.email == email))).first()
+                by_email.append(time.perf_counter() - started)
+
+                # Bypass the identity map so session.get() really hits the database
+                session.expunge_all()
+                started = time.perf_counter()
+                await session.get(User, user_id)
+                by_id.append(time.perf_counter() - started)
+                session.expunge_all()
+    finally:
+        await engine.dispose()
+
+    return {"get_user_by_email": summarize(by_email), "session.get(User)": summarize(by_id)}
+
+
+async def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--iterations", type=int, default=1000)
+    parser.add_argument("--modes", nargs="+", default=["cached", "uncached", "pgbouncer"])
+    args = parser.parse_args()
+
+    print(f"🎯 Prepared statement benchmark ({args.iterations} iterations per query)")
+    print("=" * 50)
+    for mode in args.modes:
+        results = await run_mode(mode, args.iterations)
+        print(f"{mode}:")
+        for query, stats in results.items():
+            print(f"   {query:<20} mean {stats['mean_us']:>8}µs  p50 {stats['p50_us']:>8}µs  p95 {stats['p95_us']:>8}µs")
+
+
+if __name__ == "__main__":
+    asyncio.run(main())
@@ -0,0 +1,98 @@
+#!/usr/bin/env python3
+"""
+Benchmark: requests per second for GET /users/?limit=100, default vs fast response path
+
+    python benchmarks/users_list_response.py --requests 5000 --concurrency 20
+
+Both apps serve the same 100 in-memory users so only serialization differs:
+  default  JSONResponse + response_model re-validation + jsonable_encoder (previous behaviour)
+  fast     FastJSONResponse default class + ModelResponse built from the rows without re-validation
+"""
+
+import argparse
+import asyncio
+import sys
+import time
+import uuid
+from pathlib import Path
+from typing import Any
+
+# Add project root to path
+project_root = Path(__file__).parent.parent
+sys.path.insert(0, str(project_root))
+
+import httpx
+from fastapi import FastAPI
+from fastapi.responses import JSONResponse
+
+from app.core.responses import FastJSONResponse, ModelResponse
+from app.models import User, UserPublic, UsersPublic
+
+USERS = [
+    User(
+        id=uuid.uuid4(),
+        email=f"user{i}@example.com",
+        full_name=f"User {i}",
+        hashed_password="not-a-real-hash",
+    )
+    for i in range(100)
+]
+
+
+def build_default_app() -> FastAPI:
+    app = FastAPI(default_response_class=JSONResponse)
+
+    @app.get("/users/", response_model=UsersPublic)
+    async def read_users(limit: int = 100) -> Any:
+        return UsersPublic(data=USERS[:limit], count=len(USERS))
+
+    return app
+
+
+def build_fast_app() -> FastAPI:
+    app = FastAPI(default_response_class=FastJSONResponse)
+
+    @app.get("/users/", response_model=UsersPublic)
+    async def read_users(limit: int = 100) -> Any:
+        return ModelResponse(UsersPublic.model_construct(
+            data=[UserPublic.from_row(user) for user in USERS[:limit]],
+            count=len(USERS),
+            next_cursor=None,
+        ))
+
+    return app
+
+
+async def drive(app: FastAPI, total: int, concurrency: int) -> float:
+    transport = httpx.ASGITransport(app=app)
+    async with httpx.AsyncClient(transport=transport, base_url="http://bench") as client:
+        remaining = iter(range(total))
+
+        async def worker():
+            for _ in remaining:
+                response = await client.get("/users/", params={"limit": 100})
+                response.raise_for_status()
+
+        # Warm up routing and serializer caches before timing
+        await client.get("/users/", params={"limit": 100})
+        started = time.perf_counter()
+        await asyncio.gather(*(worker() for _ in range(concurrency)))
+        return total / (time.perf_counter() - started)
+
+
+async def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--requests", type=int, default=3000)
+    parser.add_argument("--concurrency", type=int, default=10)
+    args = parser.parse_args()
+
+    print(f"🎯 GET /users/?limit=100 ({args.requests} requests, concurrency {args.concurrency})")
+    print("=" * 50)
+    baseline = await drive(build_default_app(), args.requests, args.concurrency)
+    fast = await drive(build_fast_app(), args.requests, args.concurrency)
+    print(f"default: {baseline:>9.1f} req/s")
+    print(f"fast:    {fast:>9.1f} req/s  ({(fast / baseline - 1) * 100:+.1f}%)")
+
+
+if __name__ == "__main__":
+    asyncio.run(main())
@@ -0,0 +1,97 @@
+#!/usr/bin/env python3
+"""
+Pick password hash parameters for this host from a target verify time
+
+    python scripts/calibrate_password_hash.py --target-ms 250  # the configured scheme
+    python scripts/calibrate_password_hash.py --scheme argon2 --target-ms 250 --memory-mib 64
+
+bcrypt: the highest rounds whose verify stays within the target.
+argon2id: memory and parallelism are fixed (memory hardness is the point of argon2), and
+time_cost is raised while a verify stays within the target.
+
+Prints the settings to put in .env. Run it on the hardware that serves logins; a higher
+target costs more CPU per login and lowers logins per second per hashing worker.
+"""
+
+import argparse
+import statistics
+import sys
+import time
+from pathlib import Path
+
+# Add project root to path
+project_root = Path(__file__).parent.parent
+sys.path.insert(0, str(project_root))
+
+from passlib.hash import argon2, bcrypt
+
+from app.core.config import settings
+
+SAMPLE_PASSWORD = "calibration-password-123"
+
+
+def time_verify(handler, samples: int) -> float:
+    """Median seconds for one verify with `handler`'s parameters"""
+    hashed = handler.hash(SAMPLE_PASSWORD)
+    durations = []
+    for _ in range(samples):
+        started = time.perf_counter()
+        handler.verify(SAMPLE_PASSWORD, hashed)
+        durations.append(time.perf_counter() - started)
+    return statistics.median(durations)
+
+
+def calibrate_bcrypt(target: float, samples: int) -> list[str]:
+    best_rounds = 10
+    for rounds in range(10, 18):
+        seconds = time_verify(bcrypt.using(rounds=rounds), samples)
+        print(f"   bcrypt rounds={rounds}: {seconds * 1000:.1f} ms")
+        if seconds > target:
+            break
+        best_rounds = rounds
+    return ["PASSWORD_HASH_SCHEME=bcrypt", f"PASSWORD_BCRYPT_ROUNDS={best_rounds}"]
+
+
+def calibrate_argon2(target: float, samples: int, memory_kib: int, parallelism: int) -> list[str]:
+    best_time_cost = 1
+    for time_cost in range(1, 21):
+        handler = argon2.using(type="ID", time_cost=time_cost, memory_cost=memory_kib, parallelism=parallelism)
+        seconds = time_verify(handler, samples)
+        print(f"   argon2id time_cost={time_cost}: {seconds * 1000:.1f} ms")
+        if seconds > target:
+            break
+        best_time_cost = time_cost
+    return [
+        "PASSWORD_HASH_SCHEME=argon2",
+        f"PASSWORD_ARGON2_TIME_COST={best_time_cost}",
+        f"PASSWORD_ARGON2_MEMORY_COST={memory_kib}",
+        f"PASSWORD_ARGON2_PARALLELISM={parallelism}",
+    ]
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument(
+        "--scheme", choices=["bcrypt", "argon2"], default=settings.PASSWORD_HASH_SCHEME,
+        help="defaults to the configured PASSWORD_HASH_SCHEME",
+    )
+    parser.add_argument("--target-ms", type=float, default=250.0, help="longest acceptable verify time")
+    parser.add_argument("--samples", type=int, default=5, help="verifies timed per candidate")
+    parser.add_argument("--memory-mib", type=int, default=64, help="argon2 memory per hash")
+    parser.add_argument("--parallelism", type=int, default=4, help="argon2 lanes per hash")
+    args = parser.parse_args()
+
+    target = args.target_ms / 1000
+    print(f"⏱️  Calibrating {args.scheme} for a verify time of at most {args.target_ms:.0f} ms...")
+    if args.scheme == "bcrypt":
+        lines = calibrate_bcrypt(target, args.samples)
+    else:
+        lines = calibrate_argon2(target, args.samples, args.memory_mib * 1024, args.parallelism)
+
+    print("\n✅ Add to .env (existing hashes are upgraded on each user's next login):")
+    for line in lines:
+        print(f"   {line}")
+
+
+if __name__ == "__main__":
+    main()
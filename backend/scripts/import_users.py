@@ -0,0 +1,53 @@
+#!/usr/bin/env python3
+"""
+Bulk-import users from a CSV or NDJSON file
+
+    python scripts/import_users.py users.csv
+    python scripts/import_users.py users.ndjson --report import-report.json
+"""
+
+import argparse
+import asyncio
+import sys
+from pathlib import Path
+
+# Add project root to path
+project_root = Path(__file__).parent.parent
+sys.path.insert(0, str(project_root))
+
+from app.core.database import async_session, close_db_connections
+from app.services import importservice
+
+
+async def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("path", type=Path, help="CSV (with header row) or NDJSON file")
+    parser.add_argument("--format", choices=["csv", "ndjson"], help="Defaults to the file extension")
+    parser.add_argument("--report", type=Path, help="Write the per-row report as JSON to this file")
+    args = parser.parse_args()
+
+    import_format = args.format or importservice.detect_format(args.path.name)
+    print(f"📥 Importing users from {args.path} ({import_format})...")
+
+    rows = importservice.parse_rows(args.path.read_text(encoding="utf-8-sig"), import_format)
+    try:
+        async with async_session() as session:
+            report = await importservice.import_users(session=session, rows=rows)
+            await session.commit()
+    finally:
+        await close_db_connections()
+
+    print(f"✅ Created: {report.created}")
+    print(f"⚠️  Conflicts: {report.conflicts}  Duplicates: {report.duplicates}  Invalid: {report.invalid}")
+    for result in report.rows[:20]:
+        print(f"   row {result.row} [{result.status}] {result.email or ''} {'; '.join(result.errors)}")
+    if len(report.rows) > 20:
+        print(f"   ... {len(report.rows) - 20} more")
+
+    if args.report:
+        args.report.write_text(report.model_dump_json(indent=2))
+        print(f"📝 Report written to {args.report}")
+
+
+if __name__ == "__main__":
+    asyncio.run(main())
@@ -0,0 +1,80 @@
+"""
+Tests run the real app and its session dependencies against a throwaway SQLite file.
+
+Postgres-only statements (ON CONFLICT inserts, COPY, set_config) are not covered here.
+"""
+import asyncio
+import os
+
+# Settings require these; nothing connects to Postgres during the tests
+os.environ.setdefault("DB_NAME", "test")
+os.environ.setdefault("DB_USERNAME", "test")
+os.environ.setdefault("DB_PASSWORD", "test")
+
+import httpx
+import pytest
+from sqlalchemy.ext.asyncio import AsyncSession, async_sessionmaker, create_async_engine
+from sqlalchemy.pool import NullPool
+from sqlmodel import SQLModel
+
+from app.core import database
+from app.core.ratelimit import MemoryRateLimitBackend, login_rate_limiter
+from app.core.security import pwd_context
+from app.main import app
+from app.models import User
+
+TEST_PASSWORD = "test-password-123"
+
+
+@pytest.fixture(autouse=True)
+def fresh_login_rate_limits(monkeypatch):
+    # Tests log in as the same few emails, so counters must not carry over between them
+    monkeypatch.setattr(login_rate_limiter, "backend", MemoryRateLimitBackend())
+
+
+@pytest.fixture
+def session_factory(tmp_path, monkeypatch) -> async_sessionmaker[AsyncSession]:
+    # NullPool: every test call runs its own event loop, so no connection may outlive one
+    engine = create_async_engine(f"sqlite+aiosqlite:///{tmp_path / 'test.db'}", poolclass=NullPool)
+    # Without it, sessions whose only writes are Core statements are never committed
+    database._install_write_tracking(engine)
+
+    async def create_tables():
+        async with engine.begin() as conn:
+            await conn.run_sync(SQLModel.metadata.create_all)
+
+    asyncio.run(create_tables())
+    # The same session class the app uses, so tests exercise the real session API
+    factory = async_sessionmaker(engine, class_=AsyncSession, expire_on_commit=False, autoflush=False)
+    monkeypatch.setattr(database, "async_session", factory)
+    monkeypatch.setattr(database, "read_async_session", factory)
+    monkeypatch.setattr(database, "primary_read_async_session", factory)
+    yield factory
+    asyncio.run(engine.dispose())
+
+
+@pytest.fixture
+def create_user(session_factory):
+    def create(email: str = "user@example.com", **fields) -> User:
+        user = User(email=email, hashed_password=pwd_context.hash(TEST_PASSWORD), **fields)
+
+        async def insert():
+            async with session_factory() as session:
+                session.add(user)
+                await session.commit()
+
+        asyncio.run(insert())
+        return user
+
+    return create
+
+
+def call_app(method: str, url: str, **kwargs) -> httpx.Response:
+    """Send one request through the app in-process"""
+
+    async def send():
+        transport = httpx.ASGITransport(app=app)
+        async with httpx.AsyncClient(transport=transport, base_url="http://test") as client:
+            return await client.request(method, url, **kwargs)
+
+    return asyncio.run(send())
@@ -0,0 +1,84 @@
+import asyncio
+import statistics
+
+from sqlalchemy import event
+from sqlalchemy.engine import Engine
+
+from app.core.security import hashing_executor
+from app.models import User
+from app.services import authservice
+from tests.conftest import TEST_PASSWORD
+
+SAMPLES = 5
+
+
+def verify_times(session_factory, email: str, password: str, cached: bool = True) -> tuple[list[float], int]:
+    """
+    Hash seconds of every executor job, and the statements run, over SAMPLES failed logins;
+    with cached=False the negative cache is cleared before each one
+    """
+    hash_seconds: list[float] = []
+    statements = 0
+
+    def count_statement(*args) -> None:
+        nonlocal statements
+        statements += 1
+
+    async def logins():
+        for _ in range(SAMPLES):
+            if not cached:
+                authservice.unknown_email_cache.pop(email)
+            async with session_factory() as session:
+                assert await authservice.authenticate(session=session, email=email, password=password) is None
+
+    hashing_executor.add_observer(lambda seconds, wait: hash_seconds.append(seconds))
+    event.listen(Engine, "before_cursor_execute", count_statement)
+    try:
+        asyncio.run(logins())
+    finally:
+        hashing_executor._observers.pop()
+        event.remove(Engine, "before_cursor_execute", count_statement)
+    return hash_seconds, statements
+
+
+def test_misses_cost_the_same_verify_as_a_wrong_password(create_user, session_factory):
+    create_user()
+    authservice.unknown_email_cache.pop("nobody@example.com")
+    # One real login first, so the dummy hash follows the stored hash's scheme and cost
+    asyncio.run(_login(session_factory, "user@example.com", TEST_PASSWORD))
+
+    wrong_password, _ = verify_times(session_factory, "user@example.com", "wrong-password")
+    unknown_miss, miss_statements = verify_times(
+        session_factory, "nobody@example.com", "wrong-password", cached=False
+    )
+    unknown_cached, cached_statements = verify_times(session_factory, "nobody@example.com", "wrong-password")
+
+    # The first miss may also build the dummy hash: one extra job
+    unknown_miss = unknown_miss[-SAMPLES:]
+    assert len(wrong_password) == len(unknown_cached) == SAMPLES
+    assert miss_statements == SAMPLES
+    assert cached_statements == 0
+    baseline = statistics.median(wrong_password)
+    for samples in (unknown_miss, unknown_cached):
+        assert 0.5 < statistics.median(samples) / baseline < 2.0
+
+
+def test_a_committed_user_is_not_left_in_the_negative_cache(session_factory):
+    email = "late@example.com"
+
+    async def signup_racing_a_login():
+        async with session_factory() as session:
+            session.add(User(email=email, hashed_password="not-a-real-hash"))
+            await session.flush()
+            # A login in between the flush and the commit cannot see the row yet
+            authservice.unknown_email_cache.set(email, True)
+            await session.commit()
+
+    asyncio.run(signup_racing_a_login())
+
+    assert not authservice.unknown_email_cache.get(email)
+
+
+async def _login(session_factory, email: str, password: str):
+    async with session_factory() as session:
+        return await authservice.authenticate(session=session, email=email, password=password)
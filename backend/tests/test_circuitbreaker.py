@@ -0,0 +1,135 @@
+import asyncio
+
+import pytest
+from asyncpg.exceptions import QueryCanceledError
+from sqlalchemy import text
+from sqlalchemy.ext.asyncio import AsyncEngine, create_async_engine
+
+from app.core import database
+from app.core.circuitbreaker import CLOSED, HALF_OPEN, OPEN, CircuitBreaker
+from app.core.config import settings
+from app.exceptions import DatabaseConnectionError
+from tests.conftest import call_app
+
+
+def opened_breaker() -> CircuitBreaker:
+    """A breaker whose open period is already over, so its next allow() admits a trial"""
+    breaker = CircuitBreaker("test", min_calls=1, open_seconds=60.0, half_open_calls=2)
+    breaker.record_failure()
+    assert breaker.state == OPEN
+    breaker._changed_monotonic -= breaker.open_seconds
+    return breaker
+
+
+def half_open_breaker() -> CircuitBreaker:
+    breaker = opened_breaker()
+    assert breaker.allow()
+    assert breaker.state == HALF_OPEN
+    return breaker
+
+
+def test_statement_successes_do_not_close_a_half_open_breaker():
+    breaker = half_open_breaker()
+
+    for _ in range(10):
+        breaker.record_success(0.001)
+
+    assert breaker.state == HALF_OPEN
+
+
+def test_half_open_closes_after_enough_trials():
+    breaker = half_open_breaker()
+    generation = breaker.generation
+
+    breaker.record_trial_success(generation)
+    assert breaker.state == HALF_OPEN
+    assert breaker.allow()
+    breaker.record_trial_success(generation)
+
+    assert breaker.state == CLOSED
+
+
+def test_trials_from_an_earlier_round_are_ignored():
+    breaker = half_open_breaker()
+    stale_generation = breaker.generation
+    breaker.record_failure()
+    breaker._changed_monotonic -= breaker.open_seconds
+    assert breaker.allow()
+
+    breaker.record_trial_success(stale_generation)
+    breaker.record_trial_success(stale_generation)
+
+    assert breaker.state == HALF_OPEN
+
+
+def breaker_engine(path, breaker: CircuitBreaker) -> AsyncEngine:
+    """A SQLite engine whose pool and statements report to `breaker`, like the app's engines"""
+    pool_class = type("TestQueuePool", (database.InstrumentedQueuePool,), {"breaker": breaker})
+    engine = create_async_engine(f"sqlite+aiosqlite:///{path}", poolclass=pool_class)
+    database._install_query_timing(engine)
+    database._install_breaker_outcomes(engine, breaker)
+    return engine
+
+
+async def checkout(engine: AsyncEngine, statements: int = 1) -> None:
+    async with engine.connect() as conn:
+        for _ in range(statements):
+            await conn.execute(text("SELECT 1"))
+
+
+def test_one_checkout_is_one_trial_however_many_statements(tmp_path):
+    breaker = opened_breaker()
+    engine = breaker_engine(tmp_path / "breaker.db", breaker)
+
+    async def run():
+        try:
+            await checkout(engine, statements=5)
+            assert breaker.state == HALF_OPEN
+            await checkout(engine, statements=1)
+        finally:
+            await engine.dispose()
+
+    asyncio.run(run())
+
+    assert breaker.state == CLOSED
+
+
+def test_an_open_breaker_only_fails_its_own_engine(tmp_path):
+    replica_breaker = CircuitBreaker("replica", min_calls=1, open_seconds=60.0)
+    replica_breaker.record_failure()
+    primary_breaker = CircuitBreaker("primary")
+    replica = breaker_engine(tmp_path / "replica.db", replica_breaker)
+    primary = breaker_engine(tmp_path / "primary.db", primary_breaker)
+
+    async def run():
+        try:
+            with pytest.raises(DatabaseConnectionError):
+                await checkout(replica)
+            await checkout(primary)
+        finally:
+            await replica.dispose()
+            await primary.dispose()
+
+    asyncio.run(run())
+
+    assert replica_breaker.state == OPEN
+    assert primary_breaker.state == CLOSED
+
+
+def test_breaker_health_lists_every_engine():
+    response = call_app("GET", f"{settings.API_PATH}/health/breaker")
+
+    assert response.status_code == 200
+    assert set(response.json()["breakers"]) == set(database.database_breakers)
+    assert "primary" in response.json()["breakers"]
+
+
+def test_only_deadline_statement_timeouts_are_excused():
+    cancelled = QueryCanceledError("canceling statement due to statement timeout")
+    under_deadline = {"session_info": {"deadline_statement_timeout": True}}
+    without_deadline = {"session_info": {"deadline_statement_timeout": False}}
+
+    assert database._cancelled_by_deadline(under_deadline, cancelled)
+    assert not database._cancelled_by_deadline(without_deadline, cancelled)
+    assert not database._cancelled_by_deadline({}, cancelled)
+    assert not database._cancelled_by_deadline(under_deadline, OSError("connection refused"))
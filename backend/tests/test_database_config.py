@@ -0,0 +1,42 @@
+from app.core import database
+from app.core.config import settings
+
+
+def test_statement_caches_follow_settings(monkeypatch):
+    monkeypatch.setattr(settings, "DATABASE_STATEMENT_CACHE_SIZE", 42)
+    monkeypatch.setattr(settings, "DATABASE_PREPARED_STATEMENT_CACHE_SIZE", 7)
+
+    connect_args = database.build_connect_args(pgbouncer_mode=False)
+
+    assert connect_args["statement_cache_size"] == 42
+    assert connect_args["prepared_statement_cache_size"] == 7
+    assert "prepared_statement_name_func" not in connect_args
+
+
+def test_pgbouncer_mode_disables_caches_and_never_reuses_names():
+    connect_args = database.build_connect_args(pgbouncer_mode=True)
+
+    assert connect_args["statement_cache_size"] == 0
+    assert connect_args["prepared_statement_cache_size"] == 0
+    name_statement = connect_args["prepared_statement_name_func"]
+    assert name_statement() != name_statement()
+
+
+def test_max_connections_are_split_across_workers(monkeypatch):
+    monkeypatch.setattr(settings, "DATABASE_POOL_SIZE", 10)
+    monkeypatch.setattr(settings, "DATABASE_MAX_OVERFLOW", 20)
+    monkeypatch.setattr(settings, "DATABASE_MAX_CONNECTIONS", 24)
+    monkeypatch.setattr(settings, "WEB_CONCURRENCY", 4)
+
+    assert database.pool_limits() == (6, 0)
+
+    monkeypatch.setattr(settings, "DATABASE_MAX_CONNECTIONS", None)
+    assert database.pool_limits() == (10, 20)
+
+
+def test_pool_status_reports_the_configured_pool():
+    status = database.get_pool_status()
+
+    assert status["pool_size"] == database.pool_limits()[0]
+    assert status["checked_out"] == 0
+    assert {"idle", "overflow", "pool_timeout_seconds"} <= status.keys()
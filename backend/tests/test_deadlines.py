@@ -0,0 +1,104 @@
+import asyncio
+
+import httpx
+from fastapi import APIRouter, Depends, FastAPI
+from sqlalchemy import text
+from sqlalchemy.ext.asyncio import create_async_engine
+
+from app.api.dependencies import request_deadline
+from app.core import database
+from app.core.config import settings
+from app.api.routes.health import router as health_router
+from app.middleware.deadline import DeadlineMiddleware
+from tests.conftest import call_app
+
+router = APIRouter()
+
+
+@router.get("/default")
+async def sleeps_under_the_default(seconds: float):
+    await asyncio.sleep(seconds)
+    return {"ok": True}
+
+
+@router.get("/route", dependencies=[Depends(request_deadline(0.2))])
+async def sleeps_under_a_route_deadline(seconds: float):
+    await asyncio.sleep(seconds)
+    return {"ok": True}
+
+
+@router.get("/unbounded", dependencies=[Depends(request_deadline(None))])
+async def sleeps_without_a_deadline(seconds: float):
+    await asyncio.sleep(seconds)
+    return {"ok": True}
+
+
+def call_deadline_app(default_seconds: float, url: str, **kwargs) -> httpx.Response:
+    """Send one request to a throwaway app with only DeadlineMiddleware and the routes above"""
+    app = FastAPI()
+    app.include_router(router)
+    app.add_middleware(DeadlineMiddleware, default_seconds=default_seconds)
+
+    async def send():
+        transport = httpx.ASGITransport(app=app)
+        async with httpx.AsyncClient(transport=transport, base_url="http://test") as client:
+            return await client.get(url, **kwargs)
+
+    return asyncio.run(send())
+
+
+def test_default_deadline_applies_to_routes_without_their_own():
+    response = call_deadline_app(0.2, "/default", params={"seconds": 1})
+
+    assert response.status_code == 504
+    body = response.json()
+    assert body["error_code"] == "DEADLINE_EXCEEDED"
+    assert body["details"] == {"deadline_seconds": 0.2}
+
+
+def test_requests_within_the_default_deadline_succeed():
+    response = call_deadline_app(1.0, "/default", params={"seconds": 0})
+
+    assert response.status_code == 200
+
+
+def test_route_deadline_replaces_the_default():
+    response = call_deadline_app(30.0, "/route", params={"seconds": 1})
+
+    assert response.status_code == 504
+    assert response.json()["details"] == {"deadline_seconds": 0.2}
+
+
+def test_route_can_lift_the_default():
+    response = call_deadline_app(0.1, "/unbounded", params={"seconds": 0.3})
+
+    assert response.status_code == 200
+
+
+def test_liveness_has_no_deadline_dependency():
+    route = next(route for route in health_router.routes if route.path.endswith("/live"))
+
+    assert route.dependant.dependencies == []
+    assert call_app("GET", f"{settings.API_PATH}/health/live").status_code == 200
+
+
+def test_internal_statements_skip_query_observers(tmp_path):
+    seen: list[str] = []
+    engine = create_async_engine(f"sqlite+aiosqlite:///{tmp_path / 'internal.db'}")
+    database._install_query_timing(engine)
+    database.add_query_observer(lambda statement, parameters, seconds: seen.append(statement))
+
+    async def run():
+        try:
+            async with engine.connect() as conn:
+                await conn.exec_driver_sql("SELECT 1", execution_options=database.INTERNAL_STATEMENT)
+                await conn.execute(text("SELECT 2"))
+        finally:
+            await engine.dispose()
+
+    try:
+        asyncio.run(run())
+    finally:
+        database._query_observers.pop()
+
+    assert seen == ["SELECT 2"]
@@ -0,0 +1,48 @@
+import asyncio
+import threading
+
+import pytest
+
+from app.core.security import PasswordHashingExecutor
+from app.exceptions import ServiceOverloadedError
+
+
+def test_work_runs_off_the_event_loop_thread():
+    executor = PasswordHashingExecutor(max_workers=1, queue_limit=0)
+
+    async def run():
+        return threading.get_ident(), await executor.run(threading.get_ident)
+
+    try:
+        loop_thread, worker_thread = asyncio.run(run())
+    finally:
+        executor.shutdown()
+
+    assert worker_thread != loop_thread
+    assert executor.stats()["completed"] == 1
+
+
+def test_work_beyond_the_queue_limit_is_rejected():
+    executor = PasswordHashingExecutor(max_workers=1, queue_limit=1)
+    release = threading.Event()
+
+    async def flood():
+        # One job holds the only worker and one waits in the queue
+        jobs = [asyncio.ensure_future(executor.run(release.wait)) for _ in range(2)]
+        await asyncio.sleep(0)
+        try:
+            with pytest.raises(ServiceOverloadedError) as raised:
+                await executor.run(release.wait)
+        finally:
+            release.set()
+            await asyncio.gather(*jobs)
+        return raised.value
+
+    try:
+        error = asyncio.run(flood())
+    finally:
+        executor.shutdown()
+
+    assert error.status_code == 503
+    assert executor.stats()["rejected"] == 1
+    assert executor.stats()["completed"] == 2
@@ -0,0 +1,50 @@
+import asyncio
+
+import pytest
+
+from app.core import health
+from app.core.config import settings
+from tests.conftest import call_app
+
+
+@pytest.fixture
+def probes(monkeypatch) -> list[str]:
+    results = []
+
+    async def check_database_health():
+        results.append("probe")
+        return {"status": "healthy"}
+
+    monkeypatch.setattr(health, "check_database_health", check_database_health)
+    return results
+
+
+def test_snapshot_reuses_the_last_probe(probes):
+    monitor = health.DatabaseHealthMonitor(interval=60, max_age=60)
+
+    async def snapshots():
+        return await monitor.snapshot(), await monitor.snapshot()
+
+    first, second = asyncio.run(snapshots())
+
+    assert probes == ["probe"]
+    assert first["status"] == second["status"] == "healthy"
+    assert second["age_seconds"] >= first["age_seconds"]
+
+
+def test_readiness_needs_a_recent_healthy_probe(probes):
+    monitor = health.DatabaseHealthMonitor(interval=60, max_age=60)
+    assert not monitor.is_ready()
+
+    asyncio.run(monitor.refresh())
+    assert monitor.is_ready()
+
+    monitor.max_age = 0
+    assert not monitor.is_ready()
+
+
+def test_liveness_does_not_touch_the_database(probes):
+    response = call_app("GET", f"{settings.API_PATH}/health/live")
+
+    assert response.status_code == 200
+    assert probes == []
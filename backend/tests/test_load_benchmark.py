@@ -0,0 +1,27 @@
+from benchmarks.load import compare
+
+
+def results(rps: float, p95_ms: float, queries: float) -> dict:
+    return {"scenarios": {"me": {"rps": rps, "p95_ms": p95_ms, "db_queries_per_request": queries}}}
+
+
+def test_changes_within_tolerance_are_not_regressions():
+    baseline = results(rps=100.0, p95_ms=10.0, queries=2.0)
+
+    assert compare(baseline, results(rps=95.0, p95_ms=10.5, queries=2.0), tolerance=10) == []
+
+
+def test_each_regressed_figure_is_reported():
+    baseline = results(rps=100.0, p95_ms=10.0, queries=2.0)
+
+    regressions = compare(baseline, results(rps=80.0, p95_ms=12.0, queries=3.0), tolerance=10)
+
+    assert regressions == [
+        "me: rps 100.0 -> 80.0",
+        "me: p95 10.0 ms -> 12.0 ms",
+        "me: queries/request 2.0 -> 3.0",
+    ]
+
+
+def test_scenarios_missing_from_the_baseline_are_skipped():
+    assert compare({"scenarios": {}}, results(rps=1.0, p95_ms=1000.0, queries=50.0), tolerance=10) == []
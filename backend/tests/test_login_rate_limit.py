@@ -0,0 +1,84 @@
+import ipaddress
+
+import pytest
+from pydantic import ValidationError
+from starlette.requests import Request
+
+from app.api.dependencies import get_client_ip
+from app.core.config import Settings, settings
+from app.core.ratelimit import SQLiteRateLimitBackend
+from app.exceptions import ServiceOverloadedError
+
+
+def request_from(peer: str, forwarded_for: list[str] = ()) -> Request:
+    headers = [(b"x-forwarded-for", value.encode()) for value in forwarded_for]
+    return Request({"type": "http", "method": "POST", "path": "/", "headers": headers, "client": (peer, 1234)})
+
+
+@pytest.fixture
+def trusted_proxies(monkeypatch):
+    monkeypatch.setattr(
+        settings, "TRUSTED_PROXIES", [ipaddress.ip_network("10.0.0.0/8"), ipaddress.ip_network("127.0.0.1/32")]
+    )
+
+
+def test_forwarded_for_is_ignored_without_trusted_proxies():
+    assert get_client_ip(request_from("203.0.113.7", ["198.51.100.1"])) == "203.0.113.7"
+
+
+def test_forwarded_for_from_an_untrusted_peer_is_ignored(trusted_proxies):
+    assert get_client_ip(request_from("203.0.113.7", ["198.51.100.1"])) == "203.0.113.7"
+
+
+def test_nearest_untrusted_hop_is_the_client(trusted_proxies):
+    # The leftmost entry was sent by the client itself and cannot be believed
+    request = request_from("127.0.0.1", ["192.0.2.66, 198.51.100.1", "10.1.2.3"])
+
+    assert get_client_ip(request) == "198.51.100.1"
+
+
+def test_all_trusted_hops_fall_back_to_the_leftmost(trusted_proxies):
+    assert get_client_ip(request_from("127.0.0.1", ["10.0.0.5, 10.0.0.6"])) == "10.0.0.5"
+    assert get_client_ip(request_from("127.0.0.1")) == "127.0.0.1"
+
+
+def test_trusted_proxies_parse_from_a_comma_separated_value():
+    parsed = Settings(TRUSTED_PROXIES="10.0.0.0/8, 127.0.0.1").TRUSTED_PROXIES
+
+    assert parsed == [ipaddress.ip_network("10.0.0.0/8"), ipaddress.ip_network("127.0.0.1/32")]
+
+
+@pytest.mark.parametrize("field", ["LOGIN_RATE_LIMIT_PER_EMAIL", "LOGIN_RATE_LIMIT_PER_IP"])
+def test_rate_limits_must_allow_at_least_one_attempt(field):
+    with pytest.raises(ValidationError):
+        Settings(**{field: 0})
+
+
+def test_sqlite_backend_purges_expired_rows_every_n_hits(tmp_path):
+    backend = SQLiteRateLimitBackend(str(tmp_path / "limits.sqlite3"), purge_every=3)
+    connection = backend._connection()
+    connection.execute("INSERT INTO rate_limits VALUES ('stale', 0, 0, 1, 1)")
+    plan = [row[3] for row in connection.execute("EXPLAIN QUERY PLAN DELETE FROM rate_limits WHERE expires_at <= 1")]
+
+    for count in (1, 2):
+        assert backend._hit_sync(f"key-{count}", 10, 60.0) == 0
+        assert connection.execute("SELECT count(*) FROM rate_limits WHERE key = 'stale'").fetchone() == (1,)
+    backend._hit_sync("key-3", 10, 60.0)
+
+    assert connection.execute("SELECT count(*) FROM rate_limits WHERE key = 'stale'").fetchone() == (0,)
+    assert any("rate_limits_expires_at" in step for step in plan)
+
+
+def test_sqlite_backend_lock_timeout_is_a_503(tmp_path):
+    path = str(tmp_path / "limits.sqlite3")
+    holder = SQLiteRateLimitBackend(path)._connection()
+    backend = SQLiteRateLimitBackend(path, timeout=0.05)
+    holder.execute("BEGIN IMMEDIATE")
+    try:
+        with pytest.raises(ServiceOverloadedError) as raised:
+            backend._hit_sync("key", 10, 60.0)
+    finally:
+        holder.execute("ROLLBACK")
+
+    assert raised.value.status_code == 503
+    assert backend._hit_sync("key", 10, 60.0) == 0
@@ -0,0 +1,53 @@
+import pytest
+from prometheus_client import REGISTRY
+
+from app.core import metrics
+from app.core.config import settings
+from tests.conftest import call_app
+
+ME_URL = f"{settings.API_PATH}/users/me"
+
+
+def requests_total(status: str, route_suffix: str) -> float:
+    # Depending on the FastAPI version the template may or may not carry the API_PATH prefix
+    return sum(
+        sample.value
+        for metric in REGISTRY.collect()
+        for sample in metric.samples
+        if sample.name == "http_requests_total"
+        and sample.labels["status"] == status
+        and sample.labels["route"].endswith(route_suffix)
+    )
+
+
+def test_requests_are_labelled_by_route_template():
+    before = requests_total("401", "/users/me")
+    unmatched_before = requests_total("404", "unmatched")
+
+    assert call_app("GET", ME_URL).status_code == 401
+    assert call_app("GET", f"{settings.API_PATH}/no-such-route/123").status_code == 404
+
+    assert requests_total("401", "/users/me") == before + 1
+    assert requests_total("404", "unmatched") == unmatched_before + 1
+    assert requests_total("404", "/123") == 0
+
+
+def test_metrics_endpoint_is_not_counted_itself():
+    response = call_app("GET", "/metrics")
+
+    assert response.status_code == 200
+    assert "http_request_duration_seconds_bucket" in response.text
+    assert 'route="/metrics"' not in response.text
+
+
+@pytest.mark.parametrize(
+    "statement, operation",
+    [
+        ("SELECT 1", "SELECT"),
+        ("  insert into users values (1)", "INSERT"),
+        ("SAVEPOINT sa_1", "OTHER"),
+        ("", "OTHER"),
+    ],
+)
+def test_statements_are_labelled_by_leading_keyword(statement, operation):
+    assert metrics._statement_operation(statement) == operation
@@ -0,0 +1,37 @@
+import asyncio
+from collections import Counter
+
+import pytest
+from passlib.hash import argon2, bcrypt
+
+from app.core import security
+
+
+@pytest.fixture(autouse=True)
+def fresh_dummy_state(monkeypatch):
+    monkeypatch.setattr(security, "_verified_hash_settings", Counter())
+    monkeypatch.setattr(security, "_dummy_hashes", {})
+
+
+def test_dummy_hash_follows_the_stored_scheme_and_cost():
+    legacy = bcrypt.using(rounds=5).hash("legacy-password")
+    current = argon2.using(type="ID", time_cost=1, memory_cost=1024, parallelism=1).hash("current-password")
+
+    async def logins():
+        await security.verify_password("legacy-password", legacy)
+        await security.verify_password("legacy-password", legacy)
+        await security.verify_password("current-password", current)
+        await security.verify_dummy_password("anything")
+
+    asyncio.run(logins())
+
+    [dummy_hash] = security._dummy_hashes.values()
+    assert dummy_hash.startswith("$2b$05$")
+    # The dummy itself is never counted as a stored hash
+    assert sum(security._verified_hash_settings.values()) == 3
+
+
+def test_dummy_hash_uses_the_current_scheme_before_any_verify():
+    asyncio.run(security.verify_dummy_password("anything"))
+
+    assert security.pwd_context.identify(security._dummy_hashes[None]) == security.settings.PASSWORD_HASH_SCHEME
@@ -0,0 +1,63 @@
+import asyncio
+from datetime import timedelta
+
+import pytest
+from sqlalchemy import event
+from sqlalchemy.engine import Engine
+
+from app.core.config import settings
+from app.core.security import create_access_token
+from app.models import User
+from app.services.principalservice import principal_cache
+from tests.conftest import call_app
+
+ME_URL = f"{settings.API_PATH}/users/me"
+
+
+@pytest.fixture(autouse=True)
+def empty_principal_cache():
+    principal_cache.clear()
+    yield
+    principal_cache.clear()
+
+
+def get_me(user: User, statements: list[str]) -> dict:
+    # No account claims, so the principal comes from the cache or the database
+    token = create_access_token(user.id, timedelta(minutes=5))
+
+    def record(conn, cursor, statement, parameters, context, executemany):
+        statements.append(statement)
+
+    event.listen(Engine, "before_cursor_execute", record)
+    try:
+        response = call_app("GET", ME_URL, headers={"Authorization": f"Bearer {token}"})
+    finally:
+        event.remove(Engine, "before_cursor_execute", record)
+    assert response.status_code == 200, response.text
+    return response.json()
+
+
+def test_cached_principal_needs_no_query(create_user):
+    user = create_user()
+    first, second = [], []
+
+    get_me(user, first)
+    get_me(user, second)
+
+    assert first
+    assert second == []
+
+
+def test_updating_the_user_invalidates_the_cached_principal(create_user, session_factory):
+    user = create_user(full_name="Before")
+    assert get_me(user, [])["full_name"] == "Before"
+
+    async def rename():
+        async with session_factory() as session:
+            stored = await session.get(User, user.id)
+            stored.full_name = "After"
+            await session.commit()
+
+    asyncio.run(rename())
+
+    assert get_me(user, [])["full_name"] == "After"
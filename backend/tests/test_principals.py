@@ -0,0 +1,28 @@
+from datetime import timedelta
+
+import pytest
+
+from app.core import database
+from app.core.config import settings
+from app.core.security import create_access_token
+from app.services.principalservice import principal_cache
+from tests.conftest import call_app
+
+
+def test_principal_lookup_reads_the_primary(create_user, monkeypatch):
+    user = create_user()
+
+    def replica_session():
+        pytest.fail("principal looked up on the replica")
+
+    monkeypatch.setattr(database, "read_async_session", replica_session)
+    # No account claims, so the principal has to be loaded from the database
+    token = create_access_token(user.id, timedelta(minutes=5))
+
+    try:
+        response = call_app("GET", f"{settings.API_PATH}/users/me", headers={"Authorization": f"Bearer {token}"})
+    finally:
+        principal_cache.pop(user.id)
+
+    assert response.status_code == 200, response.text
+    assert response.json()["email"] == "user@example.com"
@@ -0,0 +1,78 @@
+import asyncio
+import time
+
+import httpx
+from fastapi import FastAPI
+
+from app.core.profiler import LOOP_IDLE, OTHER_TASKS
+from app.middleware.profiler import ProfilerMiddleware
+
+SECRET = "profile-secret"
+
+
+def busy(seconds: float) -> None:
+    deadline = time.perf_counter() + seconds
+    while time.perf_counter() < deadline:
+        pass
+
+
+def profiled_app(tmp_path, **options) -> FastAPI:
+    app = FastAPI()
+
+    @app.get("/profiled")
+    async def profiled():
+        busy(0.05)
+        await asyncio.sleep(0.05)
+        return {"ok": True}
+
+    @app.get("/concurrent")
+    async def concurrent():
+        await asyncio.sleep(0.01)
+        busy(0.05)
+        return {"ok": True}
+
+    app.add_middleware(ProfilerMiddleware, secret=SECRET, output_dir=str(tmp_path), interval=0.001, **options)
+    return app
+
+
+def send(app: FastAPI, *requests: tuple[str, dict]) -> list[httpx.Response]:
+    async def run():
+        transport = httpx.ASGITransport(app=app)
+        async with httpx.AsyncClient(transport=transport, base_url="http://test") as client:
+            return await asyncio.gather(*(client.get(url, headers=headers) for url, headers in requests))
+
+    return asyncio.run(run())
+
+
+def test_profiling_needs_the_secret(tmp_path):
+    app = profiled_app(tmp_path)
+
+    responses = send(app, ("/profiled", {"X-Profile": "1"}), ("/profiled?profile=1", {}))
+
+    assert all("X-Profile-Id" not in response.headers for response in responses)
+    assert list(tmp_path.iterdir()) == []
+
+
+def test_profile_keeps_stacks_of_the_profiled_request_only(tmp_path):
+    app = profiled_app(tmp_path)
+
+    [response, _] = send(app, ("/profiled", {"X-Profile": SECRET}), ("/concurrent", {}))
+
+    assert "X-Profile-Id" in response.headers
+    [profile] = tmp_path.iterdir()
+    stacks = dict(line.rsplit(" ", 1) for line in profile.read_text().splitlines())
+    assert any("profiled" in stack for stack in stacks)
+    assert not any("concurrent" in stack for stack in stacks)
+    assert OTHER_TASKS in stacks
+    assert LOOP_IDLE in stacks
+
+
+def test_profile_files_are_capped(tmp_path):
+    app = profiled_app(tmp_path, max_files=2, max_file_bytes=200)
+
+    for _ in range(3):
+        send(app, ("/profiled", {"X-Profile": SECRET}))
+
+    profiles = list(tmp_path.iterdir())
+    assert len(profiles) == 2
+    assert all(profile.stat().st_size <= 200 for profile in profiles)
@@ -0,0 +1,57 @@
+import asyncio
+import logging
+
+import httpx
+from fastapi import FastAPI
+
+from app.core import querystats
+from app.middleware.querystats import QueryStatsMiddleware
+
+REPEATED = "SELECT * FROM item WHERE id = ?"
+
+
+def run_statements(statements: list[str], **limits) -> httpx.Response:
+    """Call a throwaway app whose handler reports the given statements to the observer"""
+    app = FastAPI()
+    app.add_middleware(QueryStatsMiddleware, **limits)
+
+    @app.get("/items")
+    async def items():
+        for statement in statements:
+            querystats._record_query(statement, None, 0.001)
+        return {}
+
+    async def send():
+        transport = httpx.ASGITransport(app=app)
+        async with httpx.AsyncClient(transport=transport, base_url="http://test") as client:
+            return await client.get("/items")
+
+    return asyncio.run(send())
+
+
+def test_server_timing_reports_the_request_statements():
+    response = run_statements(["SELECT 1", "SELECT 2"])
+
+    assert response.headers["Server-Timing"] == 'db;dur=2.00;desc="2 queries"'
+
+
+def test_repeated_statement_is_logged_as_n_plus_one(caplog):
+    with caplog.at_level(logging.WARNING, logger="app.middleware.querystats"):
+        run_statements(["SELECT * FROM item"] + [REPEATED] * 4, max_repeats=3)
+
+    [record] = caplog.records
+    assert record.getMessage().startswith("GET /items ran 5 queries")
+    assert f"repeated 4x: {REPEATED}" in record.getMessage()
+
+
+def test_requests_within_limits_are_not_logged(caplog):
+    with caplog.at_level(logging.WARNING, logger="app.middleware.querystats"):
+        run_statements([REPEATED] * 3, max_queries=3, max_repeats=3)
+
+    assert caplog.records == []
+
+
+def test_statements_outside_a_request_are_ignored():
+    querystats._record_query("SELECT 1", None, 0.001)
+
+    assert querystats.current_query_stats.get() is None
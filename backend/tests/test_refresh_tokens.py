@@ -0,0 +1,172 @@
+import asyncio
+import uuid
+
+import jwt
+import pytest
+from pydantic import ValidationError
+from sqlalchemy import event
+from sqlalchemy.engine import Engine
+
+from sqlmodel import select
+
+from app.core.config import MAX_ACCESS_TOKEN_EXPIRE_MINUTES, Settings, settings
+from app.models import RevokedToken, User
+from app.services import tokenservice
+from tests.conftest import TEST_PASSWORD, call_app
+
+LOGIN_URL = f"{settings.API_PATH}/auth/login/access-token"
+REFRESH_URL = f"{settings.API_PATH}/auth/refresh"
+LOGOUT_URL = f"{settings.API_PATH}/auth/logout"
+
+
+def login(email: str) -> dict:
+    response = call_app("POST", LOGIN_URL, data={"username": email, "password": TEST_PASSWORD})
+    assert response.status_code == 200, response.text
+    return response.json()
+
+
+def test_refresh_rotates_the_token_pair(create_user):
+    create_user()
+    tokens = login("user@example.com")
+
+    response = call_app("POST", REFRESH_URL, json={"refresh_token": tokens["refresh_token"]})
+
+    assert response.status_code == 200, response.text
+    rotated = response.json()
+    assert rotated["refresh_token"] != tokens["refresh_token"]
+    assert rotated["access_token"] != tokens["access_token"]
+    me = call_app(
+        "GET", f"{settings.API_PATH}/users/me", headers={"Authorization": f"Bearer {rotated['access_token']}"}
+    )
+    assert me.status_code == 200
+    assert me.json()["email"] == "user@example.com"
+
+
+def test_reusing_a_refresh_token_revokes_its_family(create_user):
+    create_user()
+    tokens = login("user@example.com")
+    rotated = call_app("POST", REFRESH_URL, json={"refresh_token": tokens["refresh_token"]}).json()
+
+    replayed = call_app("POST", REFRESH_URL, json={"refresh_token": tokens["refresh_token"]})
+    after_revoke = call_app("POST", REFRESH_URL, json={"refresh_token": rotated["refresh_token"]})
+
+    assert replayed.status_code == 403
+    assert after_revoke.status_code == 403
+
+
+def test_revoked_refresh_token_cannot_be_used(create_user, session_factory):
+    user = create_user()
+    tokens = login("user@example.com")
+
+    async def revoke():
+        async with session_factory() as session:
+            await tokenservice.revoke_refresh_token(
+                session=session, refresh_token=tokens["refresh_token"], user_id=user.id
+            )
+            await session.commit()
+
+    asyncio.run(revoke())
+    response = call_app("POST", REFRESH_URL, json={"refresh_token": tokens["refresh_token"]})
+
+    assert response.status_code == 403
+
+
+def test_unknown_refresh_token_is_rejected(session_factory):
+    response = call_app("POST", REFRESH_URL, json={"refresh_token": "not-a-token"})
+
+    assert response.status_code == 403
+
+
+def me_status(access_token: str) -> int:
+    return call_app(
+        "GET", f"{settings.API_PATH}/users/me", headers={"Authorization": f"Bearer {access_token}"}
+    ).status_code
+
+
+@pytest.mark.parametrize("change", ["demote", "deactivate", "delete"])
+def test_claim_changes_revoke_outstanding_access_tokens(create_user, session_factory, change):
+    user = create_user(is_superuser=True)
+    first, second = login("user@example.com"), login("user@example.com")
+
+    async def apply():
+        async with session_factory() as session:
+            stored = await session.get(User, user.id)
+            if change == "delete":
+                await session.delete(stored)
+            else:
+                setattr(stored, "is_superuser" if change == "demote" else "is_active", False)
+            await session.commit()
+            return (await session.scalars(select(RevokedToken.user_id))).all()
+
+    revoked_for = asyncio.run(apply())
+
+    assert revoked_for == [user.id, user.id]
+    assert me_status(first["access_token"]) == 403
+    assert me_status(second["access_token"]) == 403
+
+
+def test_unrelated_changes_and_rollbacks_revoke_nothing(create_user, session_factory):
+    user = create_user()
+    tokens = login("user@example.com")
+
+    async def apply():
+        async with session_factory() as session:
+            stored = await session.get(User, user.id)
+            stored.full_name = "Renamed"
+            await session.commit()
+            stored.is_active = False
+            await session.flush()
+            await session.rollback()
+
+    asyncio.run(apply())
+
+    assert me_status(tokens["access_token"]) == 200
+
+
+def test_logout_revokes_both_tokens(create_user):
+    create_user()
+    tokens = login("user@example.com")
+
+    response = call_app(
+        "POST", LOGOUT_URL, json={"refresh_token": tokens["refresh_token"]},
+        headers={"Authorization": f"Bearer {tokens['access_token']}"},
+    )
+
+    assert response.status_code == 204, response.text
+    assert me_status(tokens["access_token"]) == 403
+    assert call_app("POST", REFRESH_URL, json={"refresh_token": tokens["refresh_token"]}).status_code == 403
+
+
+def test_logout_rejects_a_token_without_expiry_before_revoking_anything(create_user):
+    user = create_user()
+    tokens = login("user@example.com")
+    claims = tokenservice.access_token_claims(user)
+    unexpiring = jwt.encode({**claims, "sub": str(user.id), "jti": uuid.uuid4().hex}, settings.SECRET_KEY)
+    statements = []
+
+    def record(conn, cursor, statement, parameters, context, executemany):
+        statements.append(statement)
+
+    event.listen(Engine, "before_cursor_execute", record)
+    try:
+        response = call_app(
+            "POST", LOGOUT_URL, json={"refresh_token": tokens["refresh_token"]},
+            headers={"Authorization": f"Bearer {unexpiring}"},
+        )
+    finally:
+        event.remove(Engine, "before_cursor_execute", record)
+
+    assert response.status_code == 400
+    assert not [statement for statement in statements if "refresh_tokens" in statement]
+    assert call_app("POST", REFRESH_URL, json={"refresh_token": tokens["refresh_token"]}).status_code == 200
+
+
+def test_access_token_lifetime_is_clamped(caplog):
+    # The old default; an existing .env with it must still start the app
+    assert Settings(ACCESS_TOKEN_EXPIRE_MINUTES=11520).ACCESS_TOKEN_EXPIRE_MINUTES == MAX_ACCESS_TOKEN_EXPIRE_MINUTES
+    assert "ACCESS_TOKEN_EXPIRE_MINUTES=11520" in caplog.text
+
+
+def test_access_token_lifetime_must_be_positive():
+    with pytest.raises(ValidationError):
+        Settings(ACCESS_TOKEN_EXPIRE_MINUTES=0)
@@ -0,0 +1,80 @@
+import asyncio
+import uuid
+from collections.abc import Awaitable, Callable
+
+import pytest
+from sqlalchemy import event, insert, select
+from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy.orm import Session
+from starlette.requests import Request
+
+from app.core import database
+from app.core.security import pwd_context
+from app.models import User
+from tests.conftest import TEST_PASSWORD
+
+
+def use_request_session(use: Callable[[AsyncSession], Awaitable[None]]) -> tuple[str, Request, int]:
+    """Run `use(session)` inside get_db_session; return the recorded outcome, request and commits"""
+    request = Request({"type": "http", "method": "GET", "path": "/", "headers": []})
+    before = dict(database.session_usage_stats.counts)
+    commits = []
+
+    def count_commit(session):
+        commits.append(session)
+
+    async def run():
+        dependency = database.get_db_session(request)
+        session = await anext(dependency)
+        await use(session)
+        with pytest.raises(StopAsyncIteration):
+            await anext(dependency)
+
+    event.listen(Session, "after_commit", count_commit)
+    try:
+        asyncio.run(run())
+    finally:
+        event.remove(Session, "after_commit", count_commit)
+    [outcome] = [name for name, count in database.session_usage_stats.counts.items() if count != before[name]]
+    return outcome, request, len(commits)
+
+
+def test_an_unused_session_is_neither_checked_out_nor_committed(session_factory):
+    async def nothing(session):
+        pass
+
+    outcome, request, commits = use_request_session(nothing)
+
+    assert outcome == "unused"
+    assert commits == 0
+    assert not getattr(request.state, "database_used", False)
+
+
+def test_a_read_only_session_is_not_committed(session_factory):
+    async def read(session):
+        await session.execute(select(User))
+
+    outcome, request, commits = use_request_session(read)
+
+    assert outcome == "read"
+    assert commits == 0
+    assert request.state.database_used
+
+
+def test_a_core_write_is_committed(session_factory):
+    user_id = uuid.uuid4()
+
+    async def write(session):
+        await session.execute(
+            insert(User).values(id=user_id, email="core@example.com", hashed_password=pwd_context.hash(TEST_PASSWORD))
+        )
+
+    outcome, request, commits = use_request_session(write)
+
+    async def stored():
+        async with session_factory() as session:
+            return await session.get(User, user_id)
+
+    assert outcome == "commit"
+    assert commits == 1
+    assert asyncio.run(stored()) is not None
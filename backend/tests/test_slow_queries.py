@@ -0,0 +1,60 @@
+import logging
+
+from app.core.config import settings
+from app.core.slowqueries import SlowQueryLog, fingerprint
+from tests.conftest import call_app
+
+SLOW_QUERIES_URL = f"{settings.API_PATH}/health/slow-queries"
+
+
+def test_fingerprint_keeps_only_the_statement_shape():
+    first = fingerprint("SELECT * FROM users WHERE email = 'a@example.com' AND id IN (1, 2, 3) LIMIT 10")
+    second = fingerprint("SELECT *  FROM users\nWHERE email = 'o''brien@example.com' AND id IN ($1, $2) LIMIT $3")
+
+    assert first == second == "SELECT * FROM users WHERE email = ? AND id IN (...) LIMIT ?"
+
+
+def test_statements_aggregate_per_fingerprint():
+    log = SlowQueryLog(threshold_seconds=1.0, window=3, explain=False)
+    for seconds in (0.1, 0.2, 0.3, 0.4):
+        log.record("SELECT * FROM users WHERE id = 1", None, seconds)
+    log.record("DELETE FROM users WHERE id = 2", None, 0.05)
+
+    report = log.top()
+
+    assert report["fingerprints"] == 2
+    [select, delete] = report["queries"]
+    assert select["statement"] == "SELECT * FROM users WHERE id = ?"
+    assert select["count"] == 4
+    assert select["total_ms"] == 1000.0
+    assert select["max_ms"] == 400.0
+    # Percentiles cover only the last `window` durations
+    assert select["p50_ms"] == 300.0
+    assert delete["count"] == 1
+
+
+def test_slow_statements_are_logged(caplog):
+    log = SlowQueryLog(threshold_seconds=0.1, explain=False)
+
+    with caplog.at_level(logging.WARNING, logger="app.core.slowqueries"):
+        log.record("SELECT 1", None, 0.01)
+        log.record("SELECT 2", None, 0.25)
+
+    [record] = caplog.records
+    assert record.getMessage() == "Slow query (250.0 ms): SELECT ?"
+    assert log.top()["queries"][0]["slow_count"] == 1
+
+
+def test_new_fingerprints_past_the_limit_are_only_counted():
+    log = SlowQueryLog(threshold_seconds=1.0, max_fingerprints=1, explain=False)
+    log.record("SELECT * FROM users", None, 0.01)
+    log.record("SELECT * FROM item", None, 0.01)
+
+    report = log.top()
+
+    assert report["fingerprints"] == 1
+    assert report["untracked"] == 1
+
+
+def test_slow_query_report_requires_authentication():
+    assert call_app("GET", SLOW_QUERIES_URL).status_code == 401
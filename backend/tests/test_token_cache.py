@@ -0,0 +1,68 @@
+import uuid
+from datetime import timedelta
+
+import jwt
+import pytest
+
+from app.core.config import settings
+from app.core.security import create_access_token
+from app.services import tokenservice
+from app.services.tokenservice import token_payload_cache
+
+
+@pytest.fixture(autouse=True)
+def empty_token_cache():
+    token_payload_cache.clear()
+    yield
+    token_payload_cache.clear()
+
+
+@pytest.fixture
+def decodes(monkeypatch) -> list[str]:
+    """Tokens actually verified, as opposed to served from the cache"""
+    verified = []
+    decode = tokenservice._decode_access_token
+
+    def counting_decode(token: str):
+        verified.append(token)
+        return decode(token)
+
+    monkeypatch.setattr(tokenservice, "_decode_access_token", counting_decode)
+    return verified
+
+
+def test_a_token_is_verified_once(decodes):
+    token = create_access_token(uuid.uuid4(), timedelta(minutes=5))
+
+    first = tokenservice.decode_access_token(token)
+    second = tokenservice.decode_access_token(token)
+
+    assert second == first
+    assert decodes == [token]
+    assert token_payload_cache.stats()["hits"] >= 1
+
+
+def test_zero_size_verifies_every_time(decodes, monkeypatch):
+    monkeypatch.setattr(settings, "TOKEN_CACHE_SIZE", 0)
+    token = create_access_token(uuid.uuid4(), timedelta(minutes=5))
+
+    tokenservice.decode_access_token(token)
+    tokenservice.decode_access_token(token)
+
+    assert decodes == [token, token]
+    assert len(token_payload_cache) == 0
+
+
+@pytest.mark.parametrize(
+    "token",
+    [
+        create_access_token(uuid.uuid4(), timedelta(minutes=-1)),
+        jwt.encode({"sub": str(uuid.uuid4())}, "a-different-secret-key-of-32-bytes", algorithm=settings.ALGORITHM),
+    ],
+    ids=["expired", "wrong-key"],
+)
+def test_tokens_that_do_not_verify_are_never_cached(token):
+    with pytest.raises(jwt.InvalidTokenError):
+        tokenservice.decode_access_token(token)
+
+    assert len(token_payload_cache) == 0
@@ -0,0 +1,68 @@
+import asyncio
+import uuid
+from datetime import datetime, timedelta, timezone
+
+import jwt
+
+from app.core.config import settings
+from app.services import revocationservice
+from tests.conftest import TEST_PASSWORD, call_app
+
+LOGIN_URL = f"{settings.API_PATH}/auth/login/access-token"
+LOGOUT_URL = f"{settings.API_PATH}/auth/logout"
+
+
+def login(email: str) -> dict:
+    response = call_app("POST", LOGIN_URL, data={"username": email, "password": TEST_PASSWORD})
+    assert response.status_code == 200, response.text
+    return response.json()
+
+
+def me_status(access_token: str) -> int:
+    return call_app(
+        "GET", f"{settings.API_PATH}/users/me", headers={"Authorization": f"Bearer {access_token}"}
+    ).status_code
+
+
+def test_logout_revokes_the_access_token(create_user):
+    create_user()
+    tokens = login("user@example.com")
+
+    response = call_app("POST", LOGOUT_URL, headers={"Authorization": f"Bearer {tokens['access_token']}"})
+
+    assert response.status_code == 204, response.text
+    assert me_status(tokens["access_token"]) == 403
+
+
+def test_logout_rejects_a_token_without_expiry(create_user):
+    user = create_user()
+    jti = uuid.uuid4().hex
+    unexpiring = jwt.encode({"sub": str(user.id), "jti": jti}, settings.SECRET_KEY, algorithm=settings.ALGORITHM)
+
+    response = call_app("POST", LOGOUT_URL, headers={"Authorization": f"Bearer {unexpiring}"})
+
+    assert response.status_code == 400
+    assert not revocationservice.revocation_list.is_revoked(jti)
+
+
+def test_revocation_reaches_memory_only_on_commit(create_user, session_factory):
+    user = create_user()
+    expires_at = datetime.now(timezone.utc) + timedelta(minutes=5)
+    rolled_back, committed = uuid.uuid4().hex, uuid.uuid4().hex
+
+    async def revoke():
+        async with session_factory() as session:
+            await revocationservice.revoke_token(
+                session=session, jti=rolled_back, user_id=user.id, expires_at=expires_at
+            )
+            assert not revocationservice.revocation_list.is_revoked(rolled_back)
+            await session.rollback()
+            await revocationservice.revoke_token(
+                session=session, jti=committed, user_id=user.id, expires_at=expires_at
+            )
+            await session.commit()
+
+    asyncio.run(revoke())
+
+    assert not revocationservice.revocation_list.is_revoked(rolled_back)
+    assert revocationservice.revocation_list.is_revoked(committed)
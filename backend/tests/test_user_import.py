@@ -0,0 +1,76 @@
+import asyncio
+
+from app.core import security
+from app.core.config import settings
+from tests.conftest import TEST_PASSWORD, call_app
+
+LOGIN_URL = f"{settings.API_PATH}/auth/login/access-token"
+IMPORT_URL = f"{settings.API_PATH}/private/users/import"
+
+
+def auth_headers(email: str) -> dict:
+    response = call_app("POST", LOGIN_URL, data={"username": email, "password": TEST_PASSWORD})
+    assert response.status_code == 200, response.text
+    return {"Authorization": f"Bearer {response.json()['access_token']}"}
+
+
+def upload(content: bytes, name: str = "users.csv") -> dict:
+    return {"file": (name, content, "text/csv")}
+
+
+def test_import_requires_authentication(session_factory):
+    response = call_app("POST", IMPORT_URL, files=upload(b"email,password\n"))
+
+    assert response.status_code == 401
+
+
+def test_import_requires_a_superuser(create_user):
+    create_user()
+
+    response = call_app("POST", IMPORT_URL, files=upload(b"email,password\n"), headers=auth_headers("user@example.com"))
+
+    assert response.status_code == 403
+
+
+def test_import_rejects_oversized_uploads(create_user, monkeypatch):
+    create_user("admin@example.com", is_superuser=True)
+    monkeypatch.setattr(settings, "USER_IMPORT_MAX_BYTES", 16)
+
+    response = call_app(
+        "POST", IMPORT_URL, files=upload(b"email,password\n" + b"x" * 64), headers=auth_headers("admin@example.com")
+    )
+
+    assert response.status_code == 413
+    assert response.json()["error_code"] == "PAYLOAD_TOO_LARGE"
+
+
+def test_import_rejects_superuser_rows(create_user):
+    create_user("admin@example.com", is_superuser=True)
+    content = b"email,password,is_superuser\nnew@example.com,new-password-123,true\n"
+
+    response = call_app("POST", IMPORT_URL, files=upload(content), headers=auth_headers("admin@example.com"))
+
+    assert response.status_code == 200, response.text
+    report = response.json()
+    assert report["created"] == 0
+    assert report["invalid"] == 1
+    assert report["rows"][0]["errors"] == ["is_superuser cannot be imported"]
+
+
+def test_bulk_hashing_reuses_one_pool():
+    passwords = [f"password-{i}" for i in range(3)]
+
+    async def hash_twice():
+        first = await security.hash_passwords_bulk(passwords, chunk_size=1)
+        pool = security.bulk_hashing_executor._executor
+        second = await security.hash_passwords_bulk(passwords, chunk_size=1)
+        return first, second, pool
+
+    try:
+        first, second, pool = asyncio.run(hash_twice())
+        assert pool is not None
+        assert security.bulk_hashing_executor._executor is pool
+    finally:
+        security.bulk_hashing_executor.shutdown()
+    for hashed in (first, second):
+        assert [security.pwd_context.verify(p, h) for p, h in zip(passwords, hashed)] == [True] * 3
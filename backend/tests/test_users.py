@@ -0,0 +1,94 @@
+import asyncio
+from datetime import datetime, timedelta
+
+import orjson
+import pytest
+
+from app.core.config import settings
+from app.services import userservice
+from tests.conftest import TEST_PASSWORD, call_app
+
+LOGIN_URL = f"{settings.API_PATH}/auth/login/access-token"
+USERS_URL = f"{settings.API_PATH}/users/"
+
+
+@pytest.fixture
+def superuser_headers(create_user) -> dict:
+    create_user("admin@example.com", is_superuser=True)
+    response = call_app("POST", LOGIN_URL, data={"username": "admin@example.com", "password": TEST_PASSWORD})
+    return {"Authorization": f"Bearer {response.json()['access_token']}"}
+
+
+def test_list_users_pages_with_a_cursor(create_user, superuser_headers):
+    create_user("second@example.com")
+
+    first = call_app("GET", USERS_URL, params={"limit": 1}, headers=superuser_headers)
+    assert first.status_code == 200, first.text
+    second = call_app(
+        "GET", USERS_URL, params={"limit": 1, "after": first.json()["next_cursor"]}, headers=superuser_headers
+    )
+
+    assert second.status_code == 200, second.text
+    assert len(first.json()["data"]) == len(second.json()["data"]) == 1
+    assert first.json()["data"][0]["email"] != second.json()["data"][0]["email"]
+    assert second.json()["next_cursor"] is None
+
+
+@pytest.mark.parametrize(
+    "params",
+    [{"limit": 0}, {"limit": -1}, {"limit": settings.USER_LIST_MAX_LIMIT + 1}, {"skip": -1}],
+)
+def test_list_users_rejects_out_of_range_paging(superuser_headers, params):
+    response = call_app("GET", USERS_URL, params=params, headers=superuser_headers)
+
+    assert response.status_code == 422
+
+
+def test_list_users_rejects_a_cursor_with_skip(create_user, superuser_headers):
+    create_user("second@example.com")
+    cursor = call_app("GET", USERS_URL, params={"limit": 1}, headers=superuser_headers).json()["next_cursor"]
+
+    response = call_app("GET", USERS_URL, params={"after": cursor, "skip": 1}, headers=superuser_headers)
+    unskipped = call_app("GET", USERS_URL, params={"after": cursor, "skip": 0}, headers=superuser_headers)
+
+    assert response.status_code == 422
+    assert response.json()["error_code"] == "VALIDATION_ERROR"
+    assert unskipped.status_code == 200
+
+
+def test_error_envelope_has_a_utc_timestamp(superuser_headers):
+    response = call_app("GET", USERS_URL, params={"after": "not-a-cursor"}, headers=superuser_headers)
+
+    assert response.status_code == 422
+    body = response.json()
+    assert body["error_code"] == "VALIDATION_ERROR"
+    assert datetime.fromisoformat(body["timestamp"]).utcoffset() == timedelta(0)
+
+
+@pytest.mark.parametrize("export_format", ["ndjson", "csv"])
+def test_export_starts_before_the_first_query(export_format):
+    def session_factory():
+        pytest.fail("queried before the first chunk")
+
+    async def first_chunk():
+        stream = userservice.stream_users_export(
+            session_factory=session_factory, export_format=export_format, batch_size=1
+        )
+        try:
+            return await anext(stream)
+        finally:
+            await stream.aclose()
+
+    chunk = asyncio.run(first_chunk())
+
+    assert chunk == (b"id,email,full_name,is_active,is_superuser,created_at\r\n" if export_format == "csv" else b"")
+
+
+def test_export_streams_every_user(create_user, superuser_headers):
+    create_user("second@example.com")
+
+    response = call_app("GET", f"{USERS_URL}export", headers=superuser_headers)
+
+    assert response.status_code == 200, response.text
+    emails = [orjson.loads(line)["email"] for line in response.content.splitlines()]
+    assert sorted(emails) == ["admin@example.com", "second@example.com"]
@@ -17,6 +17,9 @@ export interface LoginCredentials {
 export interface TokenResponse {
   access_token: string;
   token_type: string;
+  // Seconds until access_token expires
+  expires_in?: number | null;
+  refresh_token?: string | null;
 }
 
 export interface AuthResponse {
@@ -33,6 +36,9 @@ export const useAuthStore = defineStore('auth', () => {
   // State
   const user = ref<User | null>(null)
   const token = ref<string | null>(null)
+  // Access tokens are short-lived; the refresh token trades for a new pair at /api/auth/refresh
+  const refreshToken = ref<string | null>(null)
+  const tokenExpiresAt = ref<number | null>(null)
   const loading = ref<boolean>(false)
   const error = ref<string | null>(null)
 
@@ -43,6 +49,86 @@ export const useAuthStore = defineStore('auth', () => {
 
   // Actions
 
+  function storeTokens(tokenData: TokenResponse): void {
+    token.value = tokenData.access_token
+    refreshToken.value = tokenData.refresh_token ?? null
+    tokenExpiresAt.value = tokenData.expires_in ? Date.now() + tokenData.expires_in * 1000 : null
+
+    try {
+      localStorage.setItem('auth_token', tokenData.access_token)
+      localStorage.setItem('token_type', tokenData.token_type)
+      if (refreshToken.value) {
+        localStorage.setItem('auth_refresh_token', refreshToken.value)
+      }
+      if (tokenExpiresAt.value) {
+        localStorage.setItem('auth_token_expires_at', String(tokenExpiresAt.value))
+      }
+    } catch (storageError) {
+      console.warn('Failed to store auth data: ', storageError)
+    }
+  }
+
+  // Each refresh token works once and reusing one revokes the whole session, so
+  // concurrent callers share a single refresh instead of each sending their own
+  let refreshInFlight: Promise<boolean> | null = null
+
+  async function refresh(): Promise<boolean> {
+    if (!refreshToken.value) {
+      return false
+    }
+    if (!refreshInFlight) {
+      const sentToken = refreshToken.value
+      refreshInFlight = (async () => {
+        try {
+          const response = await fetch(`${API_BASE_URL}/api/auth/refresh`, {
+            method: 'POST',
+            headers: { 'Content-Type': 'application/json' },
+            body: JSON.stringify({ refresh_token: sentToken }),
+          })
+          if (!response.ok) {
+            await logout()
+            return false
+          }
+          storeTokens(await response.json())
+          return true
+        } catch (refreshError) {
+          console.warn('Token refresh failed: ', refreshError)
+          return false
+        } finally {
+          refreshInFlight = null
+        }
+      })()
+    }
+    return refreshInFlight
+  }
+
+  // Refresh this long before the access token expires, so requests never race its expiry
+  const REFRESH_MARGIN_MS = 30_000
+
+  /**
+   * fetch() with the access token attached. Refreshes a token that is about to expire
+   * before sending, and on a 401/403 refreshes once and retries.
+   */
+  async function authFetch(input: RequestInfo | URL, init: RequestInit = {}): Promise<Response> {
+    if (tokenExpiresAt.value && Date.now() > tokenExpiresAt.value - REFRESH_MARGIN_MS) {
+      await refresh()
+    }
+
+    const send = (): Promise<Response> => {
+      const headers = new Headers(init.headers)
+      if (token.value) {
+        headers.set('Authorization', `Bearer ${token.value}`)
+      }
+      return fetch(input, { ...init, headers })
+    }
+
+    const response = await send()
+    if ((response.status === 401 || response.status === 403) && (await refresh())) {
+      return send()
+    }
+    return response
+  }
+
   async function login(credentials: LoginCredentials): Promise<ActionResult> {
     loading.value = true
     error.value = null
@@ -66,13 +152,12 @@ export const useAuthStore = defineStore('auth', () => {
 
       const tokenData: TokenResponse = await tokenResponse.json()
 
-      // Store the token
-      token.value = tokenData.access_token
+      // Store the tokens
+      storeTokens(tokenData)
 
       // Fetch user data using access token
-      const userResponse = await fetch('/api/users/me', {
+      const userResponse = await authFetch('/api/users/me', {
         headers: {
-          'Authorization': `Bearer ${tokenData.access_token}`,
           'Content-Type' : 'application/json'
         }
       })
@@ -86,8 +171,6 @@ export const useAuthStore = defineStore('auth', () => {
 
       // Store in local storage
       try {
-        localStorage.setItem('auth_token', tokenData.access_token)
-        localStorage.setItem('token_type', tokenData.token_type)
         localStorage.setItem('auth_user', JSON.stringify(userData))
       } catch (storageError) {
         console.warn('Failed to store auth data: ', storageError)
@@ -107,28 +190,33 @@ export const useAuthStore = defineStore('auth', () => {
     loading.value = true
 
     try {
-      // Optional: Call FastAPI logout endpoint if you have one
-      // if (token.value) {
-      //   try {
-      //     await fetch('/api/auth/logout', {
-      //       method: 'POST',
-      //       headers: {
-      //         'Authorization': `Bearer ${token.value}`,
-      //         'Content-Type': 'application/json'
-      //       }
-      //     });
-      //   } catch (logoutError) {
-      //     console.warn('Server logout failed:', logoutError);
-      //   }
-      // }
+      // Revoke the tokens server-side; a refresh token left behind would stay valid for days
+      if (token.value) {
+        try {
+          await fetch(`${API_BASE_URL}/api/auth/logout`, {
+            method: 'POST',
+            headers: {
+              'Authorization': `Bearer ${token.value}`,
+              'Content-Type': 'application/json'
+            },
+            body: refreshToken.value ? JSON.stringify({ refresh_token: refreshToken.value }) : undefined,
+          })
+        } catch (logoutError) {
+          console.warn('Server logout failed:', logoutError)
+        }
+      }
 
       // Clear state
       user.value = null
       token.value = null
+      refreshToken.value = null
+      tokenExpiresAt.value = null
       error.value = null
 
       // Clear local storage
-      const keysToRemove: string[] = ['auth_token', 'token_type', 'auth_user']
+      const keysToRemove: string[] = [
+        'auth_token', 'token_type', 'auth_user', 'auth_refresh_token', 'auth_token_expires_at'
+      ]
       keysToRemove.forEach(key => {
         localStorage.removeItem(key)
       })
@@ -152,5 +240,7 @@ export const useAuthStore = defineStore('auth', () => {
     // Actions
     login,
     logout,
+    refresh,
+    authFetch,
   };
 });